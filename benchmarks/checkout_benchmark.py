@@ -0,0 +1,85 @@
+# checkout_benchmark.py
+"""
+Checkout latency benchmark
+Measures orders_db.create_order latency against cart size on the configured
+database. Orders created by the benchmark are deleted again afterwards.
+
+Usage: python benchmarks/checkout_benchmark.py [runs_per_size]
+"""
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db.connection import db_pool
+from db.menu_db import menu_db
+from db.orders_db import orders_db_instance as orders_db
+
+
+CART_SIZES = [1, 2, 5, 10, 20, 50]
+
+BENCH_CUSTOMER = {
+    'full_name': 'Checkout Benchmark',
+    'email': 'benchmark@fooddash.local',
+    'phone': '00000000000',
+    'address': 'Benchmark'
+}
+
+
+def build_cart(menu_items, size):
+    """Build a cart with `size` lines cycling through the real menu"""
+    cart = []
+    for i in range(size):
+        item = menu_items[i % len(menu_items)]
+        cart.append({
+            'title': item['name'],
+            'price': f"₱{item['price']}",
+            'img': item.get('image_url', ''),
+            'qty': 1 + i % 3
+        })
+    return cart
+
+
+def run(runs_per_size=20):
+    menu_items = menu_db.get_all_menu_items()
+    if not menu_items:
+        print("No menu items found - cannot build carts")
+        return 1
+
+    created_ids = []
+    print(f"{'lines':>6} {'runs':>5} {'median ms':>10} {'p95 ms':>8} {'max ms':>8}")
+
+    try:
+        for size in CART_SIZES:
+            cart = build_cart(menu_items, size)
+            subtotal = sum(float(item['price'].replace('₱', '')) * item['qty'] for item in cart)
+            timings = []
+
+            for _ in range(runs_per_size):
+                started = time.perf_counter()
+                success, result = orders_db.create_order(None, BENCH_CUSTOMER, cart, subtotal,
+                                                         notes="checkout benchmark")
+                timings.append((time.perf_counter() - started) * 1000)
+
+                if not success:
+                    print(f"Checkout failed for cart size {size}: {result}")
+                    return 1
+                created_ids.append(result['order_id'])
+
+            timings.sort()
+            p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+            print(f"{size:>6} {runs_per_size:>5} {statistics.median(timings):>10.2f} "
+                  f"{p95:>8.2f} {timings[-1]:>8.2f}")
+    finally:
+        for order_id in created_ids:
+            orders_db.delete_order(order_id)
+
+    print(f"Pool: {db_pool.stats()}")
+    return 0
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    sys.exit(run(runs))
\ No newline at end of file
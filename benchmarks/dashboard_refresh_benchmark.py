@@ -0,0 +1,78 @@
+# dashboard_refresh_benchmark.py
+"""
+Dashboard refresh benchmark
+Times the Overview queries (users, stats snapshot, revenue rollup, popular
+items) on the configured database run one after another through the
+synchronous managers and concurrently through db.async_db.
+
+Usage: python benchmarks/dashboard_refresh_benchmark.py [runs]
+"""
+import asyncio
+import os
+import statistics
+import sys
+import time
+from datetime import date
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db.async_db import async_db
+from db.connection import db_pool
+from db.customer_db import customer_db
+from db.daily_sales import daily_sales
+from db.orders_db import orders_db_instance as orders_db
+from db.staff_db import staff_db
+
+
+def revenue_range():
+    """Five chart years, as the Overview page shows them"""
+    year = date.today().year
+    return date(year - 4, 1, 1), date(year + 1, 1, 1)
+
+
+def refresh_sequential():
+    customer_db.get_all_customers()
+    staff_db.get_all_staff()
+    orders_db.get_stats_snapshot(max_age=0)
+    daily_sales.get_monthly_revenue(*revenue_range())
+    orders_db.get_popular_items(limit=10, include_others=True)
+
+
+async def refresh_concurrent():
+    await asyncio.gather(
+        async_db.users(),
+        async_db.orders.stats(max_age=0),
+        async_db.sales.monthly_revenue(*revenue_range()),
+        async_db.orders.popular_items(limit=10, include_others=True)
+    )
+
+
+def run(runs=20):
+    loop = asyncio.new_event_loop()
+    timings = {'sequential': [], 'concurrent': []}
+
+    # Warm the pool so connection setup is not timed
+    refresh_sequential()
+    loop.run_until_complete(refresh_concurrent())
+
+    for _ in range(runs):
+        started = time.perf_counter()
+        refresh_sequential()
+        timings['sequential'].append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        loop.run_until_complete(refresh_concurrent())
+        timings['concurrent'].append((time.perf_counter() - started) * 1000)
+
+    loop.close()
+
+    print(f"{'mode':>11} {'runs':>5} {'median ms':>10} {'max ms':>8}")
+    for mode, values in timings.items():
+        print(f"{mode:>11} {runs:>5} {statistics.median(values):>10.2f} {max(values):>8.2f}")
+    print(f"Pool: {db_pool.stats()}")
+    return 0
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    sys.exit(run(runs))
\ No newline at end of file
@@ -0,0 +1,170 @@
+# explain_date_queries.py
+"""
+Index check for time-window queries
+Runs every time-window query in orders_db, activity_db and daily_sales against
+the configured database, records the exact SQL each one issues, and EXPLAINs
+it. Every orders, activity_logs or daily_sales row of those plans must use an
+index: `key` is set and `type` is not ALL. Listing a candidate index that
+MySQL then ignores (possible_keys set, key NULL) fails, as does wrapping
+created_at in a function such as DATE().
+
+The schema is only read. With migrations pending the check stops (exit 2)
+unless --migrate is given, which applies them first.
+
+Exit status: 0 all queries indexed, 1 failures, 2 schema not migrated.
+
+Usage: python benchmarks/explain_date_queries.py [--migrate]
+"""
+import os
+import sys
+from datetime import date, timedelta
+
+from mysql.connector import Error
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db.activity_db import activity_db
+from db.daily_sales import daily_sales
+from db.migrations import MigrationRunner, run_migrations
+from db.orders_db import orders_db_instance as orders_db
+
+
+class RecordingPool:
+    """Wraps a pool and records every (sql, params) executed through it"""
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.statements = []
+
+    def get_connection(self):
+        return RecordingConnection(self, self.pool.get_connection())
+
+
+class RecordingConnection:
+    def __init__(self, recorder, connection):
+        self._recorder = recorder
+        self._connection = connection
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+    def cursor(self, *args, **kwargs):
+        return RecordingCursor(self._recorder, self._connection.cursor(*args, **kwargs))
+
+
+class RecordingCursor:
+    def __init__(self, recorder, cursor):
+        self._recorder = recorder
+        self._cursor = cursor
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def execute(self, sql, params=None):
+        self._recorder.statements.append((sql, params))
+        return self._cursor.execute(sql, params)
+
+
+def record(manager, call):
+    """Run `call` with manager.pool swapped for a recorder; return its statements"""
+    recorder = RecordingPool(manager.pool)
+    manager.pool = recorder
+    try:
+        call()
+    finally:
+        manager.pool = recorder.pool
+    return [(sql, params) for sql, params in recorder.statements
+            if ('created_at' in sql or 'sales_date' in sql) and 'WHERE' in sql.upper()]
+
+
+def explain(sql, params):
+    """EXPLAIN one statement; return the plan rows as dictionaries"""
+    connection = orders_db.pool.get_connection()
+    cursor = connection.cursor(dictionary=True)
+    try:
+        cursor.execute("EXPLAIN " + sql, params)
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+        connection.close()
+
+
+CHECKS = [
+    ("orders_db.get_order_stats", orders_db, lambda: orders_db.get_order_stats()),
+    ("orders_db.get_todays_revenue", orders_db, lambda: orders_db.get_todays_revenue()),
+    ("daily_sales.get_year_revenue", daily_sales, lambda: daily_sales.get_year_revenue(date.today().year)),
+    ("orders_db.find_orders(day)", orders_db, lambda: orders_db.find_orders(day=date.today())),
+    ("orders_db.find_orders(month)", orders_db,
+     lambda: orders_db.find_orders(year=date.today().year, month=date.today().month)),
+    ("activity_db.get_activities_by_date_range", activity_db,
+     lambda: activity_db.get_activities_by_date_range(date.today() - timedelta(days=30), date.today())),
+    ("activity_db.get_todays_activities", activity_db, lambda: activity_db.get_todays_activities()),
+    ("activity_db.get_activities_last_n_days", activity_db,
+     lambda: activity_db.get_activities_last_n_days(7)),
+    ("activity_db.find_activities_page", activity_db,
+     lambda: activity_db.find_activities_page(date_from=date.today() - timedelta(days=6))),
+    ("activity_db.count_activities", activity_db,
+     lambda: activity_db.count_activities(date_from=date.today() - timedelta(days=6))),
+]
+
+DATE_FILTERED_TABLES = {'orders', 'o', 'activity_logs', 'daily_sales'}
+
+
+def pending_migrations():
+    """Versions not applied to the configured database (read-only)"""
+    runner = MigrationRunner()
+    connection = runner.pool.get_connection()
+    cursor = connection.cursor()
+    try:
+        applied = runner.applied_versions(cursor)
+    except Error:
+        # No schema_migrations table yet
+        applied = set()
+    finally:
+        cursor.close()
+        connection.close()
+    return [version for version, _, _ in runner.migrations if version not in applied]
+
+
+def uses_index(row):
+    """A plan row reads its table through an index, not a full scan"""
+    return row.get('key') is not None and row.get('type') != 'ALL'
+
+
+def run(migrate=False):
+    if migrate:
+        success, result = run_migrations()
+        if not success:
+            print(f"Cannot migrate: {result}")
+            return 2
+
+    pending = pending_migrations()
+    if pending:
+        print(f"Migrations {pending} are not applied; run with --migrate or python -m db.migrations")
+        return 2
+
+    failures = 0
+
+    for name, manager, call in CHECKS:
+        statements = record(manager, call)
+        if not statements:
+            print(f"FAIL  {name}: no time-window query was issued")
+            failures += 1
+            continue
+
+        for sql, params in statements:
+            for row in explain(sql, params):
+                if row.get('table') not in DATE_FILTERED_TABLES:
+                    continue
+                ok = uses_index(row)
+                failures += 0 if ok else 1
+                print(f"{'ok  ' if ok else 'FAIL'}  {name}: table={row.get('table')} "
+                      f"type={row.get('type')} possible_keys={row.get('possible_keys')} "
+                      f"key={row.get('key')}")
+
+    print(f"\n{failures} failure(s)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(run(migrate='--migrate' in sys.argv[1:]))
\ No newline at end of file
@@ -13,7 +13,12 @@ import os
 
 from models.admin_dashboard_model import AdminDashboardModel
 from views.admin_dashboard_view import AdminDashboardView
+from .data_service import DataService
+from .refresh_pipeline import RefreshPipeline, RefreshStage
 from .widgets import AddUserDialog, EditUserDialog
+from db.activity_archive import ACTIVITY_RETENTION_DAYS
+from db.daily_sales import daily_sales
+from db.orders_db import prefetch_order_lines
 
 # Import ReportLab for PDF generation
 from reportlab.lib.pagesizes import letter, A4
@@ -38,6 +43,20 @@ class AdminDashboardController(QObject):
         self.model = AdminDashboardModel(admin_info)
         self.view = AdminDashboardView()
 
+        # Database calls run off the GUI thread; the view shows a busy cursor meanwhile
+        self.data = DataService(self)
+        self.data.busy_changed.connect(self.view.set_loading)
+
+        # Keyset paging state of the orders page: fetch(cursor) -> (orders, next_cursor)
+        self.order_page_fetch = None
+        self.order_page_cursor = None
+        self._loading_more_orders = False
+
+        # Keyset paging state of the activity logs page
+        self.activity_filters = {}
+        self.activity_page_cursor = None
+        self._loading_more_activities = False
+
         # Set admin info in view
         self.view.set_admin_info(self.model.admin_name, self.model.admin_id)
 
@@ -64,7 +83,7 @@ class AdminDashboardController(QObject):
         total_revenue = self.model.get_total_revenue_from_db()
         today_orders = self.model.get_todays_orders_count()
         pending_orders = self.model.get_pending_orders_count()
-        user_count = len([u for u in self.model.all_users if u['role'].lower() != 'admin'])
+        user_count = self.model.get_active_user_count()
 
         overview_page = self.view.build_overview_page(
             user_count, total_revenue, today_orders, pending_orders
@@ -110,6 +129,7 @@ class AdminDashboardController(QObject):
 
         self.view.filter_combo.currentTextChanged.connect(self.filter_orders_by_status)
         self.view.month_filter_combo.currentTextChanged.connect(self.filter_orders_by_month)
+        self.view.orders_scrolled_to_end.connect(self.load_more_orders)
 
         # Menu management page
         if hasattr(self.view, 'menu_add_btn'):
@@ -132,10 +152,13 @@ class AdminDashboardController(QObject):
             self.view.activity_today_btn.clicked.connect(self.show_todays_activities)
         if hasattr(self.view, 'activity_clear_btn'):
             self.view.activity_clear_btn.clicked.connect(self.clear_activity_logs)
+        if hasattr(self.view, 'activity_archive_btn'):
+            self.view.activity_archive_btn.clicked.connect(self.archive_old_activities)
         if hasattr(self.view, 'activity_refresh_btn'):
             self.view.activity_refresh_btn.clicked.connect(self.refresh_activity_logs)
 
         self.view.period_filter_combo.currentTextChanged.connect(self.filter_activities_by_period)
+        self.view.activities_scrolled_to_end.connect(self.load_more_activities)
 
         # Logout button
         self.view.logout_btn.clicked.connect(self.handle_logout)
@@ -149,8 +172,10 @@ class AdminDashboardController(QObject):
 
         # Refresh data when switching to specific pages
         if index == 0:  # Overview
-            self.model.load_users_from_db()
-            if hasattr(self.view, 'refresh_btn'):
+            # Served from the stats snapshot cache when it is still fresh
+            self.data.run(self.model.load_analytics_data,
+                          on_result=lambda _: self._update_overview_cards(), key='analytics')
+            if hasattr(self.view, 'refresh_btn') and not self.data.is_busy('dashboard_refresh'):
                 self.view.refresh_btn.setEnabled(True)
         elif index == 1:  # Order Tracking
             self.load_orders_from_db()
@@ -162,156 +187,214 @@ class AdminDashboardController(QObject):
             self.refresh_activity_logs()
 
     def refresh_dashboard(self):
-        """Refresh all dashboard data from database"""
+        """Refresh all dashboard data from database.
+
+        Stats, revenue and popular items are independent pipeline stages
+        fetched concurrently through db.async_db; each card or chart is
+        repainted as soon as its own data arrives. The user count comes with
+        the stats snapshot; the Users table reloads when its page is opened. The report dialog is
+        shown by DataService after the asyncio loop step has returned.
+        """
         print("=== REFRESHING DASHBOARD ===")
 
-        try:
-            # Disable button during refresh
-            if hasattr(self.view, 'refresh_btn'):
-                self.view.refresh_btn.setEnabled(False)
-                self.view.refresh_btn.setText("Refreshing...")
-
-            # Force UI update
-            QApplication.processEvents()
-
-            # 1. Load fresh user data
-            print("Loading users...")
-            self.model.load_users_from_db()
-
-            # 2. Load fresh analytics stats
-            print("Loading analytics data...")
-            self.model.load_analytics_data()
-
-            # 3. Get updated values
-            print("Calculating updated values...")
-            total_revenue = self.model.get_total_revenue_from_db()
-            today_orders = self.model.get_todays_orders_count()
-            pending_orders = self.model.get_pending_orders_count()
-            user_count = len([u for u in self.model.all_users if u['role'].lower() != 'admin'])
-
-            print(
-                f"Updated Data: Revenue={total_revenue}, Today={today_orders}, Pending={pending_orders}, Users={user_count}")
-
-            # 4. Update stored values
-            self.model.current_revenue = total_revenue
-            self.model.active_user_count = user_count
-
-            # 5. Update the cards directly
-            print("Updating cards...")
-            if hasattr(self.view, 'total_revenue_card'):
-                self.view.total_revenue_card.update_value(f"₱{total_revenue:,.2f}")
-
-            if hasattr(self.view, 'todays_orders_card'):
-                self.view.todays_orders_card.update_value(f"{today_orders}")
-
-            if hasattr(self.view, 'pending_orders_card'):
-                self.view.pending_orders_card.update_value(f"{pending_orders}")
-
-            if hasattr(self.view, 'active_users_card'):
-                self.view.active_users_card.update_value(f"{user_count}")
-
-            # 6. Update the line graph
-            print("Updating line graph...")
-            if hasattr(self.view, 'revenue_graph'):
-                self.view.revenue_graph.update_monthly_data_from_db()
-
-            # 7. Update the pie chart
-            print("Updating pie chart...")
-            if hasattr(self.view, 'pie_chart_widget'):
-                self.view.pie_chart_widget.refresh()
-
-            # 8. Update button state
-            if hasattr(self.view, 'refresh_btn'):
-                self.view.refresh_btn.setText("Refresh Dashboard")
-                self.view.refresh_btn.setEnabled(True)
+        # Disable button during refresh
+        if hasattr(self.view, 'refresh_btn'):
+            self.view.refresh_btn.setEnabled(False)
+            self.view.refresh_btn.setText("Refreshing...")
+
+        years = [datetime.now().year - year_offset for year_offset in range(5)]
+        pipeline = RefreshPipeline([
+            RefreshStage('stats', self.model.fetch_analytics_async, lambda _: self._update_overview_cards()),
+            RefreshStage('revenue', lambda: self.model.fetch_yearly_revenue_async(years),
+                         self._paint_revenue_graph),
+            RefreshStage('popular_items', self.model.fetch_popular_items_async, self._paint_pie_chart)
+        ])
+        self.data.spawn(pipeline.run, on_result=self._finish_dashboard_refresh,
+                        on_error=self._dashboard_refresh_failed, key='dashboard_refresh')
+
+    def _paint_revenue_graph(self, yearly_revenue):
+        """Revenue stage: redraw the line graph"""
+        if hasattr(self.view, 'revenue_graph'):
+            self.view.revenue_graph.set_yearly_revenue(yearly_revenue)
+
+    def _paint_pie_chart(self, popular_items):
+        """Popular items stage: redraw the pie chart"""
+        if hasattr(self.view, 'pie_chart_widget'):
+            self.view.pie_chart_widget.set_popular_items(popular_items)
+            self.view.pie_chart_widget.create_pie_chart()
+
+    def _finish_dashboard_refresh(self, pipeline):
+        """Report the refresh once every stage has painted (or failed)"""
+        print("Dashboard refresh timings:")
+        for line in pipeline.summary():
+            print(f"  {line}")
+
+        # Update button state
+        if hasattr(self.view, 'refresh_btn'):
+            self.view.refresh_btn.setText("Refresh Dashboard")
+            self.view.refresh_btn.setEnabled(True)
 
-            print("=== REFRESH COMPLETE ===")
+        if pipeline.failed:
+            self.view.show_message("Refresh Incomplete",
+                                   f"Some dashboard data could not be refreshed:\n"
+                                   f"{', '.join(pipeline.failed)}",
+                                   QMessageBox.Icon.Warning)
+            return
 
-            # Show success message
-            self.view.show_message("Dashboard Refreshed",
-                                   f"Dashboard data has been updated:\n"
-                                   f"• Total Revenue: ₱{total_revenue:,.2f}\n"
-                                   f"• Today's Orders: {today_orders}\n"
-                                   f"• Pending Orders: {pending_orders}\n"
-                                   f"• Active Users: {user_count}")
+        print("=== REFRESH COMPLETE ===")
 
-        except Exception as e:
-            print(f"!!! ERROR REFRESHING DASHBOARD: {e}")
-            import traceback
-            traceback.print_exc()
+        # Show success message
+        self.view.show_message("Dashboard Refreshed",
+                               f"Dashboard data has been updated:\n"
+                               f"• Total Revenue: ₱{self.model.get_total_revenue_from_db():,.2f}\n"
+                               f"• Today's Orders: {self.model.get_todays_orders_count()}\n"
+                               f"• Pending Orders: {self.model.get_pending_orders_count()}\n"
+                               f"• Active Users: {self.model.get_active_user_count()}")
 
-            # Reset button on error
-            if hasattr(self.view, 'refresh_btn'):
-                self.view.refresh_btn.setText("Refresh Dashboard")
-                self.view.refresh_btn.setEnabled(True)
+    def _dashboard_refresh_failed(self, error):
+        """Reset the refresh button and report a failed dashboard refresh"""
+        print(f"!!! ERROR REFRESHING DASHBOARD: {error}")
 
-            self.view.show_message("Refresh Error",
-                                   f"Failed to refresh dashboard:\n{str(e)}",
-                                   QMessageBox.Icon.Warning)
+        # Reset button on error
+        if hasattr(self.view, 'refresh_btn'):
+            self.view.refresh_btn.setText("Refresh Dashboard")
+            self.view.refresh_btn.setEnabled(True)
 
-    def load_orders_from_db(self):
-        """Load orders from database"""
-        try:
-            orders = self.model.get_all_orders()
+        self.view.show_message("Refresh Error",
+                               f"Failed to refresh dashboard:\n{str(error)}",
+                               QMessageBox.Icon.Warning)
 
-            if not orders:
-                # Clear current orders
-                self.view.clear_orders_layout()
+    def _update_overview_cards(self):
+        """Update the Overview cards from the model's stats snapshot"""
+        total_revenue = self.model.get_total_revenue_from_db()
+        today_orders = self.model.get_todays_orders_count()
+        pending_orders = self.model.get_pending_orders_count()
+        user_count = self.model.get_active_user_count()
+
+        self.model.current_revenue = total_revenue
+        self.model.active_user_count = user_count
+
+        if hasattr(self.view, 'total_revenue_card'):
+            self.view.total_revenue_card.update_value(f"₱{total_revenue:,.2f}")
+
+        if hasattr(self.view, 'todays_orders_card'):
+            self.view.todays_orders_card.update_value(f"{today_orders}")
+
+        if hasattr(self.view, 'pending_orders_card'):
+            self.view.pending_orders_card.update_value(f"{pending_orders}")
+
+        if hasattr(self.view, 'active_users_card'):
+            self.view.active_users_card.update_value(f"{user_count}")
+
+        return total_revenue, today_orders, pending_orders, user_count
+
+    def _start_order_paging(self, fetch, on_ready):
+        """Fetch the first page with fetch(cursor) in the background, remember it for
+        load_more_orders and hand the orders to on_ready(orders) on the GUI thread"""
+        self.order_page_fetch = None
+        self.order_page_cursor = None
+        self.data.cancel('more_orders')
+        self._loading_more_orders = False
+
+        def load():
+            orders, next_cursor = fetch(None)
+            return prefetch_order_lines(orders), next_cursor
+
+        def ready(page):
+            orders, next_cursor = page
+            self.order_page_fetch = fetch
+            self.order_page_cursor = next_cursor
+            on_ready(orders)
+
+        self.data.run(load, on_result=ready, on_error=self._show_orders_error, key='orders')
+
+    def _show_orders_error(self, error):
+        """Replace the order list with an error message"""
+        print(f"Error loading orders: {error}")
+        self.view.clear_orders_layout()
+
+        error_label = QLabel(f"Error loading orders: {str(error)}")
+        error_label.setStyleSheet("color: red; padding: 20px;")
+        error_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.view.orders_layout.addWidget(error_label)
+
+    def load_more_orders(self):
+        """Append the next page of the current order listing (on scroll to end)"""
+        if self.order_page_fetch is None or self.order_page_cursor is None or self._loading_more_orders:
+            return
+
+        self._loading_more_orders = True
+        fetch, cursor = self.order_page_fetch, self.order_page_cursor
 
+        def append(page):
+            self._loading_more_orders = False
+            orders, self.order_page_cursor = page
+            if orders:
+                self.view.append_order_cards(orders, self.update_order_status)
+
+        def failed(error):
+            self._loading_more_orders = False
+            print(f"Error loading more orders: {error}")
+
+        def load():
+            orders, next_cursor = fetch(cursor)
+            return prefetch_order_lines(orders), next_cursor
+
+        self.data.run(load, on_result=append, on_error=failed, key='more_orders')
+
+    def load_orders_from_db(self):
+        """Load the first page of orders from database"""
+        def show(orders):
+            if not orders:
                 # Show no orders message
                 btn = self.view.show_no_orders_message("No orders found")
                 if btn:
                     btn.clicked.connect(self.clear_filters_and_show_all)
                 return
 
-            # Clear current orders
-            self.view.clear_orders_layout()
-
-            # Add order cards
-            for order in orders:
-                card = self.view.build_order_card(order, self.update_order_status)
-                card.order_id = str(order.get('id', ''))  # Store order ID for tracking
-                self.view.orders_layout.addWidget(card)
-
-            # Add stretch at the end
-            self.view.orders_layout.addStretch()
+            # Only new, changed and removed orders touch their cards
+            self.view.sync_order_cards(orders, self.update_order_status)
 
-        except Exception as e:
-            print(f"Error loading orders: {e}")
-            # Clear layout and show error
-            self.view.clear_orders_layout()
-
-            error_label = QLabel(f"Error loading orders: {str(e)}")
-            error_label.setStyleSheet("color: red; padding: 20px;")
-            error_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.view.orders_layout.addWidget(error_label)
+        self._start_order_paging(lambda cursor: self.model.find_orders_page(cursor=cursor), show)
 
     def update_order_status(self, order_id, new_status):
         """Update order status in database"""
-        success, result = self.model.update_order_status(order_id, new_status)
+        def update():
+            success, result = self.model.update_order_status(order_id, new_status)
+            if success and result:
+                # The updated row comes back with the update; build its card off the GUI thread
+                prefetch_order_lines([result])
 
-        if success:
-            # Log the activity
-            order_number = ""
-            orders = self.model.get_all_orders()
-            for order in orders:
-                if order.get('id') == order_id:
-                    order_number = order.get('order_number', 'Unknown')
-                    break
+                # Log the activity
+                self.model.log_activity(
+                    f"Updated order status",
+                    f"Order #{result.get('order_number', 'Unknown')}: {new_status}"
+                )
+            return success, result
 
-            self.model.log_activity(
-                f"Updated order status",
-                f"Order #{order_number}: {new_status}"
-            )
+        def updated(outcome):
+            success, result = outcome
+            if success:
+                # Patch just this order's card (or drop it if it left the status filter)
+                status = self._get_selected_status()
+                if not result or (status and (result.get('status') or '').lower() != status.lower()):
+                    self.view.remove_order_card(order_id)
+                    if self.view.order_model.rowCount() == 0:
+                        btn = self.view.show_no_orders_message("No orders found")
+                        if btn:
+                            btn.clicked.connect(self.clear_filters_and_show_all)
+                else:
+                    self.view.update_order_card(result, self.update_order_status)
 
-            # Reload orders to reflect changes
-            self.load_orders_from_db()
+                # Show success message
+                self.view.show_message("Success", f"Order status updated to {new_status}")
+            else:
+                # Show error message
+                self.view.show_message("Error", f"Failed to update status: {result}", QMessageBox.Icon.Warning)
 
-            # Show success message
-            self.view.show_message("Success", f"Order status updated to {new_status}")
-        else:
-            # Show error message
-            self.view.show_message("Error", f"Failed to update status: {result}", QMessageBox.Icon.Warning)
+        self.data.run(update, on_result=updated,
+                      on_error=lambda e: self.view.show_message("Error", f"Failed to update status: {e}",
+                                                                QMessageBox.Icon.Warning))
 
     def search_orders(self):
         """Search orders based on search term"""
@@ -321,165 +404,105 @@ class AdminDashboardController(QObject):
             self.load_orders_from_db()
             return
 
-        orders = self.model.search_orders(search_term)
+        def show(orders):
+            if orders:
+                self.view.sync_order_cards(orders, self.update_order_status)
+            else:
+                btn = self.view.show_no_orders_message(f"No orders found for '{search_term}'")
+                if btn:
+                    btn.clicked.connect(self.clear_filters_and_show_all)
 
-        if orders:
-            self.view.clear_orders_layout()
-            for order in orders:
-                card = self.view.build_order_card(order, self.update_order_status)
-                self.view.orders_layout.addWidget(card)
-            self.view.orders_layout.addStretch()
-        else:
-            btn = self.view.show_no_orders_message(f"No orders found for '{search_term}'")
+        self._start_order_paging(
+            lambda cursor: self.model.search_orders_page(search_term, cursor=cursor), show)
+
+    def _get_selected_status(self):
+        """Return the status picked in the status filter, or None for all"""
+        if hasattr(self.view, 'filter_combo') and self.view.filter_combo.currentText() != "All Status":
+            return self.view.filter_combo.currentText()
+        return None
+
+    def _get_selected_month(self):
+        """Return (month_name, month_number) picked in the month filter, or (None, None)"""
+        if hasattr(self.view, 'month_filter_combo') and self.view.month_filter_combo.currentText() != "All Months":
+            month_name = self.view.month_filter_combo.currentText()
+            month_map = {
+                "January": 1, "February": 2, "March": 3, "April": 4,
+                "May": 5, "June": 6, "July": 7, "August": 8,
+                "September": 9, "October": 10, "November": 11, "December": 12
+            }
+            return month_name, month_map.get(month_name)
+        return None, None
+
+    def _show_order_results(self, filters, filter_name, empty_message):
+        """Display the first page of filtered orders, or an empty-state message"""
+        def show(orders):
+            if orders:
+                btn = self.view.display_filtered_orders(orders, filter_name, self.update_order_status,
+                                                        has_more=self.order_page_cursor is not None)
+            else:
+                btn = self.view.show_no_orders_message(empty_message)
             if btn:
                 btn.clicked.connect(self.clear_filters_and_show_all)
 
+        self._start_order_paging(
+            lambda cursor: self.model.find_orders_page(cursor=cursor, **filters), show)
+
     def filter_orders_by_status(self, status):
-        """Filter orders by status"""
+        """Filter orders by status (combined with the month filter in the database)"""
         if status == "All Status":
             # Check if month filter is active
-            if hasattr(self.view, 'month_filter_combo') and self.view.month_filter_combo.currentText() != "All Months":
-                month_name = self.view.month_filter_combo.currentText()
+            month_name, _ = self._get_selected_month()
+            if month_name:
                 self.filter_orders_by_month(month_name)
             else:
                 self.load_orders_from_db()
-        else:
-            # Get all orders first
-            all_orders = self.model.get_all_orders()
-
-            if not all_orders:
-                self.view.clear_orders_layout()
-                error_label = QLabel(f"No orders found")
-                error_label.setStyleSheet("color: red; padding: 20px;")
-                error_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.view.orders_layout.addWidget(error_label)
-                return
+            return
 
-            # First filter by status
-            status_orders = []
-            for order in all_orders:
-                order_status = order.get('status', '').lower()
-                if order_status == status.lower():
-                    status_orders.append(order)
-
-            # Then apply month filter if selected
-            filtered_orders = status_orders
-
-            if hasattr(self.view, 'month_filter_combo') and self.view.month_filter_combo.currentText() != "All Months":
-                month_name = self.view.month_filter_combo.currentText()
-                month_map = {
-                    "January": 1, "February": 2, "March": 3, "April": 4,
-                    "May": 5, "June": 6, "July": 7, "August": 8,
-                    "September": 9, "October": 10, "November": 11, "December": 12
-                }
-                month_number = month_map.get(month_name)
-
-                if month_number:
-                    month_filtered_orders = []
-                    for order in filtered_orders:
-                        order_date_str = order.get('created_at', '')
-                        if order_date_str:
-                            try:
-                                order_date = self.model.parse_date_string(order_date_str)
-                                if order_date and order_date.month == month_number:
-                                    month_filtered_orders.append(order)
-                            except:
-                                continue
-                    filtered_orders = month_filtered_orders
-
-            # Display the filtered orders
-            if filtered_orders:
-                filter_name = f"{status.lower()} orders"
-                if hasattr(self.view,
-                           'month_filter_combo') and self.view.month_filter_combo.currentText() != "All Months":
-                    filter_name = f"{status.lower()} orders in {self.view.month_filter_combo.currentText()}"
-
-                btn = self.view.display_filtered_orders(filtered_orders, filter_name, self.update_order_status)
-                if btn:
-                    btn.clicked.connect(self.clear_filters_and_show_all)
-            else:
-                # Show no orders message
-                filter_name = f"{status.lower()} orders"
-                if hasattr(self.view,
-                           'month_filter_combo') and self.view.month_filter_combo.currentText() != "All Months":
-                    filter_name = f"{status.lower()} orders in {self.view.month_filter_combo.currentText()}"
+        try:
+            filters = {'status': status.lower()}
+            filter_name = f"{status.lower()} orders"
 
-                btn = self.view.show_no_orders_message(f"No {filter_name} found")
-                if btn:
-                    btn.clicked.connect(self.clear_filters_and_show_all)
+            month_name, month_number = self._get_selected_month()
+            if month_number:
+                # Months are shown for the current year
+                filters.update(year=date.today().year, month=month_number)
+                filter_name = f"{status.lower()} orders in {month_name}"
+
+            self._show_order_results(filters, filter_name, f"No {filter_name} found")
+
+        except Exception as e:
+            print(f"Error filtering orders by status: {e}")
+            self.view.clear_orders_layout()
+            error_label = QLabel(f"Error filtering orders: {str(e)}")
+            error_label.setStyleSheet("color: red; padding: 20px;")
+            error_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            self.view.orders_layout.addWidget(error_label)
 
     def filter_orders_by_month(self, month_name):
-        """Filter orders by selected month"""
+        """Filter orders by selected month of the current year"""
         if month_name == "All Months":
             # Check if status filter is applied
-            if hasattr(self.view, 'filter_combo') and self.view.filter_combo.currentText() != "All Status":
-                status = self.view.filter_combo.currentText()
+            status = self._get_selected_status()
+            if status:
                 self.filter_orders_by_status(status)
             else:
                 self.load_orders_from_db()
             return
 
         try:
-            # Map month name to month number
-            month_map = {
-                "January": 1, "February": 2, "March": 3, "April": 4,
-                "May": 5, "June": 6, "July": 7, "August": 8,
-                "September": 9, "October": 10, "November": 11, "December": 12
-            }
-
-            month_number = month_map.get(month_name)
+            _, month_number = self._get_selected_month()
             if not month_number:
                 return
 
-            # Get all orders from database
-            all_orders = self.model.get_all_orders()
-
-            if not all_orders:
-                btn = self.view.show_no_orders_message(f"No orders found for {month_name}")
-                if btn:
-                    btn.clicked.connect(self.clear_filters_and_show_all)
-                return
+            filters = {'year': date.today().year, 'month': month_number}
+            filter_name = f"{month_name}"
 
-            # Filter orders by month
-            month_orders = []
-
-            for order in all_orders:
-                order_date_str = order.get('created_at', '')
-                if order_date_str:
-                    try:
-                        order_date = self.model.parse_date_string(order_date_str)
-                        if order_date and order_date.month == month_number:
-                            month_orders.append(order)
-                    except:
-                        continue
-
-            # Apply status filter if selected
-            if hasattr(self.view, 'filter_combo') and self.view.filter_combo.currentText() != "All Status":
-                status = self.view.filter_combo.currentText().lower()
-                status_filtered_orders = []
-                for order in month_orders:
-                    if order.get('status', '').lower() == status:
-                        status_filtered_orders.append(order)
-                month_orders = status_filtered_orders
-
-            # Display filtered orders
-            if month_orders:
-                filter_name = f"{month_name}"
-                if hasattr(self.view, 'filter_combo') and self.view.filter_combo.currentText() != "All Status":
-                    filter_name = f"{self.view.filter_combo.currentText().lower()} orders in {month_name}"
-
-                btn = self.view.display_filtered_orders(month_orders, filter_name, self.update_order_status)
-                if btn:
-                    btn.clicked.connect(self.clear_filters_and_show_all)
-            else:
-                # Show no orders message
-                filter_name = f"{month_name}"
-                if hasattr(self.view, 'filter_combo') and self.view.filter_combo.currentText() != "All Status":
-                    filter_name = f"{self.view.filter_combo.currentText().lower()} orders in {month_name}"
+            status = self._get_selected_status()
+            if status:
+                filters['status'] = status.lower()
+                filter_name = f"{status.lower()} orders in {month_name}"
 
-                btn = self.view.show_no_orders_message(f"No orders found for {filter_name}")
-                if btn:
-                    btn.clicked.connect(self.clear_filters_and_show_all)
+            self._show_order_results(filters, filter_name, f"No orders found for {filter_name}")
 
         except Exception as e:
             print(f"Error filtering orders by month: {e}")
@@ -492,56 +515,16 @@ class AdminDashboardController(QObject):
     def show_todays_orders(self):
         """Filter orders to show only today's orders"""
         try:
-            today = date.today()
-
-            # Get all orders from database
-            all_orders = self.model.get_all_orders()
-
-            if not all_orders:
-                btn = self.view.show_no_orders_message("No orders found for today")
-                if btn:
-                    btn.clicked.connect(self.clear_filters_and_show_all)
-                return
+            filters = {'day': date.today()}
+            filter_name = "today's orders"
+            empty_name = "today"
 
-            # Filter orders for today
-            todays_orders = []
-            for order in all_orders:
-                order_date_str = order.get('created_at', '')
-                if order_date_str:
-                    try:
-                        order_date = self.model.parse_date_string(order_date_str)
-                        if order_date and order_date.date() == today:
-                            todays_orders.append(order)
-                    except:
-                        continue
-
-            # Apply status filter if selected
-            if hasattr(self.view, 'filter_combo') and self.view.filter_combo.currentText() != "All Status":
-                status = self.view.filter_combo.currentText().lower()
-                status_filtered_orders = []
-                for order in todays_orders:
-                    if order.get('status', '').lower() == status:
-                        status_filtered_orders.append(order)
-                todays_orders = status_filtered_orders
-
-            # Display filtered orders
-            if todays_orders:
-                filter_name = "today's orders"
-                if hasattr(self.view, 'filter_combo') and self.view.filter_combo.currentText() != "All Status":
-                    filter_name = f"{self.view.filter_combo.currentText().lower()} orders today"
-
-                btn = self.view.display_filtered_orders(todays_orders, filter_name, self.update_order_status)
-                if btn:
-                    btn.clicked.connect(self.clear_filters_and_show_all)
-            else:
-                # Show no orders message
-                filter_name = "today"
-                if hasattr(self.view, 'filter_combo') and self.view.filter_combo.currentText() != "All Status":
-                    filter_name = f"{self.view.filter_combo.currentText().lower()} orders today"
+            status = self._get_selected_status()
+            if status:
+                filters['status'] = status.lower()
+                filter_name = empty_name = f"{status.lower()} orders today"
 
-                btn = self.view.show_no_orders_message(f"No orders found for {filter_name}")
-                if btn:
-                    btn.clicked.connect(self.clear_filters_and_show_all)
+            self._show_order_results(filters, filter_name, f"No orders found for {empty_name}")
 
         except Exception as e:
             print(f"Error filtering today's orders: {e}")
@@ -685,16 +668,8 @@ class AdminDashboardController(QObject):
             image = image_input.text().strip()
 
             if title and price:
-                # Save to database
-                try:
-                    success, message = self.model.create_menu_item(
-                        name=title,
-                        description=description,
-                        category=category,
-                        price=price,
-                        image_url=image
-                    )
-
+                def added(outcome):
+                    success, message = outcome
                     if success:
                         # Log the activity
                         self.model.log_activity(
@@ -703,16 +678,20 @@ class AdminDashboardController(QObject):
                         )
 
                         # Reload from database and refresh table
-                        self.model.load_menu_items_from_db()
-                        self.populate_menu_table()
+                        self._reload_menu_table()
                         self.view.show_message("Success", "Menu item added to database successfully!")
                     else:
                         self.view.show_message("Error", f"Failed to add menu item: {message}", QMessageBox.Icon.Warning)
 
-                except ValueError:
-                    self.view.show_message("Error", "Price must be a number!", QMessageBox.Icon.Warning)
-                except Exception as e:
-                    self.view.show_message("Error", f"An error occurred: {str(e)}", QMessageBox.Icon.Warning)
+                # Save to database
+                self.data.run(lambda: self.model.create_menu_item(
+                                  name=title,
+                                  description=description,
+                                  category=category,
+                                  price=price,
+                                  image_url=image
+                              ),
+                              on_result=added, on_error=self._show_action_error)
             else:
                 self.view.show_message("Error", "Title and price are required fields!", QMessageBox.Icon.Warning)
 
@@ -826,17 +805,8 @@ class AdminDashboardController(QObject):
             updated_image = image_input.text().strip()
 
             if updated_title and updated_price:
-                # Update in database
-                try:
-                    success, message = self.model.update_menu_item(
-                        item_id=item_id,
-                        name=updated_title,
-                        description=updated_description,
-                        category=updated_category,
-                        price=updated_price,
-                        image_url=updated_image
-                    )
-
+                def updated(outcome):
+                    success, message = outcome
                     if success:
                         # Log the activity
                         log_details = []
@@ -854,17 +824,22 @@ class AdminDashboardController(QObject):
                             )
 
                         # Reload from database and refresh table
-                        self.model.load_menu_items_from_db()
-                        self.populate_menu_table()
+                        self._reload_menu_table()
                         self.view.show_message("Success", "Menu item updated in database successfully!")
                     else:
                         self.view.show_message("Error", f"Failed to update menu item: {message}",
                                                QMessageBox.Icon.Warning)
 
-                except ValueError:
-                    self.view.show_message("Error", "Price must be a number!", QMessageBox.Icon.Warning)
-                except Exception as e:
-                    self.view.show_message("Error", f"An error occurred: {str(e)}", QMessageBox.Icon.Warning)
+                # Update in database
+                self.data.run(lambda: self.model.update_menu_item(
+                                  item_id=item_id,
+                                  name=updated_title,
+                                  description=updated_description,
+                                  category=updated_category,
+                                  price=updated_price,
+                                  image_url=updated_image
+                              ),
+                              on_result=updated, on_error=self._show_action_error)
             else:
                 self.view.show_message("Error", "Title and price are required fields!", QMessageBox.Icon.Warning)
 
@@ -915,22 +890,33 @@ class AdminDashboardController(QObject):
         """)
 
         if msg.exec() == QMessageBox.StandardButton.Yes:
+            def deleted(outcome):
+                success, message = outcome
+                if success:
+                    # Log the activity
+                    self.model.log_activity(
+                        "Deleted menu item",
+                        f"{item_name}"
+                    )
+
+                    # Reload from database and refresh table
+                    self._reload_menu_table()
+                    self.view.show_message("Success", f"'{item_name}' has been deleted from database.")
+                else:
+                    self.view.show_message("Error", f"Failed to delete item: {message}", QMessageBox.Icon.Warning)
+
             # Delete from database
-            success, message = self.model.delete_menu_item(item_id)
+            self.data.run(lambda: self.model.delete_menu_item(item_id),
+                          on_result=deleted, on_error=self._show_action_error)
 
-            if success:
-                # Log the activity
-                self.model.log_activity(
-                    "Deleted menu item",
-                    f"{item_name}"
-                )
+    def _reload_menu_table(self):
+        """Reload the menu from the database in the background, then repaint the table"""
+        self.data.run(self.model.load_menu_items_from_db,
+                      on_result=lambda _: self.populate_menu_table(), key='menu')
 
-                # Reload from database and refresh table
-                self.model.load_menu_items_from_db()
-                self.populate_menu_table()
-                self.view.show_message("Success", f"'{item_name}' has been deleted from database.")
-            else:
-                self.view.show_message("Error", f"Failed to delete item: {message}", QMessageBox.Icon.Warning)
+    def _show_action_error(self, error):
+        """Report a background save or delete that raised"""
+        self.view.show_message("Error", f"An error occurred: {str(error)}", QMessageBox.Icon.Warning)
 
     def populate_user_table(self):
         """Populate the user table with data"""
@@ -942,8 +928,8 @@ class AdminDashboardController(QObject):
 
     def refresh_users(self):
         """Refresh user data"""
-        self.model.load_users_from_db()
-        self.populate_user_table()
+        self.data.run(self.model.load_users_from_db,
+                      on_result=lambda _: self.populate_user_table(), key='users')
 
     def search_users(self):
         """Search users based on search term"""
@@ -998,40 +984,43 @@ class AdminDashboardController(QObject):
             user_data = dialog.get_user_data()
 
             if user_data:
-                success = False
-                message = ""
-
-                if user_data["role"] == "Customer":
-                    success, message = self.model.create_customer(
-                        full_name=user_data["fullname"],
-                        email=user_data["email"],
-                        phone=user_data["phone"],
-                        address=user_data["address"],
-                        password=user_data["password"]
-                    )
+                def create():
+                    if user_data["role"] == "Customer":
+                        return self.model.create_customer(
+                            full_name=user_data["fullname"],
+                            email=user_data["email"],
+                            phone=user_data["phone"],
+                            address=user_data["address"],
+                            password=user_data["password"]
+                        )
 
-                elif user_data["role"] == "Staff":
-                    success, message = self.model.create_staff(
-                        staff_name=user_data["fullname"],
-                        staff_email=user_data["email"],
-                        staff_phone=user_data["phone"],
-                        staff_address=user_data["address"],
-                        staff_password=user_data["password"]
-                    )
+                    elif user_data["role"] == "Staff":
+                        return self.model.create_staff(
+                            staff_name=user_data["fullname"],
+                            staff_email=user_data["email"],
+                            staff_phone=user_data["phone"],
+                            staff_address=user_data["address"],
+                            staff_password=user_data["password"]
+                        )
+                    return False, ""
 
-                if success:
-                    # Log the activity
-                    self.model.log_activity(
-                        f"Added new {user_data['role'].lower()}",
-                        f"{user_data['fullname']} ({user_data['email']})"
-                    )
+                def created(outcome):
+                    success, message = outcome
+                    if success:
+                        # Log the activity
+                        self.model.log_activity(
+                            f"Added new {user_data['role'].lower()}",
+                            f"{user_data['fullname']} ({user_data['email']})"
+                        )
 
-                    self.view.show_message("Success", message, QMessageBox.Icon.Information)
-                    # Refresh user data
-                    self.refresh_users()
-                else:
-                    self.view.show_message("Error", f"Failed to create {user_data['role'].lower()}: {message}",
-                                           QMessageBox.Icon.Warning)
+                        self.view.show_message("Success", message, QMessageBox.Icon.Information)
+                        # Refresh user data
+                        self.refresh_users()
+                    else:
+                        self.view.show_message("Error", f"Failed to create {user_data['role'].lower()}: {message}",
+                                               QMessageBox.Icon.Warning)
+
+                self.data.run(create, on_result=created, on_error=self._show_action_error)
 
     def edit_user(self, row, user):
         """Edit an existing user"""
@@ -1041,41 +1030,44 @@ class AdminDashboardController(QObject):
             updated_data = dialog.get_user_data()
 
             if updated_data:
-                success = False
-                message = ""
+                def update():
+                    if user['type'] == "customer":
+                        return self.model.update_customer(
+                            customer_id=user['id'],
+                            full_name=updated_data['fullname'],
+                            email=updated_data['email'],
+                            phone=updated_data['phone'],
+                            address=updated_data['address'],
+                            password=updated_data['password']
+                        )
 
-                if user['type'] == "customer":
-                    success, message = self.model.update_customer(
-                        customer_id=user['id'],
-                        full_name=updated_data['fullname'],
-                        email=updated_data['email'],
-                        phone=updated_data['phone'],
-                        address=updated_data['address'],
-                        password=updated_data['password']
-                    )
+                    elif user['type'] == "staff":
+                        return self.model.update_staff(
+                            staff_id=user['id'],
+                            staff_name=updated_data['fullname'],
+                            staff_email=updated_data['email'],
+                            staff_phone=updated_data['phone'],
+                            staff_address=updated_data['address'],
+                            staff_password=updated_data['password']
+                        )
+                    return False, ""
 
-                elif user['type'] == "staff":
-                    success, message = self.model.update_staff(
-                        staff_id=user['id'],
-                        staff_name=updated_data['fullname'],
-                        staff_email=updated_data['email'],
-                        staff_phone=updated_data['phone'],
-                        staff_address=updated_data['address'],
-                        staff_password=updated_data['password']
-                    )
+                def updated(outcome):
+                    success, message = outcome
+                    if success:
+                        # Log the activity
+                        self.model.log_activity(
+                            f"Updated {user['type']}",
+                            f"{user['name']} → {updated_data['fullname']}"
+                        )
 
-                if success:
-                    # Log the activity
-                    self.model.log_activity(
-                        f"Updated {user['type']}",
-                        f"{user['name']} → {updated_data['fullname']}"
-                    )
+                        self.view.show_message("Success", message, QMessageBox.Icon.Information)
+                        # Refresh user data
+                        self.refresh_users()
+                    else:
+                        self.view.show_message("Error", f"Failed to update user: {message}", QMessageBox.Icon.Warning)
 
-                    self.view.show_message("Success", message, QMessageBox.Icon.Information)
-                    # Refresh user data
-                    self.refresh_users()
-                else:
-                    self.view.show_message("Error", f"Failed to update user: {message}", QMessageBox.Icon.Warning)
+                self.data.run(update, on_result=updated, on_error=self._show_action_error)
 
     def delete_user(self, row, user):
         """Delete a user with confirmation"""
@@ -1119,16 +1111,16 @@ class AdminDashboardController(QObject):
         """)
 
         if msg.exec() == QMessageBox.StandardButton.Yes:
-            success = False
-            message = ""
-
-            try:
+            def delete():
                 if user['type'] == "customer":
-                    success, message = self.model.delete_customer(user['id'])
+                    return self.model.delete_customer(user['id'])
 
                 elif user['type'] == "staff":
-                    success, message = self.model.delete_staff(user['id'])
+                    return self.model.delete_staff(user['id'])
+                return False, ""
 
+            def deleted(outcome):
+                success, message = outcome
                 if success:
                     # Log the activity
                     self.model.log_activity(
@@ -1142,9 +1134,58 @@ class AdminDashboardController(QObject):
                 else:
                     self.view.show_message("Error", f"Failed to delete user: {message}", QMessageBox.Icon.Warning)
 
-            except Exception as e:
-                print(f"DEBUG: Exception during delete: {e}")
-                self.view.show_message("Error", f"An error occurred: {str(e)}", QMessageBox.Icon.Critical)
+            def failed(error):
+                print(f"DEBUG: Exception during delete: {error}")
+                self.view.show_message("Error", f"An error occurred: {str(error)}", QMessageBox.Icon.Critical)
+
+            self.data.run(delete, on_result=deleted, on_error=failed)
+
+    def _load_activities(self, filters, label, on_loaded=None):
+        """Show the first page of activities matching filters and their total count.
+
+        Both queries run in the background; on_loaded(total) is called once shown.
+        """
+        self.activity_filters = filters
+        self.activity_page_cursor = None
+        self.data.cancel('more_activities')
+        self._loading_more_activities = False
+
+        def fetch():
+            activities, next_cursor = self.model.find_activities_page(**filters)
+            return activities, next_cursor, self.model.count_activities(**filters)
+
+        def show(result):
+            activities, self.activity_page_cursor, total = result
+            self.view.populate_activity_table(activities)
+            self.view.activity_stats_label.setText(f"{label}: {total}")
+            if on_loaded is not None:
+                on_loaded(total)
+
+        def failed(error):
+            print(f"Error loading activities: {error}")
+            self.view.show_message("Error", "Failed to load activity logs", QMessageBox.Icon.Warning)
+
+        self.data.run(fetch, on_result=show, on_error=failed, key='activities')
+
+    def load_more_activities(self):
+        """Append the next page of the current activity listing (on scroll to end)"""
+        if self.activity_page_cursor is None or self._loading_more_activities:
+            return
+
+        self._loading_more_activities = True
+        filters, cursor = self.activity_filters, self.activity_page_cursor
+
+        def append(page):
+            self._loading_more_activities = False
+            activities, self.activity_page_cursor = page
+            self.view.append_activity_rows(activities)
+
+        def failed(error):
+            self._loading_more_activities = False
+            print(f"Error loading more activities: {error}")
+
+        self.data.run(lambda: self.model.find_activities_page(cursor=cursor, **filters),
+                      on_result=append, on_error=failed, key='more_activities')
 
     def refresh_activity_logs(self):
         """Refresh activity logs from database"""
@@ -1155,14 +1196,7 @@ class AdminDashboardController(QObject):
                 self.filter_activities_by_period(self.view.period_filter_combo.currentText())
             else:
                 # Load all activities
-                success, activities = self.model.get_all_activities(limit=100)
-
-                if success:
-                    self.view.populate_activity_table(activities)
-                    # Update stats label
-                    self.view.activity_stats_label.setText(f"Total activities: {len(activities)}")
-                else:
-                    self.view.show_message("Error", "Failed to load activity logs", QMessageBox.Icon.Warning)
+                self._load_activities({}, "Total activities")
 
         except Exception as e:
             print(f"Error refreshing activity logs: {e}")
@@ -1176,11 +1210,13 @@ class AdminDashboardController(QObject):
             self.refresh_activity_logs()
             return
 
-        success, activities = self.model.search_activities(search_term)
-
-        if success:
-            self.view.populate_activity_table(activities)
-        else:
+        try:
+            if self.view.period_filter_combo.currentText() == "Archived":
+                self.show_archived_activities(search_term)
+                return
+            self._load_activities({'search': search_term}, "Matching activities")
+        except Exception as e:
+            print(f"Error searching activities: {e}")
             self.view.show_message("Error", "Failed to search activities", QMessageBox.Icon.Warning)
 
     def show_todays_activities(self):
@@ -1188,59 +1224,25 @@ class AdminDashboardController(QObject):
         try:
             today = date.today()
 
-            # Get all activities
-            success, all_activities = self.model.get_all_activities(limit=1000)
-
-            if not success:
-                self.view.show_message("Error", "Failed to load activities", QMessageBox.Icon.Warning)
-                return
-
-            # Filter activities for today
-            todays_activities = []
-            for activity in all_activities:
-                timestamp = activity.get('created_at', '')
-                if timestamp:
-                    try:
-                        if isinstance(timestamp, datetime):
-                            activity_date = timestamp.date()
-                        elif isinstance(timestamp, str):
-                            # Try to extract date from timestamp string
-                            for fmt in ["%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M:%S.%f",
-                                        "%Y-%m-%dT%H:%M:%S", "%Y-%m-%dT%H:%M:%S.%f"]:
-                                try:
-                                    activity_dt = datetime.strptime(timestamp.split('.')[0], fmt)
-                                    activity_date = activity_dt.date()
-                                    break
-                                except:
-                                    continue
-                            else:
-                                continue
-                        else:
-                            continue
-
-                        if activity_date == today:
-                            todays_activities.append(activity)
-                    except:
-                        continue
-
-            # Display filtered activities
-            self.view.populate_activity_table(todays_activities)
-
-            # Update stats label
-            self.view.activity_stats_label.setText(f"Today's activities: {len(todays_activities)}")
-
-            # Reset the combobox to "All Time" when showing today's logs
+            # Reset the combobox to "All Time" without triggering a reload of all logs
             if hasattr(self.view, 'period_filter_combo'):
+                self.view.period_filter_combo.blockSignals(True)
                 self.view.period_filter_combo.setCurrentText("All Time")
+                self.view.period_filter_combo.blockSignals(False)
 
-            if todays_activities:
-                self.view.show_message("Today's Logs",
-                                       f"Showing {len(todays_activities)} activities from today",
-                                       QMessageBox.Icon.Information)
-            else:
-                self.view.show_message("Today's Logs",
-                                       "No activities found for today",
-                                       QMessageBox.Icon.Information)
+            def loaded(total):
+                if total:
+                    self.view.show_message("Today's Logs",
+                                           f"Showing {total} activities from today",
+                                           QMessageBox.Icon.Information)
+                else:
+                    self.view.show_message("Today's Logs",
+                                           "No activities found for today",
+                                           QMessageBox.Icon.Information)
+
+            # Today only, as an index range on created_at
+            self._load_activities({'date_from': today, 'date_to': today + timedelta(days=1)},
+                                  "Today's activities", on_loaded=loaded)
 
         except Exception as e:
             print(f"Error showing today's activities: {e}")
@@ -1254,79 +1256,18 @@ class AdminDashboardController(QObject):
             # Load all activities
             self.refresh_activity_logs()
             return
+        if period == "Archived":
+            self.show_archived_activities(self.view.activity_search_input.text().strip())
+            return
 
         try:
-            # Calculate the start date based on the period
-            today = date.today()
-
-            if period == "Last 3 Days":
-                start_date = today - timedelta(days=2)  # Today + 2 previous days
-            elif period == "Last 7 Days":
-                start_date = today - timedelta(days=6)  # Today + 6 previous days
-            elif period == "Last 30 Days":
-                start_date = today - timedelta(days=29)  # Today + 29 previous days
-            else:
-                return
-
-            # Get all activities
-            success, all_activities = self.model.get_all_activities(limit=1000)
-
-            if not success:
-                self.view.show_message("Error", "Failed to load activities", QMessageBox.Icon.Warning)
+            # Number of days covered, today included
+            period_days = {"Last 3 Days": 3, "Last 7 Days": 7, "Last 30 Days": 30}
+            if period not in period_days:
                 return
 
-            # Filter activities by date range
-            filtered_activities = []
-            for activity in all_activities:
-                timestamp = activity.get('created_at', '')
-                if timestamp:
-                    try:
-                        if isinstance(timestamp, datetime):
-                            activity_date = timestamp.date()
-                        elif isinstance(timestamp, str):
-                            # Try to extract date from timestamp string
-                            timestamp_str = str(timestamp).split('.')[0]  # Remove microseconds if present
-
-                            # Try different date formats
-                            for fmt in ["%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M:%S.%f",
-                                        "%Y-%m-%dT%H:%M:%S", "%Y-%m-dT%H:%M:%S.%f"]:
-                                try:
-                                    activity_dt = datetime.strptime(timestamp_str, fmt)
-                                    activity_date = activity_dt.date()
-                                    break
-                                except ValueError:
-                                    continue
-                            else:
-                                # If none of the formats work, try to extract just the date part
-                                try:
-                                    date_part = timestamp_str.split(' ')[0]
-                                    activity_date = datetime.strptime(date_part, "%Y-%m-%d").date()
-                                except:
-                                    continue
-                        else:
-                            continue
-
-                        # Check if activity date is within the range
-                        if start_date <= activity_date <= today:
-                            filtered_activities.append(activity)
-
-                    except Exception as e:
-                        print(f"DEBUG: Error parsing timestamp '{timestamp}': {e}")
-                        continue
-
-            # Display filtered activities
-            self.view.populate_activity_table(filtered_activities)
-
-            # Update stats label
-            period_text = period.lower()
-            if period == "Last 3 Days":
-                period_text = "last 3 days"
-            elif period == "Last 7 Days":
-                period_text = "last 7 days"
-            elif period == "Last 30 Days":
-                period_text = "last 30 days"
-
-            self.view.activity_stats_label.setText(f"Activities in the {period_text}: {len(filtered_activities)}")
+            start_date = date.today() - timedelta(days=period_days[period] - 1)
+            self._load_activities({'date_from': start_date}, f"Activities in the {period.lower()}")
 
         except Exception as e:
             print(f"Error filtering activities by period: {e}")
@@ -1334,6 +1275,80 @@ class AdminDashboardController(QObject):
                                    f"Failed to filter activities: {str(e)}",
                                    QMessageBox.Icon.Warning)
 
+    def show_archived_activities(self, search_term=""):
+        """Show activities from the compressed archive (optionally filtered by search)"""
+        limit = 500
+
+        # The archive is read in one go; there is no next page to load
+        self.activity_filters = {}
+        self.activity_page_cursor = None
+        self.data.cancel('more_activities')
+
+        def show(result):
+            success, activities = result
+            if not success:
+                self.view.show_message("Error", f"Failed to read archive: {activities}", QMessageBox.Icon.Warning)
+                return
+
+            self.view.populate_activity_table(activities)
+            suffix = f" (newest {limit} shown)" if len(activities) >= limit else ""
+            self.view.activity_stats_label.setText(f"Archived activities: {len(activities)}{suffix}")
+
+        def failed(error):
+            print(f"Error showing archived activities: {error}")
+            self.view.show_message("Error", f"Failed to read archive: {str(error)}", QMessageBox.Icon.Warning)
+
+        self.data.run(lambda: self.model.find_archived_activities(search=search_term or None, limit=limit),
+                      on_result=show, on_error=failed, key='activities')
+
+    def archive_old_activities(self):
+        """Move activity logs past the retention window into the archive"""
+        msg = QMessageBox()
+        msg.setWindowTitle("Archive Old Logs")
+        msg.setText(f"Move activity logs older than {ACTIVITY_RETENTION_DAYS} days into the archive?")
+        msg.setInformativeText("Archived logs stay searchable with the \"Archived\" period filter.")
+        msg.setIcon(QMessageBox.Icon.Question)
+        msg.setStandardButtons(QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+        msg.setStyleSheet("""
+            QMessageBox {
+                background-color: white;
+            }
+            QLabel {
+                color: black;
+                font-size: 14px;
+            }
+            QPushButton {
+                color: black;
+                background-color: #f0f0f0;
+                border: 1px solid #ccc;
+                padding: 5px 15px;
+                border-radius: 5px;
+                min-width: 80px;
+            }
+            QPushButton:hover {
+                background-color: #e0e0e0;
+            }
+        """)
+
+        if msg.exec() != QMessageBox.StandardButton.Yes:
+            return
+
+        def archived(outcome):
+            if hasattr(self.view, 'activity_archive_btn'):
+                self.view.activity_archive_btn.setEnabled(True)
+            success, result = outcome
+            if success:
+                self.refresh_activity_logs()
+                self.view.show_message("Archive", f"Archived {result} activity logs", QMessageBox.Icon.Information)
+            else:
+                self.view.show_message("Error", f"Failed to archive logs: {result}", QMessageBox.Icon.Warning)
+
+        # Archiving a large backlog takes a while; keep the window responsive
+        if hasattr(self.view, 'activity_archive_btn'):
+            self.view.activity_archive_btn.setEnabled(False)
+        self.data.run(self.model.archive_old_activities, on_result=archived,
+                      on_error=lambda e: archived((False, str(e))))
+
     def clear_activity_logs(self):
         """Clear all activity logs with confirmation"""
         msg = QMessageBox()
@@ -1376,13 +1391,15 @@ class AdminDashboardController(QObject):
         """)
 
         if msg.exec() == QMessageBox.StandardButton.Yes:
-            success, message = self.model.clear_all_activities()
+            def cleared(outcome):
+                success, message = outcome
+                if success:
+                    self.refresh_activity_logs()
+                    self.view.show_message("Success", "All activity logs have been cleared", QMessageBox.Icon.Information)
+                else:
+                    self.view.show_message("Error", f"Failed to clear logs: {message}", QMessageBox.Icon.Warning)
 
-            if success:
-                self.refresh_activity_logs()
-                self.view.show_message("Success", "All activity logs have been cleared", QMessageBox.Icon.Information)
-            else:
-                self.view.show_message("Error", f"Failed to clear logs: {message}", QMessageBox.Icon.Warning)
+            self.data.run(self.model.clear_all_activities, on_result=cleared, on_error=self._show_action_error)
 
     def handle_logout(self):
         """Show confirmation dialog before logging out"""
@@ -1390,6 +1407,8 @@ class AdminDashboardController(QObject):
         if result == QMessageBox.StandardButton.Yes:
             # Log logout activity
             self.model.log_activity("Admin logged out")
+            # Results still in flight belong to a dashboard that is going away
+            self.data.cancel_all()
             self.view.logout_requested.emit()
 
     def show(self):
@@ -1418,17 +1437,30 @@ class AdminDashboardController(QObject):
             if not file_path.lower().endswith('.pdf'):
                 file_path += '.pdf'
 
-            # Get current overview data
-            total_revenue = self.model.get_total_revenue_from_db()
-            today_orders = self.model.get_todays_orders_count()
-            pending_orders = self.model.get_pending_orders_count()
-            user_count = len([u for u in self.model.all_users if u['role'].lower() != 'admin'])
+        except Exception as e:
+            self._pdf_export_failed(e)
+            return False
 
-            # Get accurate monthly revenue data from database
-            monthly_revenue = self._get_accurate_monthly_revenue_data()
+        # The report data is queried in the background; the PDF is written once it arrives
+        self.data.run(self._load_overview_report_data,
+                      on_result=lambda report: self._write_overview_pdf(file_path, report),
+                      on_error=self._pdf_export_failed, key='pdf_export')
+        return True
 
-            # Get accurate popular items data from database
-            popular_items = self._get_accurate_popular_items_data()
+    def _load_overview_report_data(self):
+        """Query everything the overview PDF shows (runs on a DataService thread)"""
+        # Get current overview data
+        self.model.load_analytics_data()
+        overview = (self.model.get_total_revenue_from_db(), self.model.get_todays_orders_count(),
+                    self.model.get_pending_orders_count(), self.model.get_active_user_count())
+
+        # Get accurate monthly revenue and popular items data from database
+        return overview, self._get_accurate_monthly_revenue_data(), self._get_accurate_popular_items_data()
+
+    def _write_overview_pdf(self, file_path, report):
+        """Build the overview PDF from _load_overview_report_data() results"""
+        try:
+            (total_revenue, today_orders, pending_orders, user_count), monthly_revenue, popular_items = report
 
             # Create PDF document
             doc = SimpleDocTemplate(
@@ -1687,62 +1719,41 @@ class AdminDashboardController(QObject):
                 QMessageBox.Icon.Information
             )
 
-            return True
-
         except Exception as e:
-            print(f"Error exporting PDF: {e}")
-            import traceback
-            traceback.print_exc()
-            self.view.show_message(
-                "Export Failed",
-                f"Failed to export PDF: {str(e)}",
-                QMessageBox.Icon.Warning
-            )
-            return False
+            self._pdf_export_failed(e)
+
+    def _pdf_export_failed(self, error):
+        """Report a failed PDF export"""
+        print(f"Error exporting PDF: {error}")
+        import traceback
+        traceback.print_exception(type(error), error, error.__traceback__)
+        self.view.show_message(
+            "Export Failed",
+            f"Failed to export PDF: {str(error)}",
+            QMessageBox.Icon.Warning
+        )
 
     def _get_accurate_monthly_revenue_data(self):
-        """Get accurate monthly revenue data from database for the past 6 months"""
+        """Get completed revenue for the past 6 calendar months from the daily_sales rollup"""
         try:
-            # Import orders_db to query orders
-            from db.orders_db import orders_db_instance as orders_db
+            # Last 6 calendar months, oldest first, ending with the current month
+            today = date.today()
+            months = []
+            year, month = today.year, today.month
+            for _ in range(6):
+                months.insert(0, (year, month))
+                year, month = (year - 1, 12) if month == 1 else (year, month - 1)
+
+            start = date(months[0][0], months[0][1], 1)
+            end = date(today.year + 1, 1, 1) if today.month == 12 else date(today.year, today.month + 1, 1)
 
-            # Get all completed orders
-            success, orders = orders_db.get_all_orders()
+            success, by_month = daily_sales.get_monthly_revenue(start, end)
             if not success:
-                print("Failed to get orders for monthly revenue data")
+                print("Failed to get monthly revenue data")
                 return {}
 
-            # Initialize monthly revenue dictionary for last 6 months
-            monthly_revenue = {}
-            current_date = datetime.now()
-
-            # Generate last 6 months
-            for i in range(6):
-                month_date = current_date - timedelta(days=30 * i)
-                month_name = month_date.strftime("%B")
-                monthly_revenue[month_name] = 0.0
-
-            # Process orders
-            for order in orders:
-                # Only count completed orders
-                if order.get('status', '').lower() == 'completed':
-                    order_date_str = order.get('created_at', '')
-                    if order_date_str:
-                        try:
-                            order_date = self.model.parse_date_string(order_date_str)
-                            if order_date:
-                                # Check if order is within last 6 months
-                                six_months_ago = current_date - timedelta(days=180)
-                                if order_date >= six_months_ago:
-                                    month_name = order_date.strftime("%B")
-                                    amount = float(order.get('total_amount', 0))
-                                    if month_name in monthly_revenue:
-                                        monthly_revenue[month_name] += amount
-                        except Exception as e:
-                            print(f"Error processing order date: {e}")
-                            continue
-
-            return monthly_revenue
+            return {date(year, month, 1).strftime("%B"): by_month.get((year, month), 0.0)
+                    for year, month in months}
 
         except Exception as e:
             print(f"Error getting accurate monthly revenue data: {e}")
@@ -1753,58 +1764,14 @@ class AdminDashboardController(QObject):
         try:
             # Import orders_db to query orders
             from db.orders_db import orders_db_instance as orders_db
-            # Import menu_db to get item names
-            from db.menu_db import menu_db
 
-            # Get all completed orders
-            success, orders = orders_db.get_all_orders()
+            # Most ordered items across completed orders, aggregated in SQL
+            success, popular_items = orders_db.get_popular_items(limit=20, rank_by='order_count')
             if not success:
-                print("Failed to get orders for popular items data")
+                print("Failed to get popular items data")
                 return []
 
-            # Dictionary to track item statistics
-            item_stats = {}
-
-            # Process orders
-            for order in orders:
-                # Only count completed orders
-                if order.get('status', '').lower() == 'completed':
-                    items = order.get('items', [])
-                    for item in items:
-                        item_id = item.get('item_id')
-                        item_name = item.get('title', 'Unknown')
-                        item_price = float(item.get('price', 0).replace('₱', '').replace(',', '')) if '₱' in str(
-                            item.get('price', 0)) else float(item.get('price', 0))
-                        quantity = int(item.get('qty', 1))
-
-                        # Get category from menu_db if possible
-                        item_category = 'Unknown'
-                        try:
-                            if item_id:
-                                menu_item = menu_db.get_menu_item_by_id(item_id)
-                                if menu_item:
-                                    item_category = menu_item.get('category', 'Unknown')
-                        except:
-                            pass
-
-                        if item_name not in item_stats:
-                            item_stats[item_name] = {
-                                'name': item_name,
-                                'category': item_category,
-                                'order_count': 0,
-                                'total_quantity': 0,
-                                'total_revenue': 0.0
-                            }
-
-                        item_stats[item_name]['order_count'] += 1
-                        item_stats[item_name]['total_quantity'] += quantity
-                        item_stats[item_name]['total_revenue'] += (item_price * quantity)
-
-            # Convert to list and sort by order count (most popular first)
-            popular_items = list(item_stats.values())
-            popular_items.sort(key=lambda x: x['order_count'], reverse=True)
-
-            return popular_items[:20]  # Return top 20 items
+            return popular_items
 
         except Exception as e:
             print(f"Error getting accurate popular items data: {e}")
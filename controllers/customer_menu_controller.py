@@ -7,7 +7,8 @@ from PyQt6.QtWidgets import QMessageBox
 from typing import Dict, List, Optional
 from models.customer_menu_model import CustomerMenuModel
 from views.customer_menu_view import CustomerMenuView
-from db.orders_db import orders_db_instance as orders_db
+from db.orders_db import orders_db_instance as orders_db, prefetch_order_lines
+from .data_service import DataService
 import os
 from datetime import datetime
 
@@ -23,10 +24,16 @@ class CustomerMenuController(QObject):
         super().__init__()
         self.customer_info = customer_info
         self.cart_items = []  # Store cart items in controller
+        self.orders_cursor = None  # Keyset of the last order shown on the Orders page
+        self._loading_more_orders = False
 
         # Initialize view first (as in original code)
         self.view = CustomerMenuView(customer_info)
 
+        # Database calls run off the GUI thread; the view shows a busy cursor meanwhile
+        self.data = DataService(self)
+        self.data.busy_changed.connect(self.view.set_loading)
+
         # Initialize model
         self.model = CustomerMenuModel()
         self.model.set_customer_info(customer_info)
@@ -43,7 +50,7 @@ class CustomerMenuController(QObject):
     def _connect_signals(self):
         """Connect view signals to controller methods"""
         # Logout signals
-        self.view.logout_requested.connect(self.logout_requested.emit)
+        self.view.logout_requested.connect(self._handle_logout)
 
         # Add to cart signal
         self.view.add_to_cart_requested.connect(self._handle_add_to_cart)
@@ -62,9 +69,18 @@ class CustomerMenuController(QObject):
         # Page navigation
         self.view.bottomnav.page_changed.connect(self._handle_page_change)
 
+        # Orders page paging
+        self.view.orders_page.load_more_requested.connect(self._load_more_orders)
+
     def _load_menu_items(self):
-        """Load menu items from database - matching original code"""
-        menu_items = self.model.load_menu_items_from_db()
+        """Show the menu from the local snapshot at once, then reconcile with the database"""
+        menu_items = self.model.load_menu_items_from_snapshot()
+        if not menu_items:
+            # Nothing cached on this machine yet - load from the database directly
+            menu_items = self.model.load_menu_items_from_db()
+        else:
+            self.data.run(self.model.fetch_menu_items, on_result=self._handle_menu_reconciled, key='menu')
+
         self.view.menu_items = menu_items
 
         # Get unique categories for filter
@@ -73,6 +89,15 @@ class CustomerMenuController(QObject):
         # Display in view
         self.view.display_menu_items(menu_items, categories)
 
+    def _handle_menu_reconciled(self, menu_items):
+        """Re-render the menu only if the database catalog differs from the snapshot"""
+        if not menu_items or menu_items == self.model.menu_items:
+            return  # database unreachable or nothing changed - keep showing the snapshot
+
+        self.model.menu_items = menu_items
+        self.view.menu_items = menu_items
+        self.view.display_menu_items(self.model.filter_items_by_category(self.model.current_category))
+
     def _handle_page_change(self, page_name: str):
         """Handle page navigation - matching original"""
         print(f"DEBUG: Page changed to: {page_name}")
@@ -411,6 +436,13 @@ class CustomerMenuController(QObject):
                 """)
                 error_msg.exec()
 
+    def _load_orders_page(self, cursor=None):
+        """Worker-thread fetch of one page of this customer's orders, lines included"""
+        success, page = self.model.load_orders_page(self.customer_info, cursor)
+        if success:
+            prefetch_order_lines(page['orders'])
+        return success, page
+
     def _load_all_orders_with_new_one(self, new_order):
         """Load all orders from database including the new one"""
         print(f"DEBUG: Loading all orders with new one")
@@ -421,31 +453,36 @@ class CustomerMenuController(QObject):
         # First add the new order (most recent)
         self.view.orders_page.add_order_card(new_order)
 
-        # Then load and add other orders from database
-        success, orders = self.model.load_orders_from_db(self.customer_info)
+        def show(result):
+            # Then add the first page of other orders from database
+            success, page = result
+            orders = page['orders'] if success else page
+            self.orders_cursor = page['next_cursor'] if success else None
 
-        if success and orders:
-            print(f"DEBUG: Loaded {len(orders)} orders from database")
+            if success and orders:
+                print(f"DEBUG: Loaded {len(orders)} orders from database")
 
-            # Add each order except the one we just added
-            for order in orders:
-                # Skip if this is the same order we just added
-                if 'order_number' in order and order.get('order_number') == new_order.get('order_number'):
-                    continue
+                # Add each order except the one we just added
+                for order in orders:
+                    # Skip if this is the same order we just added
+                    if 'order_number' in order and order.get('order_number') == new_order.get('order_number'):
+                        continue
 
-                # Format date before displaying
-                if 'created_at' in order:
-                    order['formatted_date'] = self.model.format_database_date(order.get('created_at', ''))
-                else:
-                    order['formatted_date'] = new_order.get('date', 'Date not available')
+                    # Format date before displaying
+                    if 'created_at' in order:
+                        order['formatted_date'] = self.model.format_database_date(order.get('created_at', ''))
+                    else:
+                        order['formatted_date'] = new_order.get('date', 'Date not available')
 
-                # Make sure order has required fields
-                if 'items' not in order:
-                    order['items'] = []
+                    # Make sure order has required fields
+                    if 'items' not in order:
+                        order['items'] = []
 
-                self.view.orders_page.add_order_card(order)
-        else:
-            print(f"DEBUG: No other orders found or error loading: {orders}")
+                    self.view.orders_page.add_order_card(order)
+            else:
+                print(f"DEBUG: No other orders found or error loading: {orders}")
+
+        self._start_orders_load(show)
 
     def _load_orders(self):
         """Load customer orders - FIXED to work properly"""
@@ -454,25 +491,66 @@ class CustomerMenuController(QObject):
         # Clear existing orders first
         self.view.orders_page.orders_list.clear()
 
-        success, orders = self.model.load_orders_from_db(self.customer_info)
-        print(f"DEBUG: Load orders success: {success}")
-        print(f"DEBUG: Orders returned: {len(orders) if orders else 0}")
+        def show(result):
+            success, page = result
+            orders = page['orders'] if success else page
+            self.orders_cursor = page['next_cursor'] if success else None
+            print(f"DEBUG: Load orders success: {success}")
+            print(f"DEBUG: Orders returned: {len(orders) if orders else 0}")
 
-        if success and orders:
-            for order in orders:
-                print(f"DEBUG: Processing order: {order.get('order_number', 'No order number')}")
+            if success and orders:
+                for order in orders:
+                    print(f"DEBUG: Processing order: {order.get('order_number', 'No order number')}")
 
-                # Format date before displaying
-                order['formatted_date'] = self.model.format_database_date(order.get('created_at', ''))
+                    # Format date before displaying
+                    order['formatted_date'] = self.model.format_database_date(order.get('created_at', ''))
+
+                    # Make sure order has required fields
+                    if 'items' not in order:
+                        order['items'] = []
+
+                    self.view.orders_page.add_order_card(order)
+            else:
+                print(f"DEBUG: Showing no orders message")
+                self.view.orders_page.show_no_orders("No orders yet" if success else "Error loading orders")
+
+        self._start_orders_load(show)
+
+    def _start_orders_load(self, show):
+        """Fetch the first orders page in the background and pass (success, page) to show"""
+        self.orders_cursor = None
+        self.data.cancel('more_orders')
+        self._loading_more_orders = False
+        self.data.run(self._load_orders_page, on_result=show, key='orders',
+                      on_error=lambda e: self.view.orders_page.show_no_orders("Error loading orders"))
+
+    def _load_more_orders(self):
+        """Append the next page of orders when the list is scrolled to the end"""
+        if self.orders_cursor is None or self._loading_more_orders:
+            return
+
+        def append(result):
+            self._loading_more_orders = False
+            success, page = result
+            if not success:
+                self.orders_cursor = None
+                return
 
-                # Make sure order has required fields
+            self.orders_cursor = page['next_cursor']
+            for order in page['orders']:
+                order['formatted_date'] = self.model.format_database_date(order.get('created_at', ''))
                 if 'items' not in order:
                     order['items'] = []
-
                 self.view.orders_page.add_order_card(order)
-        else:
-            print(f"DEBUG: Showing no orders message")
-            self.view.orders_page.show_no_orders("No orders yet" if success else "Error loading orders")
+
+        def failed(error):
+            self._loading_more_orders = False
+            print(f"Error loading more orders: {error}")
+
+        self._loading_more_orders = True
+        cursor = self.orders_cursor
+        self.data.run(lambda: self._load_orders_page(cursor), on_result=append, on_error=failed,
+                      key='more_orders')
 
     def _handle_filter_category(self, category: str):
         """Handle category filter"""
@@ -508,6 +586,11 @@ class CustomerMenuController(QObject):
         else:
             self.view.profile_page.show_message("Update Failed", message, QMessageBox.Icon.Warning)
 
+    def _handle_logout(self):
+        """Drop background results meant for this screen, then log out"""
+        self.data.cancel_all()
+        self.logout_requested.emit()
+
     def get_view(self) -> CustomerMenuView:
         """Get the view component"""
         return self.view
@@ -0,0 +1,212 @@
+# data_service.py
+"""
+Background data service for controllers
+Runs model and db calls on a QThreadPool and hands the results back to the
+GUI thread through Qt signals, so a slow query never freezes the window.
+Coroutines using db.async_db can be started the same way with spawn().
+"""
+import asyncio
+import traceback
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+
+from db.connection import DATA_THREADS
+from .qt_asyncio import qt_asyncio_loop
+
+
+_thread_pool = None
+
+
+def data_thread_pool():
+    """Thread pool shared by every DataService"""
+    global _thread_pool
+    if _thread_pool is None:
+        _thread_pool = QThreadPool()
+        _thread_pool.setMaxThreadCount(DATA_THREADS)
+    return _thread_pool
+
+
+class _TaskSignals(QObject):
+    """Signals of one task (created on the GUI thread, so slots run there)"""
+
+    succeeded = pyqtSignal(object)
+    failed = pyqtSignal(object)
+    finished = pyqtSignal()
+
+
+class DataTask(QRunnable):
+    """One call run on the data thread pool; cancel() discards its result"""
+
+    def __init__(self, fn, key=None, silent=False):
+        super().__init__()
+        self.fn = fn
+        self.key = key
+        self.silent = silent
+        self.cancelled = False
+        self.signals = _TaskSignals()
+        # The service keeps the Python reference until the task has finished
+        self.setAutoDelete(False)
+
+    def cancel(self):
+        """Drop the result; a query already running is left to finish on its own"""
+        self.cancelled = True
+
+    def run(self):
+        try:
+            if not self.cancelled:
+                result = self.fn()
+                if not self.cancelled:
+                    self.signals.succeeded.emit(result)
+        except Exception as e:
+            if not self.cancelled:
+                print(f"Background data task error: {e}")
+                self.signals.failed.emit(e)
+        finally:
+            self.signals.finished.emit()
+
+
+class AsyncDataTask:
+    """One coroutine run on the Qt asyncio loop; cancel() cancels it at its next await"""
+
+    def __init__(self, key=None, silent=False):
+        self.key = key
+        self.silent = silent
+        self.cancelled = False
+        self.future = None
+
+    def cancel(self):
+        self.cancelled = True
+        if self.future is not None:
+            self.future.cancel()
+
+
+class DataService(QObject):
+    """Runs controller data calls off the GUI thread.
+
+    run(fn, on_result, on_error, key) calls fn() on a worker thread and then
+    on_result(result) - or on_error(exception) - on the GUI thread. Starting a
+    task with a key cancels the previous task with the same key, so only the
+    latest page/filter/search request updates the screen. busy_changed drives
+    the loading state of the view; silent tasks (e.g. polling) do not count
+    towards it. spawn() takes a coroutine function instead
+    and runs it on the GUI thread's asyncio loop with the same callbacks and keys.
+    """
+
+    busy_changed = pyqtSignal(bool)
+
+    def __init__(self, parent=None, thread_pool=None):
+        super().__init__(parent)
+        self.thread_pool = thread_pool or data_thread_pool()
+        self._tasks = set()         # every task not yet finished, cancelled or not
+        self._keyed = {}            # key -> latest task started with that key
+        self._busy = False
+
+    def run(self, fn, on_result=None, on_error=None, key=None, silent=False):
+        """Run fn() in the background; returns the DataTask"""
+        if key is not None:
+            self.cancel(key)
+
+        task = DataTask(fn, key, silent)
+        if on_result is not None:
+            task.signals.succeeded.connect(lambda result: self._deliver(task, on_result, result))
+        if on_error is not None:
+            task.signals.failed.connect(lambda error: self._deliver(task, on_error, error))
+        task.signals.finished.connect(lambda: self._finish(task))
+
+        self._tasks.add(task)
+        if key is not None:
+            self._keyed[key] = task
+        self._update_busy()
+
+        self.thread_pool.start(task)
+        return task
+
+    def spawn(self, coro_fn, on_result=None, on_error=None, key=None, silent=False):
+        """Run the coroutine coro_fn() on the Qt asyncio loop; returns the AsyncDataTask"""
+        if key is not None:
+            self.cancel(key)
+
+        task = AsyncDataTask(key, silent)
+
+        # Callbacks are posted back to Qt so they never run inside an asyncio
+        # loop step (a modal dialog there would re-enter the loop)
+        def post(callback, value):
+            QTimer.singleShot(0, lambda: self._deliver(task, callback, value))
+
+        async def run():
+            try:
+                result = await coro_fn()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if not task.cancelled:
+                    print(f"Background data task error: {e}")
+                    if on_error is not None:
+                        post(on_error, e)
+            else:
+                if on_result is not None:
+                    post(on_result, result)
+
+        self._tasks.add(task)
+        if key is not None:
+            self._keyed[key] = task
+        self._update_busy()
+
+        task.future = qt_asyncio_loop().create_task(run())
+        # Queued behind the result, so the task stays busy until it is delivered
+        task.future.add_done_callback(lambda _: QTimer.singleShot(0, lambda: self._finish(task)))
+        return task
+
+    def cancel(self, key):
+        """Cancel the running or queued task started with `key`"""
+        task = self._keyed.pop(key, None)
+        if task is not None:
+            self._cancel_task(task)
+
+    def cancel_all(self):
+        """Cancel every task of this service (e.g. when its screen is closed)"""
+        self._keyed.clear()
+        for task in list(self._tasks):
+            self._cancel_task(task)
+
+    def is_busy(self, key=None):
+        """True while any non-silent (or the keyed) task is still expected to deliver"""
+        if key is not None:
+            return key in self._keyed
+        return any(not task.cancelled and not task.silent for task in self._tasks)
+
+    def _cancel_task(self, task):
+        task.cancel()
+        # A task still waiting in the queue never runs, so it never reports finished
+        if isinstance(task, DataTask) and self.thread_pool.tryTake(task):
+            self._tasks.discard(task)
+        self._update_busy()
+
+    def _deliver(self, task, callback, value):
+        """Call a result/error callback on the GUI thread unless the task was cancelled"""
+        if task.cancelled:
+            return
+        try:
+            callback(value)
+        except RuntimeError as e:
+            # The view was deleted while the query ran (e.g. logout)
+            print(f"Dropped background result: {e}")
+        except Exception as e:
+            # An exception escaping a slot would abort the application
+            print(f"Error handling background result: {e}")
+            traceback.print_exc()
+
+    def _finish(self, task):
+        self._tasks.discard(task)
+        if task.key is not None and self._keyed.get(task.key) is task:
+            del self._keyed[task.key]
+        self._update_busy()
+
+    def _update_busy(self):
+        busy = self.is_busy()
+        if busy != self._busy:
+            self._busy = busy
+            try:
+                self.busy_changed.emit(busy)
+            except RuntimeError:
+                pass
\ No newline at end of file
@@ -0,0 +1,60 @@
+# qt_asyncio.py
+"""
+asyncio event loop driven by the Qt event loop
+Coroutines run on the GUI thread, so they may touch widgets between awaits,
+while the blocking database work they await runs on db.async_db's executor.
+The asyncio loop is stepped by a QTimer only while it has tasks, so an idle
+app does not poll.
+"""
+import asyncio
+
+from PyQt6.QtCore import QObject, QTimer
+
+
+ASYNC_STEP_INTERVAL_MS = 5      # how often pending tasks are serviced
+
+_qt_loop = None
+
+
+class QtAsyncioLoop(QObject):
+    """Runs an asyncio loop in short steps from Qt timer events"""
+
+    def __init__(self, interval_ms=ASYNC_STEP_INTERVAL_MS, parent=None):
+        super().__init__(parent)
+        self.loop = asyncio.new_event_loop()
+        self._pending = 0
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self._step)
+
+    def create_task(self, coro):
+        """Schedule a coroutine; returns its asyncio.Task"""
+        task = self.loop.create_task(coro)
+        self._pending += 1
+        task.add_done_callback(self._task_done)
+        if not self._timer.isActive():
+            self._timer.start()
+        return task
+
+    def _task_done(self, task):
+        self._pending -= 1
+
+    def _step(self):
+        """Run the callbacks that are ready now (never blocks the GUI thread)"""
+        if self.loop.is_running():
+            # Timer fired from a nested Qt event loop (e.g. a modal dialog) inside a step
+            return
+        # A stop() queued ahead makes run_forever() return after one iteration
+        self.loop.call_soon(self.loop.stop)
+        self.loop.run_forever()
+        if not self._pending:
+            self._timer.stop()
+
+
+def qt_asyncio_loop():
+    """asyncio loop shared by every controller (create after QApplication)"""
+    global _qt_loop
+    if _qt_loop is None:
+        _qt_loop = QtAsyncioLoop()
+    return _qt_loop
\ No newline at end of file
@@ -0,0 +1,73 @@
+# refresh_pipeline.py
+"""
+Concurrent page refresh pipeline
+A refresh is split into independent stages, each an async fetch (through
+db.async_db, so off the GUI thread) plus a paint step. All fetches start at
+once and every stage paints as soon as its own data arrives, so a quick card
+never waits for the slowest chart. Fetch and paint time are recorded per stage.
+"""
+import asyncio
+from time import perf_counter
+
+
+class RefreshStage:
+    """One independently fetched and painted part of a page"""
+
+    def __init__(self, name, fetch, paint=None):
+        self.name = name
+        self.fetch = fetch      # coroutine function returning the stage's data
+        self.paint = paint      # called on the GUI thread with that data
+
+
+class RefreshPipeline:
+    """Runs RefreshStages concurrently and times each of them"""
+
+    def __init__(self, stages):
+        self.stages = list(stages)
+        self.timings = {}
+        self.total_ms = None
+
+    @property
+    def failed(self):
+        """Names of the stages whose fetch or paint raised"""
+        return [name for name, timing in self.timings.items() if timing['error'] is not None]
+
+    async def run(self):
+        """Run every stage; a failing stage does not stop the others. Returns self."""
+        started = perf_counter()
+        await asyncio.gather(*(self._run_stage(stage) for stage in self.stages))
+        self.total_ms = (perf_counter() - started) * 1000
+        return self
+
+    async def _run_stage(self, stage):
+        timing = {'fetch_ms': None, 'paint_ms': None, 'error': None}
+        self.timings[stage.name] = timing
+
+        started = perf_counter()
+        try:
+            data = await stage.fetch()
+            fetched = perf_counter()
+            timing['fetch_ms'] = (fetched - started) * 1000
+
+            if stage.paint is not None:
+                stage.paint(data)
+                timing['paint_ms'] = (perf_counter() - fetched) * 1000
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            timing['error'] = e
+            print(f"Refresh stage '{stage.name}' failed: {e}")
+
+    def summary(self):
+        """One line per stage, e.g. for the console"""
+        lines = []
+        for name, timing in self.timings.items():
+            if timing['error'] is not None:
+                lines.append(f"{name}: failed ({timing['error']})")
+            else:
+                paint = f", paint {timing['paint_ms']:.0f} ms" if timing['paint_ms'] is not None else ""
+                lines.append(f"{name}: fetch {timing['fetch_ms']:.0f} ms{paint}")
+        if self.total_ms is not None:
+            lines.append(f"total: {self.total_ms:.0f} ms")
+        return lines
\ No newline at end of file
@@ -2,9 +2,14 @@
 Staff Dashboard Controller
 Coordinates between Model and View, handles business logic
 """
-from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
 from models.staff_dashboard_model import StaffDashboardModel
 from views.staff_dashboard_view import StaffDashboardView
+from db.orders_db import prefetch_order_lines
+from .data_service import DataService
+
+
+LIVE_FEED_INTERVAL_MS = 3000    # how often the Orders page polls for new and changed orders
 
 
 class StaffDashboardController(QObject):
@@ -18,10 +23,24 @@ class StaffDashboardController(QObject):
         self.model = StaffDashboardModel(staff_info)
         self.view = StaffDashboardView()
 
+        # Database calls run off the GUI thread; the view shows a busy cursor meanwhile
+        self.data = DataService(self)
+        self.data.busy_changed.connect(self.view.set_loading)
+
         # Store data
         self.menu_items = []
-        self.all_today_orders = []
         self.today_orders = []
+        self.orders_status = None
+        self.orders_cursor = None
+        self.search_term = None
+        self.search_cursor = None
+        self._loading_more_orders = False
+        self.feed_watermark = None  # (updated_at, id) the live order feed continues from
+
+        # Poll for order changes while the Orders page is shown
+        self.feed_timer = QTimer(self)
+        self.feed_timer.setInterval(LIVE_FEED_INTERVAL_MS)
+        self.feed_timer.timeout.connect(self._on_feed_timer)
 
         # Setup UI
         self._setup_ui()
@@ -57,17 +76,23 @@ class StaffDashboardController(QObject):
         self.view.filter_orders_changed.connect(self.handle_filter_orders)
         self.view.refresh_orders_clicked.connect(self.handle_refresh_orders)
         self.view.order_status_changed.connect(self.handle_order_status_change)
+        self.view.orders_scrolled_to_end.connect(self.load_more_orders)
 
     def load_menu_items(self):
         """Load menu items from model"""
-        self.menu_items = self.model.load_menu_items()
-        self.view.populate_menu_table(self.menu_items)
+        def show(menu_items):
+            self.menu_items = menu_items
+            self.view.populate_menu_table(self.menu_items)
+
+        self.data.run(self.model.load_menu_items, on_result=show, key='menu')
 
     def handle_page_switch(self, index):
         """Handle page switching"""
         self.view.switch_page(index)
         if index == 1:  # Orders page
             self.load_orders()
+        else:
+            self.feed_timer.stop()
 
     def handle_add_item(self):
         """Handle add item request"""
@@ -80,20 +105,24 @@ class StaffDashboardController(QObject):
             image = item_data['image']
 
             if title and price:
-                success, message = self.model.add_menu_item(title, description, category, price, image)
+                def added(outcome):
+                    success, message = outcome
+                    if success:
+                        # Log the activity
+                        self.model.log_activity(
+                            "Added menu item",
+                            f"{title} (₱{price}) - {category}"
+                        )
 
-                if success:
-                    # Log the activity
-                    self.model.log_activity(
-                        "Added menu item",
-                        f"{title} (₱{price}) - {category}"
-                    )
+                        # Reload menu items
+                        self.load_menu_items()
+                        self.view.show_message("Success", "Menu item added to database successfully!")
+                    else:
+                        self.view.show_message("Error", f"Failed to add menu item: {message}")
 
-                    # Reload menu items
-                    self.load_menu_items()
-                    self.view.show_message("Success", "Menu item added to database successfully!")
-                else:
-                    self.view.show_message("Error", f"Failed to add menu item: {message}")
+                self.data.run(lambda: self.model.add_menu_item(title, description, category, price, image),
+                              on_result=added,
+                              on_error=lambda e: self.view.show_message("Error", f"Failed to add menu item: {e}"))
             else:
                 self.view.show_message("Error", "Title and price are required fields!")
 
@@ -116,29 +145,33 @@ class StaffDashboardController(QObject):
             image = updated_data['image']
 
             if title and price:
-                success, message = self.model.update_menu_item(item_id, title, description, category, price, image)
-
-                if success:
-                    # Log the activity
-                    log_details = []
-                    if original_title != title:
-                        log_details.append(f"Name: {original_title} → {title}")
-                    if original_price != price:
-                        log_details.append(f"Price: ₱{original_price} → ₱{price}")
-                    if item_data["category"] != category:
-                        log_details.append(f"Category: {item_data['category']} → {category}")
-
-                    if log_details:
-                        self.model.log_activity(
-                            "Updated menu item",
-                            f"{title}: " + ", ".join(log_details)
-                        )
-
-                    # Reload menu items
-                    self.load_menu_items()
-                    self.view.show_message("Success", "Menu item updated in database successfully!")
-                else:
-                    self.view.show_message("Error", f"Failed to update menu item: {message}")
+                def updated(outcome):
+                    success, message = outcome
+                    if success:
+                        # Log the activity
+                        log_details = []
+                        if original_title != title:
+                            log_details.append(f"Name: {original_title} → {title}")
+                        if original_price != price:
+                            log_details.append(f"Price: ₱{original_price} → ₱{price}")
+                        if item_data["category"] != category:
+                            log_details.append(f"Category: {item_data['category']} → {category}")
+
+                        if log_details:
+                            self.model.log_activity(
+                                "Updated menu item",
+                                f"{title}: " + ", ".join(log_details)
+                            )
+
+                        # Reload menu items
+                        self.load_menu_items()
+                        self.view.show_message("Success", "Menu item updated in database successfully!")
+                    else:
+                        self.view.show_message("Error", f"Failed to update menu item: {message}")
+
+                self.data.run(lambda: self.model.update_menu_item(item_id, title, description, category, price, image),
+                              on_result=updated,
+                              on_error=lambda e: self.view.show_message("Error", f"Failed to update menu item: {e}"))
             else:
                 self.view.show_message("Error", "Title and price are required fields!")
 
@@ -153,76 +186,189 @@ class StaffDashboardController(QObject):
 
         confirmed = self.view.show_delete_confirmation(item_name)
         if confirmed:
-            success, message = self.model.delete_menu_item(item_id, item_name)
+            def deleted(outcome):
+                success, message = outcome
+                if success:
+                    # Log the activity
+                    self.model.log_activity(
+                        "Deleted menu item",
+                        f"{item_name}"
+                    )
 
-            if success:
-                # Log the activity
-                self.model.log_activity(
-                    "Deleted menu item",
-                    f"{item_name}"
-                )
+                    # Reload menu items
+                    self.load_menu_items()
+                    self.view.show_message("Success", f"'{item_name}' has been deleted from database.")
+                else:
+                    self.view.show_message("Error", f"Failed to delete item: {message}")
 
-                # Reload menu items
-                self.load_menu_items()
-                self.view.show_message("Success", f"'{item_name}' has been deleted from database.")
-            else:
-                self.view.show_message("Error", f"Failed to delete item: {message}")
+            self.data.run(lambda: self.model.delete_menu_item(item_id, item_name),
+                          on_result=deleted,
+                          on_error=lambda e: self.view.show_message("Error", f"Failed to delete item: {e}"))
 
     def load_orders(self):
-        """Load orders from model"""
-        self.all_today_orders = self.model.load_todays_orders()
-        self.today_orders = self.all_today_orders.copy()
-        self.view.display_orders(self.today_orders)
+        """Load today's orders for the selected status filter from model"""
+        filter_combo = getattr(self.view, 'filter_combo', None)
+        status = filter_combo.currentText() if filter_combo else "All Status"
+        self._load_first_orders_page(None if status == "All Status" else status)
+
+    def _load_first_orders_page(self, status):
+        """Show the first page of today's orders for a status (None for all)"""
+        self.orders_status = status
+        self.search_term = None
+        self.search_cursor = None
+        self.data.cancel('more_orders')
+        self.data.cancel('feed')
+        self._loading_more_orders = False
+        self.feed_watermark = None
+
+        def show(page):
+            self.today_orders, self.orders_cursor, self.feed_watermark = page
+            self.view.display_orders(self.today_orders)
+            if self.feed_watermark is not None:
+                self.feed_timer.start()
+
+        def load():
+            # Taken before the page: anything changed meanwhile comes back through the feed
+            watermark = self.model.get_feed_watermark()
+            orders, next_cursor = self.model.load_todays_orders_page(status)
+            return prefetch_order_lines(orders), next_cursor, watermark
+
+        self.data.run(load, on_result=show, key='orders')
+
+    def _on_feed_timer(self):
+        """Timer tick: poll unless a load or the previous poll is still running"""
+        if not self.data.is_busy('orders') and not self.data.is_busy('feed'):
+            self.poll_order_changes()
+
+    def poll_order_changes(self):
+        """Fetch today's orders changed since the feed watermark and merge them in"""
+        if self.feed_watermark is None:
+            return
+
+        since = self.feed_watermark
+
+        def merge(result):
+            orders, self.feed_watermark = result
+            self._merge_order_changes(orders)
+
+        def load():
+            orders, watermark = self.model.load_todays_order_changes(since)
+            return prefetch_order_lines(orders), watermark
+
+        self.data.run(load, on_result=merge, key='feed', silent=True)
+
+    def _merge_order_changes(self, changes):
+        """Fold feed rows into today's orders, patching only the affected cards.
+
+        During a search only the result cards already on screen are patched;
+        today_orders is kept current and shown again when the search is cleared.
+        """
+        visible = self.search_term is None
+        shown = {order['id']: order for order in self.today_orders}
+
+        for order in changes:
+            if not visible:
+                self.view.update_order_card(order)
+            matches = self.orders_status is None or (order.get('status') or '').lower() == self.orders_status.lower()
+            current = shown.get(order['id'])
+
+            if current is not None:
+                if not matches:
+                    # Moved out of the selected status
+                    self.today_orders.remove(current)
+                    del shown[order['id']]
+                    if visible:
+                        self.view.remove_order_card(order['id'])
+                elif (current.get('updated_at'), current.get('status')) != (order.get('updated_at'), order.get('status')):
+                    self.today_orders[self.today_orders.index(current)] = order
+                    shown[order['id']] = order
+                    if visible:
+                        self.view.update_order_card(order)
+                continue
+
+            key = (order['created_at'], order['id'])
+            # Orders past the loaded pages arrive with load_more_orders instead
+            if not matches or (self.orders_cursor is not None and key < self.orders_cursor):
+                continue
+
+            # Newest first: new orders normally land at the top
+            position = 0
+            while position < len(self.today_orders) and \
+                    (self.today_orders[position]['created_at'], self.today_orders[position]['id']) > key:
+                position += 1
+            self.today_orders.insert(position, order)
+            shown[order['id']] = order
+            if visible:
+                self.view.insert_order_card(position, order)
+
+    def load_more_orders(self):
+        """Append the next page of today's orders when the list is scrolled to the end"""
+        if self._loading_more_orders:
+            return
+
+        search_term, status = self.search_term, self.orders_status
+        if search_term:
+            cursor = self.search_cursor
+            fetch = lambda: self.model.search_todays_orders_page(search_term, status, cursor)
+        else:
+            cursor = self.orders_cursor
+            fetch = lambda: self.model.load_todays_orders_page(status, cursor)
+        if cursor is None:
+            return
+
+        def append(page):
+            self._loading_more_orders = False
+            orders, next_cursor = page
+            if search_term:
+                self.search_cursor = next_cursor
+            else:
+                self.orders_cursor = next_cursor
+                self.today_orders.extend(orders)
+            self.view.append_orders(orders)
+
+        def failed(error):
+            self._loading_more_orders = False
+            print(f"Error loading more orders: {error}")
+
+        def load():
+            orders, next_cursor = fetch()
+            return prefetch_order_lines(orders), next_cursor
+
+        self._loading_more_orders = True
+        self.data.run(load, on_result=append, on_error=failed, key='more_orders')
 
     def handle_search_orders(self):
         """Handle search orders request"""
         search_term = self.view.get_search_term()
+        self.data.cancel('more_orders')
+        self._loading_more_orders = False
 
         if not search_term:
             # If search is cleared, show current filtered orders
+            self.search_term = None
+            self.search_cursor = None
+            self.data.cancel('orders')
             self.view.display_orders(self.today_orders)
             return
 
-        # Search within current filtered orders
-        if self.today_orders:
-            search_term_lower = search_term.lower()
-            searched_orders = []
-
-            for order in self.today_orders:
-                order_number = str(order.get('order_number', '')).lower()
-                customer_name = str(order.get('customer_name', '')).lower()
-                customer_email = str(order.get('customer_email', '')).lower()
-
-                if (search_term_lower in order_number or
-                        search_term_lower in customer_name or
-                        search_term_lower in customer_email):
-                    searched_orders.append(order)
+        # Indexed search over today's orders with the current status filter
+        self.search_term = search_term
+        self.search_cursor = None
+        status = self.orders_status
 
+        def show(page):
+            searched_orders, self.search_cursor = page
             self.view.display_orders(searched_orders)
 
-    def handle_filter_orders(self, status):
-        """Handle filter orders request"""
-        # Always use the complete list of today's orders as the source
-        if not self.all_today_orders:
-            self.load_orders()
-            return
-
-        if status == "All Status":
-            # Show all today's orders
-            self.today_orders = self.all_today_orders.copy()
-        else:
-            # Filter today's orders by status
-            filtered_orders = []
-            for order in self.all_today_orders:
-                order_status = order.get('status', '')
-                if isinstance(order_status, str):
-                    if order_status.lower() == status.lower():
-                        filtered_orders.append(order)
+        def load():
+            orders, next_cursor = self.model.search_todays_orders_page(search_term, status)
+            return prefetch_order_lines(orders), next_cursor
 
-            self.today_orders = filtered_orders
+        self.data.run(load, on_result=show, key='orders')
 
-        # Display the filtered results
-        self.view.display_orders(self.today_orders)
+    def handle_filter_orders(self, status):
+        """Handle filter orders request - the status filter runs in the database"""
+        self._load_first_orders_page(None if status == "All Status" else status)
 
     def handle_refresh_orders(self):
         """Handle refresh orders request"""
@@ -230,26 +376,35 @@ class StaffDashboardController(QObject):
 
     def handle_order_status_change(self, order_id, new_status):
         """Handle order status change"""
-        success, result = self.model.update_order_status(order_id, new_status)
+        def update():
+            success, result = self.model.update_order_status(order_id, new_status)
+            if success:
+                # Log the activity (the updated row comes back with the update)
+                order_number = result.get('order_number', 'Unknown') if result else "Unknown"
 
-        if success:
-            # Log the activity
-            order = self.model.get_order_by_id(order_id)
-            order_number = order.get('order_number', 'Unknown') if order else "Unknown"
+                self.model.log_activity(
+                    f"Updated order status",
+                    f"Order #{order_number}: {new_status}"
+                )
+            return success, result
 
-            self.model.log_activity(
-                f"Updated order status",
-                f"Order #{order_number}: {new_status}"
-            )
+        def updated(outcome):
+            success, result = outcome
+            if success:
+                # The feed brings back just this order and patches its card
+                if self.feed_watermark is not None:
+                    self.poll_order_changes()
+                else:
+                    self.load_orders()
 
-            # Reload orders to reflect changes
-            self.load_orders()
+                # Show success message
+                self.view.show_message("Success", f"Order status updated to {new_status}")
+            else:
+                # Show error message
+                self.view.show_message("Error", f"Failed to update status: {result}")
 
-            # Show success message
-            self.view.show_message("Success", f"Order status updated to {new_status}")
-        else:
-            # Show error message
-            self.view.show_message("Error", f"Failed to update status: {result}")
+        self.data.run(update, on_result=updated,
+                      on_error=lambda e: self.view.show_message("Error", f"Failed to update status: {e}"))
 
     def handle_logout(self):
         """Handle logout request"""
@@ -257,6 +412,9 @@ class StaffDashboardController(QObject):
         if confirmed:
             # Log logout activity
             self.model.log_activity("Staff logged out")
+            # Results still in flight belong to a dashboard that is going away
+            self.feed_timer.stop()
+            self.data.cancel_all()
             self.logout_requested.emit()
 
     def get_view(self):
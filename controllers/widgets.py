@@ -13,6 +13,7 @@ from datetime import datetime, timedelta, date
 
 # Import databases
 from db.orders_db import orders_db_instance as orders_db
+from db.daily_sales import daily_sales
 from db.activity_db import activity_db
 
 
@@ -182,64 +183,11 @@ class RevenueGraphWidget(QWidget):
                 year = self.current_year
 
             print(f"Loading monthly data for year {year}...")
-            # Initialize monthly revenue
-            monthly_revenue = [0] * 12
-
-            # Get orders from database
-            success, orders = orders_db.get_all_orders()
-
-            if success and orders:
-                print(f"Found {len(orders)} orders total")
-                completed_count = 0
-
-                for order in orders:
-                    status = order.get('status', '').lower()
-                    if status == 'completed':
-                        completed_count += 1
-                        try:
-                            order_date = order.get('created_at', '')
-                            total_amount = float(order.get('total_amount', 0))
-
-                            if order_date:
-                                # Handle datetime object or string
-                                from datetime import datetime
-
-                                if isinstance(order_date, datetime):  # It's a datetime object
-                                    month = order_date.month
-                                    order_year = order_date.year
-                                else:  # It's a string
-                                    try:
-                                        # Try different date formats
-                                        if ' ' in str(order_date):
-                                            date_str = str(order_date).split(' ')[0]
-                                        elif 'T' in str(order_date):
-                                            date_str = str(order_date).split('T')[0]
-                                        else:
-                                            date_str = str(order_date)
-
-                                        # Parse the date
-                                        if '-' in date_str:
-                                            parts = date_str.split('-')
-                                            if len(parts) >= 2:
-                                                order_year = int(parts[0])
-                                                month = int(parts[1])
-                                            else:
-                                                continue
-                                        else:
-                                            continue
-                                    except:
-                                        continue
-
-                                # Only include orders from the specified year
-                                if order_year == year:
-                                    month_index = month - 1  # Convert to 0-based index
-                                    if 0 <= month_index < 12:
-                                        monthly_revenue[month_index] += total_amount
-                        except Exception as e:
-                            print(f"Error processing order: {e}")
-                            continue
-
-                print(f"Processed {completed_count} completed orders for year {year}")
+            # Twelve completed-revenue totals straight from the daily_sales rollup
+            success, monthly_revenue = daily_sales.get_year_revenue(year)
+            if not success:
+                print(f"Error loading monthly revenue: {monthly_revenue}")
+                monthly_revenue = [0] * 12
 
             print(f"Monthly revenue data for {year}: {monthly_revenue}")
 
@@ -361,6 +309,29 @@ class RevenueGraphWidget(QWidget):
         # Refresh display
         self.refresh()
 
+    def set_yearly_revenue(self, yearly_revenue):
+        """Show monthly revenue already fetched for several years ({year: [12 totals]})"""
+        self.yearly_data = {year: list(months) for year, months in yearly_revenue.items()}
+
+        # Update combo box if current year has changed
+        current_year = datetime.now().year
+        if current_year != self.current_year:
+            self.current_year = current_year
+            self.years = [str(self.current_year - i) for i in range(5)]
+            if hasattr(self, 'year_combo'):
+                self.year_combo.clear()
+                self.year_combo.addItems(self.years)
+                self.year_combo.setCurrentText(str(self.current_year))
+
+        if hasattr(self, 'year_combo') and self.year_combo.currentText():
+            selected_year = int(self.year_combo.currentText())
+        else:
+            selected_year = self.current_year
+        self.revenue = self.yearly_data.get(selected_year, [0] * 12).copy()
+
+        self.update_total_revenue_label()
+        self.create_plot()
+
     def set_monthly_data(self):
         """Set the graph to display monthly data for current year"""
         if hasattr(self, 'year_combo') and self.year_combo.currentText():
@@ -423,42 +394,14 @@ class PopularItemsPieChartWidget(QWidget):
     def load_popular_items_from_db(self):
         """Load popular items data from completed orders"""
         try:
-            # Get all completed orders
-            success, orders = orders_db.get_all_orders()
+            # Top 10 items by quantity sold, with the long tail folded into "Others"
+            success, items = orders_db.get_popular_items(limit=10, include_others=True)
 
             if not success:
-                print("Failed to load orders for pie chart")
+                print("Failed to load popular items for pie chart")
                 return
 
-            # Dictionary to store item counts
-            item_counts = {}
-
-            for order in orders:
-                # Only count completed orders
-                if order.get('status', '').lower() == 'completed':
-                    items = order.get('items', [])
-
-                    for item in items:
-                        item_name = item.get('title', 'Unknown Item')
-                        quantity = item.get('qty', 1)
-
-                        if item_name in item_counts:
-                            item_counts[item_name] += quantity
-                        else:
-                            item_counts[item_name] = quantity
-
-            # Sort items by count in descending order
-            sorted_items = sorted(item_counts.items(), key=lambda x: x[1], reverse=True)
-
-            # Take top 10 items
-            top_items = dict(sorted_items[:10])
-
-            # Store data
-            self.item_counts = top_items
-
-            print(f"Loaded {len(top_items)} popular items from database")
-            for item, count in top_items.items():
-                print(f"  {item}: {count} orders")
+            self.set_popular_items(items)
 
         except Exception as e:
             print(f"Error loading popular items from DB: {e}")
@@ -478,6 +421,19 @@ class PopularItemsPieChartWidget(QWidget):
                 "Salad": 8
             }
 
+    def set_popular_items(self, items):
+        """Store get_popular_items() rows as the chart data (does not redraw)"""
+        top_items = {}
+        for item in items:
+            top_items[item['name']] = top_items.get(item['name'], 0) + item['total_quantity']
+
+        # Store data
+        self.item_counts = top_items
+
+        print(f"Loaded {len(top_items)} popular items from database")
+        for item, count in top_items.items():
+            print(f"  {item}: {count} orders")
+
     def create_pie_chart(self):
         """Create or update the pie chart"""
         self.figure.clear()
@@ -2,8 +2,9 @@
 Database Package
 Contains all database operations for the application
 """
+from .connection import db_pool
 from .customer_db import customer_db
 from .staff_db import staff_db
 from .admin_db import admin_db
 
-__all__ = ['customer_db', 'staff_db', 'admin_db']
\ No newline at end of file
+__all__ = ['db_pool', 'customer_db', 'staff_db', 'admin_db']
\ No newline at end of file
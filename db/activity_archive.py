@@ -0,0 +1,189 @@
+# activity_archive.py
+"""
+Activity log retention and cold storage
+Moves activity_logs rows older than the retention window into gzip-compressed
+JSON-lines files, one per day (archive_dir/YYYY/MM/activity_YYYY-MM-DD.jsonl.gz),
+and deletes them from the hot table in small batches so it never holds a long
+table lock. Archived days stay searchable through ActivityArchive.find_activities.
+
+Usage: python -m db.activity_archive [--days N]
+"""
+import gzip
+import json
+import os
+import sys
+from datetime import date, datetime, time, timedelta
+
+from mysql.connector import Error
+
+from .connection import db_pool, DATA_DIR
+
+
+ACTIVITY_ARCHIVE_DIR = os.path.join(DATA_DIR, os.environ.get('FOODDASH_ACTIVITY_ARCHIVE_DIR', 'activity_archive'))
+ACTIVITY_RETENTION_DAYS = int(os.environ.get('FOODDASH_ACTIVITY_RETENTION_DAYS', 90))
+ARCHIVE_BATCH_SIZE = 500        # rows archived and deleted per transaction
+ARCHIVE_LOCK = 'food_dash_activity_archive'
+
+ARCHIVE_COLUMNS = ('id', 'staff_name', 'staff_id', 'action', 'details', 'created_at')
+
+
+class ActivityArchive:
+    """Archives old activity logs to compressed daily files and reads them back"""
+
+    def __init__(self, pool=None, archive_dir=ACTIVITY_ARCHIVE_DIR, batch_size=ARCHIVE_BATCH_SIZE):
+        self.pool = pool or db_pool
+        self.archive_dir = archive_dir
+        self.batch_size = batch_size
+
+    def day_path(self, day):
+        """Archive file of one calendar day"""
+        return os.path.join(self.archive_dir, f"{day:%Y}", f"{day:%m}", f"activity_{day:%Y-%m-%d}.jsonl.gz")
+
+    def archive_older_than(self, days=ACTIVITY_RETENTION_DAYS):
+        """Archive and delete every row created before midnight `days` days ago.
+
+        Each batch is appended (as a new gzip member) and fsynced before its
+        rows are deleted, so a crash can at worst archive a batch twice; the
+        reader drops the duplicate ids. Returns (success, rows archived or message).
+        """
+        cutoff = datetime.combine(date.today() - timedelta(days=days), time.min)
+        connection = self.pool.get_connection()
+        cursor = connection.cursor(dictionary=True)
+        archived = 0
+        try:
+            # One archiver at a time across app instances
+            cursor.execute("SELECT GET_LOCK(%s, 0) AS acquired", (ARCHIVE_LOCK,))
+            if cursor.fetchone()['acquired'] != 1:
+                return False, "Another archive job is running"
+
+            try:
+                while True:
+                    # Oldest rows first: an idx_created_at range read
+                    cursor.execute(f"""
+                        SELECT {', '.join(ARCHIVE_COLUMNS)}
+                        FROM activity_logs
+                        WHERE created_at < %s
+                        ORDER BY created_at, id
+                        LIMIT %s
+                    """, (cutoff, self.batch_size))
+                    rows = cursor.fetchall()
+                    if not rows:
+                        break
+
+                    self._append(rows)
+
+                    ids = [row['id'] for row in rows]
+                    placeholders = ', '.join(['%s'] * len(ids))
+                    cursor.execute(f"DELETE FROM activity_logs WHERE id IN ({placeholders})", ids)
+                    connection.commit()
+                    archived += len(rows)
+
+                    if len(rows) < self.batch_size:
+                        break
+            finally:
+                cursor.execute("SELECT RELEASE_LOCK(%s)", (ARCHIVE_LOCK,))
+                cursor.fetchall()
+
+            return True, archived
+
+        except (Error, OSError) as e:
+            connection.rollback()
+            print(f"Error archiving activity logs: {e}")
+            return False, f"Archived {archived} rows before failing: {str(e)}"
+        finally:
+            cursor.close()
+            connection.close()
+
+    def _append(self, rows):
+        """Append rows to their day files and force them to disk"""
+        by_day = {}
+        for row in rows:
+            by_day.setdefault(row['created_at'].date(), []).append(row)
+
+        for day, day_rows in by_day.items():
+            path = self.day_path(day)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'ab') as raw:
+                with gzip.GzipFile(fileobj=raw, mode='ab') as archive:
+                    for row in day_rows:
+                        record = {column: row[column] for column in ARCHIVE_COLUMNS}
+                        record['created_at'] = row['created_at'].isoformat()
+                        archive.write((json.dumps(record) + "\n").encode('utf-8'))
+                raw.flush()
+                os.fsync(raw.fileno())
+
+    def archived_days(self):
+        """Sorted list of days that have an archive file"""
+        days = []
+        if not os.path.isdir(self.archive_dir):
+            return days
+
+        for root, _, files in os.walk(self.archive_dir):
+            for name in files:
+                if name.startswith('activity_') and name.endswith('.jsonl.gz'):
+                    try:
+                        days.append(datetime.strptime(name[9:19], "%Y-%m-%d").date())
+                    except ValueError:
+                        continue
+        return sorted(days)
+
+    def find_activities(self, date_from=None, date_to=None, search=None, limit=None):
+        """Search archived activities, newest first.
+
+        Takes the same filters as ActivityDB.find_activities (date_to is
+        exclusive, search is a case-insensitive substring of staff name,
+        action or details). Only the day files inside the range are opened.
+        """
+        if isinstance(date_from, datetime):
+            date_from = date_from.date()
+        if isinstance(date_to, datetime):
+            date_to = date_to.date()
+        needle = search.lower() if search else None
+
+        activities = []
+        try:
+            for day in reversed(self.archived_days()):
+                if (date_from is not None and day < date_from) or (date_to is not None and day >= date_to):
+                    continue
+
+                seen = set()
+                day_rows = []
+                with gzip.open(self.day_path(day), 'rt', encoding='utf-8') as archive:
+                    for line in archive:
+                        record = json.loads(line)
+                        if record['id'] in seen:
+                            continue
+                        seen.add(record['id'])
+                        if needle and not any(needle in str(record.get(column) or '').lower()
+                                              for column in ('staff_name', 'action', 'details')):
+                            continue
+                        record['created_at'] = datetime.fromisoformat(record['created_at'])
+                        day_rows.append(record)
+
+                day_rows.sort(key=lambda record: (record['created_at'], record['id']), reverse=True)
+                activities.extend(day_rows)
+                if limit is not None and len(activities) >= limit:
+                    return True, activities[:limit]
+
+            return True, activities
+
+        except (OSError, ValueError) as e:
+            print(f"Error reading activity archive: {e}")
+            return False, f"Archive error: {str(e)}"
+
+
+# Global archiver for the configured archive directory
+activity_archive = ActivityArchive()
+
+
+if __name__ == "__main__":
+    retention_days = ACTIVITY_RETENTION_DAYS
+    if '--days' in sys.argv:
+        retention_days = int(sys.argv[sys.argv.index('--days') + 1])
+
+    success, result = activity_archive.archive_older_than(retention_days)
+    if success:
+        print(f"Archived {result} activity logs older than {retention_days} days to {ACTIVITY_ARCHIVE_DIR}")
+    else:
+        print(result)
+    sys.exit(0 if success else 1)
\ No newline at end of file
@@ -1,29 +1,27 @@
 # activity_db.py
-from datetime import datetime, timedelta
+from datetime import date, datetime, time, timedelta
 
-import mysql.connector
 from mysql.connector import Error
 
+from .activity_writer import activity_writer
+from .connection import db_pool
+
+
+ACTIVITY_PAGE_SIZE = 100    # rows per Activity Logs page
+DELETE_BATCH_SIZE = 1000    # rows per DELETE when clearing the table
+
 
 class ActivityDB:
     """Database manager for activity logs"""
 
     def __init__(self):
-        self.host = 'localhost'
-        self.database = 'food_dash_db'
-        self.user = 'root'
-        self.password = ''
+        self.pool = db_pool
+        self.writer = activity_writer
 
     def get_connection(self):
-        """Get database connection"""
+        """Get a pooled database connection (close() returns it to the pool)"""
         try:
-            connection = mysql.connector.connect(
-                host=self.host,
-                database=self.database,
-                user=self.user,
-                password=self.password
-            )
-            return connection
+            return self.pool.get_connection()
         except Error as e:
             print(f"Activity DB connection error: {e}")
             return None
@@ -60,116 +58,162 @@ class ActivityDB:
             print(f"Error creating activity table: {e}")
             return False, f"Database error: {str(e)}"
 
-    def get_activities_by_date_range(self, start_date, end_date):
-        """Get activities within a date range"""
-        try:
-            query = """
-                SELECT * FROM activity_logs 
-                WHERE DATE(created_at) BETWEEN %s AND %s 
-                ORDER BY created_at DESC
-            """
-            self.cursor.execute(query, (start_date, end_date))
-            activities = self.cursor.fetchall()
-
-            # Convert to list of dictionaries
-            result = []
-            for activity in activities:
-                result.append({
-                    'id': activity[0],
-                    'staff_name': activity[1],
-                    'staff_id': activity[2],
-                    'action': activity[3],
-                    'details': activity[4],
-                    'created_at': activity[5]
-                })
-            return True, result
-        except Exception as e:
-            print(f"Error getting activities by date range: {e}")
-            return False, str(e)
+    @staticmethod
+    def _as_date(value):
+        """Accept a date, datetime or 'YYYY-MM-DD' string"""
+        if isinstance(value, datetime):
+            return value.date()
+        if isinstance(value, str):
+            return datetime.strptime(value, "%Y-%m-%d").date()
+        return value
+
+    @staticmethod
+    def _range_start(value):
+        """Midnight of a date, or a datetime unchanged"""
+        if isinstance(value, datetime):
+            return value
+        return datetime.combine(ActivityDB._as_date(value), time.min)
+
+    def _activity_filters(self, date_from=None, date_to=None, search=None):
+        """Build the WHERE conditions shared by listing and counting.
+
+        created_at is compared directly (never wrapped in DATE()) so the
+        idx_created_at index can be used.
+        """
+        conditions = []
+        params = []
+
+        if date_from is not None:
+            conditions.append("created_at >= %s")
+            params.append(self._range_start(date_from))
+        if date_to is not None:
+            conditions.append("created_at < %s")
+            params.append(self._range_start(date_to))
+        if search:
+            pattern = f"%{search}%"
+            conditions.append("(staff_name LIKE %s OR action LIKE %s OR details LIKE %s)")
+            params.extend([pattern, pattern, pattern])
+
+        return conditions, params
+
+    def find_activities(self, date_from=None, date_to=None, search=None, limit=None, cursor=None):
+        """Get activities matching the filters, newest first.
+
+            date_from - created at or after this date/datetime
+            date_to   - created before this date/datetime (exclusive)
+            search    - substring of staff name, action or details
+            limit     - maximum number of rows
+            cursor    - (created_at, id) keyset of the last row already shown
+        """
+        self.flush_pending()
+        connection = self.get_connection()
+        if connection is None:
+            return False, "Cannot connect to database"
 
-    def get_todays_activities(self):
-        """Get today's activities"""
         try:
-            today = datetime.now().strftime("%Y-%m-%d")
-            query = """
-                SELECT * FROM activity_logs 
-                WHERE DATE(created_at) = %s 
-                ORDER BY created_at DESC
+            conditions, params = self._activity_filters(date_from, date_to, search)
+
+            # idx_created_at also carries the primary key, so this is an index range read
+            if cursor is not None:
+                cursor_created_at, cursor_id = cursor
+                conditions.append("(created_at < %s OR (created_at = %s AND id < %s))")
+                params.extend([cursor_created_at, cursor_created_at, cursor_id])
+
+            where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+            limit_clause = ""
+            if limit is not None:
+                limit_clause = "LIMIT %s"
+                params.append(int(limit))
+
+            db_cursor = connection.cursor(dictionary=True)
+
+            query = f"""
+                SELECT id, staff_name, staff_id, action, details, created_at
+                FROM activity_logs
+                {where}
+                ORDER BY created_at DESC, id DESC
+                {limit_clause}
             """
-            self.cursor.execute(query, (today,))
-            activities = self.cursor.fetchall()
-
-            # Convert to list of dictionaries
-            result = []
-            for activity in activities:
-                result.append({
-                    'id': activity[0],
-                    'staff_name': activity[1],
-                    'staff_id': activity[2],
-                    'action': activity[3],
-                    'details': activity[4],
-                    'created_at': activity[5]
-                })
-            return True, result
-        except Exception as e:
-            print(f"Error getting today's activities: {e}")
-            return False, str(e)
+            db_cursor.execute(query, params)
+            activities = db_cursor.fetchall()
 
-    def get_activities_last_n_days(self, days):
-        """Get activities from the last N days"""
-        try:
-            end_date = datetime.now().strftime("%Y-%m-%d")
-            start_date = (datetime.now() - timedelta(days=days - 1)).strftime("%Y-%m-%d")
-            query = """
-                SELECT * FROM activity_logs 
-                WHERE DATE(created_at) BETWEEN %s AND %s 
-                ORDER BY created_at DESC
-            """
-            self.cursor.execute(query, (start_date, end_date))
-            activities = self.cursor.fetchall()
-
-            # Convert to list of dictionaries
-            result = []
-            for activity in activities:
-                result.append({
-                    'id': activity[0],
-                    'staff_name': activity[1],
-                    'staff_id': activity[2],
-                    'action': activity[3],
-                    'details': activity[4],
-                    'created_at': activity[5]
-                })
-            return True, result
-        except Exception as e:
-            print(f"Error getting activities for last {days} days: {e}")
-            return False, str(e)
-    def add_activity(self, staff_name, staff_id, action, details=""):
-        """Add a new activity log"""
+            db_cursor.close()
+            connection.close()
+            return True, activities
+
+        except (Error, ValueError) as e:
+            print(f"Error getting activities: {e}")
+            return False, f"Database error: {str(e)}"
+
+    def find_activities_page(self, page_size=ACTIVITY_PAGE_SIZE, cursor=None, **filters):
+        """Get one page of find_activities() results.
+
+        Returns {'activities': [...], 'next_cursor': keyset or None}; pass
+        next_cursor back in to fetch the following page.
+        """
+        success, activities = self.find_activities(limit=page_size + 1, cursor=cursor, **filters)
+        if not success:
+            return False, activities
+
+        has_more = len(activities) > page_size
+        activities = activities[:page_size]
+        next_cursor = None
+        if has_more and activities:
+            next_cursor = (activities[-1]['created_at'], activities[-1]['id'])
+        return True, {'activities': activities, 'next_cursor': next_cursor}
+
+    def count_activities(self, date_from=None, date_to=None, search=None):
+        """Count activities matching the same filters as find_activities()"""
+        self.flush_pending()
         connection = self.get_connection()
         if connection is None:
             return False, "Cannot connect to database"
 
         try:
-            cursor = connection.cursor()
-
-            insert_query = """
-            INSERT INTO activity_logs (staff_name, staff_id, action, details)
-            VALUES (%s, %s, %s, %s)
-            """
+            conditions, params = self._activity_filters(date_from, date_to, search)
+            where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
 
-            cursor.execute(insert_query, (staff_name, staff_id, action, details))
-            connection.commit()
+            cursor = connection.cursor()
+            cursor.execute(f"SELECT COUNT(*) FROM activity_logs {where}", params)
+            result = cursor.fetchone()
 
             cursor.close()
             connection.close()
-            return True, "Activity logged successfully"
+            return True, result[0] if result else 0
 
-        except Error as e:
-            print(f"Error adding activity: {e}")
+        except (Error, ValueError) as e:
+            print(f"Error counting activities: {e}")
             return False, f"Database error: {str(e)}"
 
+    def get_activities_by_date_range(self, start_date, end_date):
+        """Get activities within a date range (both dates inclusive)"""
+        try:
+            range_end = self._as_date(end_date) + timedelta(days=1)
+        except ValueError as e:
+            return False, f"Invalid date: {str(e)}"
+        return self.find_activities(date_from=start_date, date_to=range_end)
+
+    def get_todays_activities(self):
+        """Get today's activities"""
+        today = date.today()
+        return self.get_activities_by_date_range(today, today)
+
+    def get_activities_last_n_days(self, days):
+        """Get activities from the last N days (today included)"""
+        today = date.today()
+        return self.get_activities_by_date_range(today - timedelta(days=days - 1), today)
+
+    def add_activity(self, staff_name, staff_id, action, details=""):
+        """Queue a new activity log; a background thread writes it in a batch"""
+        return self.writer.submit(staff_name, staff_id, action, details)
+
+    def flush_pending(self):
+        """Write queued activity logs now so a following read sees them"""
+        return self.writer.flush()
+
     def get_all_activities(self, limit=100):
         """Get all activities"""
+        self.flush_pending()
         connection = self.get_connection()
         if connection is None:
             return False, "Cannot connect to database"
@@ -196,6 +240,7 @@ class ActivityDB:
 
     def search_activities(self, search_term, limit=50):
         """Search activities by staff name, action, or details"""
+        self.flush_pending()
         connection = self.get_connection()
         if connection is None:
             return False, "Cannot connect to database"
@@ -226,6 +271,7 @@ class ActivityDB:
 
     def clear_all_activities(self):
         """Clear all activity logs (admin only)"""
+        self.flush_pending()
         connection = self.get_connection()
         if connection is None:
             return False, "Cannot connect to database"
@@ -233,13 +279,23 @@ class ActivityDB:
         try:
             cursor = connection.cursor()
 
-            query = "DELETE FROM activity_logs"
-            cursor.execute(query)
-            connection.commit()
+            # Only rows that exist now; entries logged while clearing are kept
+            cursor.execute("SELECT MAX(id) FROM activity_logs")
+            last_id = cursor.fetchone()[0]
+
+            # Short batches so each DELETE holds its locks only briefly
+            deleted = 0
+            while last_id is not None:
+                cursor.execute("DELETE FROM activity_logs WHERE id <= %s ORDER BY id LIMIT %s",
+                               (last_id, DELETE_BATCH_SIZE))
+                connection.commit()
+                deleted += cursor.rowcount
+                if cursor.rowcount < DELETE_BATCH_SIZE:
+                    break
 
             cursor.close()
             connection.close()
-            return True, "All activity logs cleared"
+            return True, f"All activity logs cleared ({deleted} rows)"
 
         except Error as e:
             print(f"Error clearing activities: {e}")
@@ -247,6 +303,7 @@ class ActivityDB:
 
     def get_total_count(self):
         """Get total count of activity logs"""
+        self.flush_pending()
         connection = self.get_connection()
         if connection is None:
             return False, "Cannot connect to database"
@@ -0,0 +1,199 @@
+# activity_writer.py
+"""
+Write-behind queue for activity logs
+Activity entries are queued in memory and written by a background thread in
+multi-row INSERTs, so logging never adds database latency to a user action.
+"""
+import threading
+from collections import deque
+from datetime import datetime
+from time import monotonic
+
+from mysql.connector import Error
+
+from .connection import db_pool
+
+
+ACTIVITY_BATCH_SIZE = 50        # flush as soon as this many entries are queued
+ACTIVITY_FLUSH_INTERVAL = 2.0   # ... or when the oldest entry has waited this long
+ACTIVITY_QUEUE_LIMIT = 10000    # entries beyond this are dropped (and counted)
+ACTIVITY_MAX_RETRIES = 5        # attempts per batch before it is dropped
+
+
+class ActivityLogWriter:
+    """Batches activity_logs INSERTs on a background thread"""
+
+    def __init__(self, pool=None, batch_size=ACTIVITY_BATCH_SIZE, flush_interval=ACTIVITY_FLUSH_INTERVAL,
+                 queue_limit=ACTIVITY_QUEUE_LIMIT, max_retries=ACTIVITY_MAX_RETRIES):
+        self.pool = pool or db_pool
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue_limit = queue_limit
+        self.max_retries = max_retries
+
+        self._queue = deque()
+        self._pending = 0               # queued or in flight, not yet written or dropped
+        self._condition = threading.Condition()
+        self._thread = None
+        self._stopping = False
+        self._flush_requested = False
+        self._stats = {
+            'queued': 0,
+            'written': 0,
+            'batches': 0,
+            'failed_batches': 0,
+            'retries': 0,
+            'dropped': 0
+        }
+
+    def submit(self, staff_name, staff_id, action, details=""):
+        """Queue one activity entry; returns (success, message) without touching the database"""
+        # Timestamp at the moment of the action, not of the flush
+        entry = (staff_name, staff_id, action, details, datetime.now())
+
+        with self._condition:
+            if self._stopping:
+                stopped = True
+            elif len(self._queue) >= self.queue_limit:
+                self._stats['dropped'] += 1
+                return False, "Activity queue is full"
+            else:
+                stopped = False
+                self._queue.append(entry)
+                self._pending += 1
+                self._stats['queued'] += 1
+                self._ensure_thread()
+                # Wake the writer when it is idle or a full batch is ready
+                if len(self._queue) == 1 or len(self._queue) >= self.batch_size:
+                    self._condition.notify_all()
+
+        if stopped:
+            # Late entries after shutdown (e.g. a logout while quitting) are written directly
+            if self._write_batch([entry]):
+                return True, "Activity logged successfully"
+            return False, "Failed to log activity"
+        return True, "Activity queued"
+
+    def flush(self, timeout=5.0):
+        """Write everything queued so far; returns False if it did not finish in time"""
+        deadline = monotonic() + timeout
+        with self._condition:
+            if not self._pending:
+                return True
+            self._flush_requested = True
+            self._condition.notify_all()
+            while self._pending:
+                remaining = deadline - monotonic()
+                if remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def shutdown(self, timeout=5.0):
+        """Flush the queue and stop the background thread"""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def stats(self):
+        """Snapshot of writer counters"""
+        with self._condition:
+            stats = dict(self._stats)
+            stats['pending'] = self._pending
+            return stats
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="activity-log-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._queue and not self._stopping:
+                    self._condition.wait()
+
+                # The batch window opens with the oldest queued entry
+                deadline = monotonic() + self.flush_interval
+                while (len(self._queue) < self.batch_size
+                       and not self._stopping and not self._flush_requested):
+                    remaining = deadline - monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+
+                batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+                if not self._queue:
+                    self._flush_requested = False
+
+            if batch:
+                self._write_with_retry(batch)
+
+            with self._condition:
+                if self._stopping and not self._queue:
+                    self._thread = None
+                    return
+
+    def _write_with_retry(self, batch):
+        attempt = 0
+        while True:
+            if self._write_batch(batch):
+                with self._condition:
+                    self._stats['written'] += len(batch)
+                    self._stats['batches'] += 1
+                break
+
+            attempt += 1
+            with self._condition:
+                self._stats['failed_batches'] += 1
+                if attempt > self.max_retries:
+                    self._stats['dropped'] += len(batch)
+                    print(f"Dropped {len(batch)} activity log entries after {attempt} attempts")
+                    break
+                self._stats['retries'] += 1
+                # Back off, but retry at once when the app is shutting down.
+                # submit()/flush() notifications must not cut the wait short.
+                until = monotonic() + min(0.5 * 2 ** attempt, 30.0)
+                while not self._stopping:
+                    remaining = until - monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+
+        with self._condition:
+            self._pending -= len(batch)
+            if not self._pending:
+                # The flush is complete; later batches get their batching window again
+                self._flush_requested = False
+            self._condition.notify_all()
+
+    def _write_batch(self, batch):
+        """Write one batch in a single multi-row INSERT"""
+        try:
+            connection = self.pool.get_connection()
+        except Error as e:
+            print(f"Activity writer connection error: {e}")
+            return False
+
+        try:
+            cursor = connection.cursor()
+            cursor.executemany("""
+                INSERT INTO activity_logs (staff_name, staff_id, action, details, created_at)
+                VALUES (%s, %s, %s, %s, %s)
+            """, batch)
+            connection.commit()
+            cursor.close()
+            return True
+
+        except Error as e:
+            print(f"Error writing activity batch: {e}")
+            return False
+        finally:
+            connection.close()
+
+
+# Global writer shared by every activity logger in this process
+activity_writer = ActivityLogWriter()
\ No newline at end of file
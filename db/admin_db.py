@@ -1,28 +1,20 @@
 # admin_db.py
-import mysql.connector
 from mysql.connector import Error
 import hashlib
 
+from .connection import db_pool
+
 
 class AdminDB:
     """Database manager for admin accounts with admin_ prefixed attributes"""
 
     def __init__(self):
-        self.host = 'localhost'
-        self.database = 'food_dash_db'
-        self.user = 'root'
-        self.password = ''
+        self.pool = db_pool
 
     def get_connection(self):
-        """Get database connection"""
+        """Get a pooled database connection (close() returns it to the pool)"""
         try:
-            connection = mysql.connector.connect(
-                host=self.host,
-                database=self.database,
-                user=self.user,
-                password=self.password
-            )
-            return connection
+            return self.pool.get_connection()
         except Error as e:
             print(f"Database connection error: {e}")
             return None
@@ -0,0 +1,136 @@
+# async_db.py
+"""
+Asyncio variant of the db package API
+Every call runs the existing synchronous manager method on a small thread
+executor, so the SQL, caching and (success, result) return values stay in one
+place and old callers keep using the synchronous managers unchanged. Several
+awaits can be in flight at once, e.g.
+
+    stats, popular = await asyncio.gather(async_db.orders.stats(max_age=0),
+                                          async_db.orders.popular_items(limit=10))
+
+Any manager method can be awaited through its wrapper (await
+async_db.orders.find_orders(...)); the short names below cover the common reads.
+"""
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from .activity_db import activity_db
+from .admin_db import admin_db
+from .connection import ASYNC_DB_THREADS
+from .customer_db import customer_db
+from .daily_sales import daily_sales
+from .menu_db import menu_db
+from .orders_db import orders_db_instance, ORDER_PAGE_SIZE, STATS_CACHE_TTL
+from .staff_db import staff_db
+
+
+_executor = None
+
+
+def async_db_executor():
+    """Thread executor shared by every async manager"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=ASYNC_DB_THREADS, thread_name_prefix="async-db")
+    return _executor
+
+
+class AsyncManager:
+    """Awaitable wrapper around one synchronous db manager"""
+
+    def __init__(self, manager, executor=None):
+        self.manager = manager
+        self._executor = executor
+
+    async def call(self, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs) on the executor and await its result"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor or async_db_executor(),
+                                          functools.partial(fn, *args, **kwargs))
+
+    def __getattr__(self, name):
+        method = getattr(self.manager, name)
+        if not callable(method):
+            return method
+
+        @functools.wraps(method)
+        async def call_method(*args, **kwargs):
+            return await self.call(method, *args, **kwargs)
+        return call_method
+
+
+class AsyncOrders(AsyncManager):
+    """Awaitable orders_db"""
+
+    async def list(self, **filters):
+        return await self.call(self.manager.find_orders, **filters)
+
+    async def page(self, page_size=ORDER_PAGE_SIZE, cursor=None, **filters):
+        return await self.call(self.manager.find_orders_page, page_size, cursor, **filters)
+
+    async def search(self, search_term, **options):
+        return await self.call(self.manager.search_orders, search_term, **options)
+
+    async def stats(self, max_age=STATS_CACHE_TTL):
+        return await self.call(self.manager.get_stats_snapshot, max_age)
+
+    async def popular_items(self, **options):
+        return await self.call(self.manager.get_popular_items, **options)
+
+
+class AsyncMenu(AsyncManager):
+    """Awaitable menu_db"""
+
+    async def catalog(self):
+        return await self.call(self.manager.get_all_menu_items)
+
+    async def view(self, name, build, offline=False):
+        return await self.call(self.manager.get_catalog_view, name, build, offline)
+
+
+class AsyncSales(AsyncManager):
+    """Awaitable daily_sales rollup"""
+
+    async def year_revenue(self, year, status='completed'):
+        return await self.call(self.manager.get_year_revenue, year, status)
+
+    async def monthly_revenue(self, start_date, end_date, status='completed'):
+        return await self.call(self.manager.get_monthly_revenue, start_date, end_date, status)
+
+
+class AsyncActivities(AsyncManager):
+    """Awaitable activity_db"""
+
+    async def list(self, **filters):
+        return await self.call(self.manager.find_activities, **filters)
+
+    async def page(self, cursor=None, **filters):
+        return await self.call(self.manager.find_activities_page, cursor=cursor, **filters)
+
+
+class AsyncDB:
+    """Async entry point to every db manager.
+
+    The managers can be swapped (e.g. for stand-ins backed by a scratch
+    database); by default the process-wide singletons are used.
+    """
+
+    def __init__(self, orders=None, menu=None, sales=None, activities=None,
+                 customers=None, staff=None, admins=None, executor=None):
+        self.orders = AsyncOrders(orders or orders_db_instance, executor)
+        self.menu = AsyncMenu(menu or menu_db, executor)
+        self.sales = AsyncSales(sales or daily_sales, executor)
+        self.activities = AsyncActivities(activities or activity_db, executor)
+        self.customers = AsyncManager(customers or customer_db, executor)
+        self.staff = AsyncManager(staff or staff_db, executor)
+        self.admins = AsyncManager(admins or admin_db, executor)
+
+    async def users(self):
+        """(customers, staff) rows, both lists fetched concurrently"""
+        return await asyncio.gather(self.customers.get_all_customers(), self.staff.get_all_staff())
+
+
+# Global async facade over the shared managers
+async_db = AsyncDB()
\ No newline at end of file
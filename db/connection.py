@@ -0,0 +1,224 @@
+# connection.py
+"""
+Shared MySQL connection pool used by every db/* manager
+"""
+import os
+import threading
+import time
+
+import mysql.connector
+from mysql.connector import Error
+from mysql.connector.errors import PoolError
+
+
+# Single source of truth for the database settings (XAMPP defaults).
+# Each value can be overridden through the environment.
+DB_CONFIG = {
+    'host': os.environ.get('FOODDASH_DB_HOST', 'localhost'),
+    'port': int(os.environ.get('FOODDASH_DB_PORT', 3306)),
+    'user': os.environ.get('FOODDASH_DB_USER', 'root'),
+    'password': os.environ.get('FOODDASH_DB_PASSWORD', ''),
+    'database': os.environ.get('FOODDASH_DB_NAME', 'food_dash_db')
+}
+
+# Connection budget: every background thread can hold one pooled connection
+# at a time. The pool keeps RESERVED_CONNECTIONS free for calls made on the
+# GUI thread (login, checkout, migrations) plus one for the activity writer;
+# the rest is split between the DataService thread pool and the async_db
+# executor, so DATA_THREADS + ASYNC_DB_THREADS + 1 <= POOL_SIZE - RESERVED.
+RESERVED_CONNECTIONS = 2
+ACTIVITY_WRITER_CONNECTIONS = 1
+# Grown if configured too small to give each worker pool at least one thread
+POOL_SIZE = max(int(os.environ.get('FOODDASH_DB_POOL_SIZE', 8)),
+                RESERVED_CONNECTIONS + ACTIVITY_WRITER_CONNECTIONS + 2)
+WORKER_CONNECTIONS = POOL_SIZE - RESERVED_CONNECTIONS - ACTIVITY_WRITER_CONNECTIONS
+ASYNC_DB_THREADS = min(max(1, int(os.environ.get('FOODDASH_ASYNC_DB_THREADS', WORKER_CONNECTIONS // 2))),
+                       WORKER_CONNECTIONS - 1)
+DATA_THREADS = WORKER_CONNECTIONS - ASYNC_DB_THREADS
+
+# Local files (archives, caches) live here, not in the working directory.
+# Defaults to the application folder; relative overrides resolve against it.
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(APP_DIR, os.environ.get('FOODDASH_DATA_DIR', ''))
+CHECKOUT_TIMEOUT = 10.0         # seconds to wait for a free connection
+HEALTH_CHECK_INTERVAL = 30.0    # idle seconds before a connection is pinged
+
+
+class PooledConnection:
+    """Proxy around a pooled connection - close() hands it back to the pool"""
+
+    def __init__(self, pool, connection):
+        self._pool = pool
+        self._connection = connection
+
+    def __getattr__(self, name):
+        connection = self.__dict__.get('_connection')
+        if connection is None:
+            raise PoolError("Connection has already been returned to the pool")
+        return getattr(connection, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def __del__(self):
+        # Safety net for code paths that return early without closing
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    def close(self):
+        """Return the underlying connection to the pool"""
+        connection = self.__dict__.get('_connection')
+        if connection is not None:
+            self._connection = None
+            self._pool.release(connection)
+
+
+class ConnectionPool:
+    """Thread-safe, lazily filled pool of MySQL connections"""
+
+    def __init__(self, config=None, pool_size=POOL_SIZE,
+                 checkout_timeout=CHECKOUT_TIMEOUT, health_check_interval=HEALTH_CHECK_INTERVAL):
+        self.config = dict(config or DB_CONFIG)
+        self.pool_size = pool_size
+        self.checkout_timeout = checkout_timeout
+        self.health_check_interval = health_check_interval
+
+        self._idle = []             # [(connection, returned_at)], most recent last
+        self._open_count = 0
+        self._condition = threading.Condition()
+        self._stats = {
+            'created': 0,
+            'checkouts': 0,
+            'waits': 0,
+            'timeouts': 0,
+            'health_checks': 0,
+            'health_check_failures': 0,
+            'discarded': 0
+        }
+
+    def configure(self, pool_size=None, **config):
+        """Change pool size and/or connection settings (drops idle connections)"""
+        with self._condition:
+            if pool_size is not None:
+                self.pool_size = pool_size
+            if config:
+                self.config.update(config)
+            self._close_idle()
+            self._condition.notify_all()
+
+    def get_connection(self):
+        """Check out a healthy connection, waiting if the pool is exhausted"""
+        deadline = time.monotonic() + self.checkout_timeout
+        waited = False
+
+        with self._condition:
+            while True:
+                if self._idle:
+                    connection, returned_at = self._idle.pop()
+                    break
+                if self._open_count < self.pool_size:
+                    self._open_count += 1
+                    connection, returned_at = None, None
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats['timeouts'] += 1
+                    raise PoolError(f"No free database connection after {self.checkout_timeout}s "
+                                    f"(pool size {self.pool_size})")
+                if not waited:
+                    self._stats['waits'] += 1
+                    waited = True
+                self._condition.wait(remaining)
+
+        # Connect / health check outside the lock so other threads are not blocked
+        try:
+            if connection is None:
+                connection = self._create_connection()
+            elif time.monotonic() - returned_at >= self.health_check_interval:
+                connection = self._health_check(connection)
+        except BaseException:
+            # Any failure (not only mysql errors, e.g. a bad config or Ctrl+C) gives the slot back
+            with self._condition:
+                self._open_count -= 1
+                self._condition.notify()
+            raise
+
+        with self._condition:
+            self._stats['checkouts'] += 1
+        return PooledConnection(self, connection)
+
+    def release(self, connection):
+        """Give a connection back to the pool"""
+        try:
+            if connection.in_transaction:
+                connection.rollback()
+            healthy = True
+        except Error:
+            healthy = False
+
+        with self._condition:
+            if healthy and self._open_count <= self.pool_size:
+                self._idle.append((connection, time.monotonic()))
+            else:
+                self._open_count -= 1
+                self._stats['discarded'] += 1
+                self._safe_close(connection)
+            self._condition.notify()
+
+    def stats(self):
+        """Snapshot of pool usage counters"""
+        with self._condition:
+            stats = dict(self._stats)
+            stats['pool_size'] = self.pool_size
+            stats['open'] = self._open_count
+            stats['idle'] = len(self._idle)
+            stats['in_use'] = self._open_count - len(self._idle)
+            return stats
+
+    def close_all(self):
+        """Close every idle connection (checked-out ones close when returned)"""
+        with self._condition:
+            self._close_idle()
+
+    def _create_connection(self):
+        connection = mysql.connector.connect(**self.config)
+        with self._condition:
+            self._stats['created'] += 1
+        return connection
+
+    def _health_check(self, connection):
+        """Ping a connection that sat idle; replace it if the server dropped it"""
+        with self._condition:
+            self._stats['health_checks'] += 1
+        try:
+            connection.ping(reconnect=False)
+            return connection
+        except Error:
+            with self._condition:
+                self._stats['health_check_failures'] += 1
+            self._safe_close(connection)
+            return self._create_connection()
+
+    def _close_idle(self):
+        while self._idle:
+            connection, _ = self._idle.pop()
+            self._open_count -= 1
+            self._safe_close(connection)
+
+    @staticmethod
+    def _safe_close(connection):
+        try:
+            connection.close()
+        except Error:
+            pass
+
+
+# Global pool shared by all database managers
+db_pool = ConnectionPool()
\ No newline at end of file
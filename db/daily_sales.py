@@ -0,0 +1,143 @@
+# daily_sales.py
+"""
+Daily sales rollup
+One row per (day, status) with order count, revenue and items sold, kept in
+step with `orders` by orders_db inside the same transaction as each write.
+Charts and reports read a few hundred rollup rows instead of every order.
+
+Usage: python -m db.daily_sales rebuild
+"""
+import sys
+from datetime import date
+
+from mysql.connector import Error
+
+from .connection import db_pool
+
+
+CREATE_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS daily_sales (
+        sales_date DATE NOT NULL,
+        status VARCHAR(50) NOT NULL,
+        order_count INT NOT NULL DEFAULT 0,
+        revenue DECIMAL(14,2) NOT NULL DEFAULT 0,
+        items_sold INT NOT NULL DEFAULT 0,
+        PRIMARY KEY (sales_date, status),
+        INDEX idx_daily_sales_status_date (status, sales_date)
+    )
+"""
+
+# Aggregates the full order history; used by the migration backfill and rebuild()
+BACKFILL_SQL = """
+    INSERT INTO daily_sales (sales_date, status, order_count, revenue, items_sold)
+    SELECT DATE(o.created_at), COALESCE(o.status, ''), COUNT(*),
+           COALESCE(SUM(o.total_amount), 0), COALESCE(SUM(i.items_sold), 0)
+    FROM orders o
+    LEFT JOIN (
+        SELECT order_id, SUM(quantity) AS items_sold
+        FROM order_items
+        GROUP BY order_id
+    ) i ON i.order_id = o.id
+    GROUP BY DATE(o.created_at), COALESCE(o.status, '')
+"""
+
+
+class DailySales:
+    """Maintains and reads the daily_sales rollup table"""
+
+    def __init__(self, pool=None):
+        self.pool = pool or db_pool
+
+    def apply_order(self, cursor, order_id, sign=1):
+        """Add (sign=1) or remove (sign=-1) one order's contribution.
+
+        Runs on the caller's cursor so the rollup changes commit or roll back
+        together with the order write itself.
+        """
+        cursor.execute("""
+            INSERT INTO daily_sales (sales_date, status, order_count, revenue, items_sold)
+            SELECT DATE(o.created_at), COALESCE(o.status, ''), %s, %s * o.total_amount,
+                   %s * COALESCE((SELECT SUM(quantity) FROM order_items WHERE order_id = o.id), 0)
+            FROM orders o
+            WHERE o.id = %s
+            ON DUPLICATE KEY UPDATE
+                order_count = order_count + VALUES(order_count),
+                revenue = revenue + VALUES(revenue),
+                items_sold = items_sold + VALUES(items_sold)
+        """, (sign, sign, sign, order_id))
+
+    def rebuild(self):
+        """Recompute the whole rollup from orders in one transaction"""
+        connection = self.pool.get_connection()
+        cursor = connection.cursor()
+        try:
+            cursor.execute(CREATE_TABLE_SQL)
+            cursor.execute("DELETE FROM daily_sales")
+            cursor.execute(BACKFILL_SQL)
+            rows = cursor.rowcount
+            connection.commit()
+            return True, f"daily_sales rebuilt ({rows} rows)"
+
+        except Error as e:
+            connection.rollback()
+            print(f"Error rebuilding daily sales: {e}")
+            return False, f"Failed to rebuild daily sales: {str(e)}"
+        finally:
+            cursor.close()
+            connection.close()
+
+    def get_monthly_revenue(self, start_date, end_date, status='completed'):
+        """Revenue per month in [start_date, end_date) as {(year, month): revenue}"""
+        connection = self.pool.get_connection()
+        cursor = connection.cursor()
+        try:
+            cursor.execute("""
+                SELECT YEAR(sales_date), MONTH(sales_date), SUM(revenue)
+                FROM daily_sales
+                WHERE status = %s AND sales_date >= %s AND sales_date < %s
+                GROUP BY YEAR(sales_date), MONTH(sales_date)
+            """, (status, start_date, end_date))
+            return True, {(int(year), int(month)): float(revenue)
+                          for year, month, revenue in cursor.fetchall()}
+
+        except Error as e:
+            print(f"Error fetching monthly revenue: {e}")
+            return False, f"Failed to fetch monthly revenue: {str(e)}"
+        finally:
+            cursor.close()
+            connection.close()
+
+    def get_total_revenue(self, status='completed'):
+        """Revenue of every order with `status`, summed over the rollup rows"""
+        connection = self.pool.get_connection()
+        cursor = connection.cursor()
+        try:
+            cursor.execute("SELECT COALESCE(SUM(revenue), 0) FROM daily_sales WHERE status = %s", (status,))
+            return True, float(cursor.fetchone()[0])
+
+        except Error as e:
+            print(f"Error fetching total revenue: {e}")
+            return False, f"Failed to fetch total revenue: {str(e)}"
+        finally:
+            cursor.close()
+            connection.close()
+
+    def get_year_revenue(self, year, status='completed'):
+        """Twelve monthly revenue totals (Jan..Dec) for one year"""
+        success, by_month = self.get_monthly_revenue(date(year, 1, 1), date(year + 1, 1, 1), status)
+        if not success:
+            return False, by_month
+        return True, [by_month.get((year, month), 0.0) for month in range(1, 13)]
+
+
+# Global rollup manager
+daily_sales = DailySales()
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ['rebuild']:
+        success, message = daily_sales.rebuild()
+        print(message)
+        sys.exit(0 if success else 1)
+    print(__doc__)
+    sys.exit(2)
\ No newline at end of file
@@ -0,0 +1,246 @@
+# menu_catalog.py
+"""
+Shared menu catalog cache
+Menu screens read menu_items through this cache instead of each running its
+own SELECT. The cache is keyed by the 'menu' row of catalog_versions, which
+MenuDB bumps in the same transaction as every create, update and delete.
+Other app instances notice a change with one primary-key lookup and refetch
+the catalog only when the version moved.
+
+Every catalog fetched from the database is also written to a local snapshot
+file, so a kiosk can render its last good menu before (or without) reaching
+the database.
+"""
+import json
+import os
+import threading
+from datetime import datetime
+from decimal import Decimal
+from time import monotonic
+
+from mysql.connector import Error
+
+from .connection import db_pool, DATA_DIR
+
+
+MENU_CATALOG = 'menu'
+CATALOG_CHECK_INTERVAL = 5.0    # seconds a cached catalog is served without a version check
+MENU_SNAPSHOT_PATH = os.path.join(DATA_DIR, os.environ.get('FOODDASH_MENU_SNAPSHOT',
+                                                           os.path.join('cache', 'menu_snapshot.json')))
+
+CREATE_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS catalog_versions (
+        name VARCHAR(32) NOT NULL PRIMARY KEY,
+        version BIGINT NOT NULL DEFAULT 1,
+        updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+    )
+"""
+
+SEED_SQL = "INSERT IGNORE INTO catalog_versions (name, version) VALUES ('menu', 1)"
+
+
+class MenuCatalog:
+    """Process-wide cache of menu_items rows and views derived from them"""
+
+    def __init__(self, pool=None, check_interval=CATALOG_CHECK_INTERVAL, snapshot_path=MENU_SNAPSHOT_PATH):
+        self.pool = pool or db_pool
+        self.check_interval = check_interval
+        self.snapshot_path = snapshot_path
+
+        self._lock = threading.Lock()
+        self._snapshot_lock = threading.Lock()
+        self._items = None
+        self._version = None
+        self._checked_at = 0.0
+        self._views = {}
+        self._refreshing = False    # a reader is fetching from the database
+        self._generation = 0        # bumped by invalidate()
+
+    @staticmethod
+    def bump_version(cursor):
+        """Advance the catalog version on the writer's cursor, so it commits with the write"""
+        cursor.execute("UPDATE catalog_versions SET version = version + 1 WHERE name = %s", (MENU_CATALOG,))
+
+    def invalidate(self):
+        """Force the next read to refetch (the old copy stays as an offline fallback)"""
+        with self._lock:
+            self._version = None
+            self._checked_at = 0.0
+            self._generation += 1
+
+    @property
+    def version(self):
+        """Version of the cached catalog (None before the first load)"""
+        return self._version
+
+    def get_items(self, max_age=None):
+        """Menu rows, newest first, refetched only when the catalog version changed.
+
+        A cached catalog younger than `max_age` seconds (default
+        check_interval) is returned without touching the database. If the
+        database is unreachable the last loaded catalog is served.
+
+        The database is queried without holding the lock; while one reader
+        refreshes, the others keep getting the cached catalog.
+        """
+        max_age = self.check_interval if max_age is None else max_age
+
+        with self._lock:
+            if self._items is not None and (self._refreshing or monotonic() - self._checked_at < max_age):
+                return self._items
+            self._refreshing = True
+            cached, known_version, generation = self._items is not None, self._version, self._generation
+
+        try:
+            version, rows = self._fetch(cached, known_version)
+        except Error as e:
+            with self._lock:
+                self._refreshing = False
+                if self._items is None and not self._load_snapshot():
+                    raise
+                # Do not retry the database on every read while it is down
+                self._checked_at = monotonic()
+                print(f"Serving cached menu catalog: {e}")
+                return self._items
+        except BaseException:
+            with self._lock:
+                self._refreshing = False
+            raise
+
+        with self._lock:
+            self._refreshing = False
+            if rows is not None:
+                self._items = rows
+                self._version = version
+                self._views = {}
+            if self._generation == generation:
+                self._checked_at = monotonic()
+            else:
+                # Invalidated while fetching: the rows may predate that write
+                self._version = None
+            items = self._items
+
+        if rows is not None:
+            self._save_snapshot(rows, version)
+        return items
+
+    def peek_items(self):
+        """Catalog without touching the database: the memory copy, else the
+        on-disk snapshot, else None"""
+        with self._lock:
+            if self._items is None:
+                self._load_snapshot()
+            return self._items
+
+    def view(self, name, build, max_age=None, offline=False):
+        """build(items) computed once per catalog version and cached under `name`.
+
+        With offline=True only peek_items() is used, and None is returned when
+        there is no catalog in memory or on disk yet.
+        """
+        items = self.peek_items() if offline else self.get_items(max_age)
+        if items is None:
+            return None
+        with self._lock:
+            cached = self._views.get(name)
+            if cached is not None and cached[0] is items:
+                return cached[1]
+
+        result = build(items)
+        with self._lock:
+            if self._items is items:
+                self._views[name] = (items, result)
+        return result
+
+    def _fetch(self, cached, known_version):
+        """(version, rows) from the database; rows is None when the cached
+        catalog is still current. Runs without the lock."""
+        connection = self.pool.get_connection()
+        cursor = connection.cursor(dictionary=True)
+        try:
+            try:
+                cursor.execute("SELECT version FROM catalog_versions WHERE name = %s", (MENU_CATALOG,))
+                row = cursor.fetchone()
+                version = row['version'] if row else None
+            except Error:
+                # Migrations not applied yet: no version to key on, always reload
+                version = None
+
+            if not cached or version is None or version != known_version:
+                # Version is read first, so rows are never older than the version they are stored under
+                cursor.execute("SELECT * FROM menu_items ORDER BY id DESC")
+                return version, cursor.fetchall()
+            return version, None
+        finally:
+            cursor.close()
+            connection.close()
+
+    def _source(self):
+        """Identifies the database a snapshot was taken from"""
+        config = getattr(self.pool, 'config', {})
+        return f"{config.get('host')}:{config.get('port')}/{config.get('database')}"
+
+    def _save_snapshot(self, items, version):
+        """Write a fetched catalog to disk atomically (best effort)"""
+        if not self.snapshot_path:
+            return
+
+        rows = []
+        for item in items:
+            row = dict(item)
+            for key, value in row.items():
+                if isinstance(value, Decimal):
+                    row[key] = str(value)
+                elif isinstance(value, datetime):
+                    row[key] = value.isoformat()
+            rows.append(row)
+
+        snapshot = {
+            'source': self._source(),
+            'version': version,
+            'saved_at': datetime.now().isoformat(),
+            'items': rows
+        }
+        try:
+            directory = os.path.dirname(self.snapshot_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temp_path = self.snapshot_path + '.tmp'
+            with self._snapshot_lock:
+                with open(temp_path, 'w', encoding='utf-8') as file:
+                    json.dump(snapshot, file)
+                os.replace(temp_path, self.snapshot_path)
+        except OSError as e:
+            print(f"Error saving menu snapshot: {e}")
+
+    def _load_snapshot(self):
+        """Seed the cache from the snapshot file (caller holds the lock); True if loaded"""
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return False
+
+        try:
+            with open(self.snapshot_path, encoding='utf-8') as file:
+                snapshot = json.load(file)
+
+            items = []
+            for row in snapshot['items']:
+                if row.get('price') is not None:
+                    row['price'] = Decimal(row['price'])
+                if row.get('created_at'):
+                    row['created_at'] = datetime.fromisoformat(row['created_at'])
+                items.append(row)
+
+        except (OSError, ValueError, KeyError, ArithmeticError) as e:
+            print(f"Ignoring unreadable menu snapshot: {e}")
+            return False
+
+        self._items = items
+        # Only trust the version when the snapshot came from this database
+        self._version = snapshot.get('version') if snapshot.get('source') == self._source() else None
+        self._views = {}
+        self._checked_at = 0.0      # check the database at the next online read
+        return True
+
+
+# Global catalog shared by every menu screen in this process
+menu_catalog = MenuCatalog()
\ No newline at end of file
@@ -1,27 +1,21 @@
 # menu_db.py
-import mysql.connector
 from mysql.connector import Error
 
+from .connection import db_pool
+from .menu_catalog import menu_catalog
+
 
 class MenuDB:
     """Database manager for menu items"""
 
     def __init__(self):
-        self.host = 'localhost'
-        self.database = 'food_dash_db'
-        self.user = 'root'
-        self.password = ''
+        self.pool = db_pool
+        self.catalog = menu_catalog
 
     def get_connection(self):
-        """Get database connection"""
+        """Get a pooled database connection (close() returns it to the pool)"""
         try:
-            connection = mysql.connector.connect(
-                host=self.host,
-                database=self.database,
-                user=self.user,
-                password=self.password
-            )
-            return connection
+            return self.pool.get_connection()
         except Error as e:
             print(f"Database connection error: {e}")
             return None
@@ -42,10 +36,13 @@ class MenuDB:
             menu_data = (name, description, category, price, image_url)
 
             cursor.execute(insert_query, menu_data)
-            connection.commit()
-
+            # Read before the version bump; its UPDATE resets lastrowid
             item_id = cursor.lastrowid
 
+            self.catalog.bump_version(cursor)
+            connection.commit()
+            self.catalog.invalidate()
+
             cursor.close()
             connection.close()
 
@@ -55,22 +52,22 @@ class MenuDB:
             return False, f"Database error: {str(e)}"
 
     def get_all_menu_items(self):
-        """Get all menu items"""
-        connection = self.get_connection()
-        if connection is None:
-            return []
-
+        """Get all menu items (served from the shared catalog cache)"""
         try:
-            cursor = connection.cursor(dictionary=True)
+            return list(self.catalog.get_items())
 
-            query = "SELECT * FROM menu_items ORDER BY id DESC"
-            cursor.execute(query)
-            menu_items = cursor.fetchall()
+        except Error as e:
+            print(f"Error getting menu items: {e}")
+            return []
 
-            cursor.close()
-            connection.close()
+    def get_catalog_view(self, name, build, offline=False):
+        """Get build(menu rows), rebuilt only when the menu catalog version changes.
 
-            return menu_items
+        offline=True answers from memory or the local snapshot without
+        touching the database ([] when neither exists yet).
+        """
+        try:
+            return list(self.catalog.view(name, build, offline=offline) or [])
 
         except Error as e:
             print(f"Error getting menu items: {e}")
@@ -135,9 +132,14 @@ class MenuDB:
 
             update_query = f"UPDATE menu_items SET {', '.join(updates)} WHERE id = %s"
             cursor.execute(update_query, values)
-            connection.commit()
-
+            # Read before the version bump; its UPDATE replaces rowcount
             affected_rows = cursor.rowcount
+
+            if affected_rows > 0:
+                self.catalog.bump_version(cursor)
+                connection.commit()
+                self.catalog.invalidate()
+
             cursor.close()
             connection.close()
 
@@ -160,9 +162,14 @@ class MenuDB:
 
             delete_query = "DELETE FROM menu_items WHERE id = %s"
             cursor.execute(delete_query, (item_id,))
-            connection.commit()
-
+            # Read before the version bump; its UPDATE replaces rowcount
             affected_rows = cursor.rowcount
+
+            if affected_rows > 0:
+                self.catalog.bump_version(cursor)
+                connection.commit()
+                self.catalog.invalidate()
+
             cursor.close()
             connection.close()
 
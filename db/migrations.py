@@ -0,0 +1,338 @@
+# migrations.py
+"""
+Versioned schema migrations
+Applies numbered schema changes in order and records them in the
+schema_migrations table, so every install can be upgraded repeatably.
+Destructive migrations (DESTRUCTIVE_MIGRATIONS) are skipped when the app
+starts and only run from the command line.
+
+Usage: python -m db.migrations [--status]
+"""
+import json
+import sys
+from collections import Counter
+
+from mysql.connector import Error
+
+from .connection import db_pool
+from .daily_sales import BACKFILL_SQL as DAILY_SALES_BACKFILL_SQL
+from .daily_sales import CREATE_TABLE_SQL as DAILY_SALES_TABLE_SQL
+from .menu_catalog import CREATE_TABLE_SQL as CATALOG_VERSIONS_TABLE_SQL
+from .menu_catalog import SEED_SQL as CATALOG_VERSIONS_SEED_SQL
+
+
+MIGRATION_LOCK = 'food_dash_schema_migrations'
+MIGRATION_LOCK_TIMEOUT = 30     # seconds to wait for another instance's migration run
+
+
+def index_exists(cursor, table, index_name):
+    """Check information_schema for an index on a table"""
+    cursor.execute("""
+        SELECT 1 FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s
+        LIMIT 1
+    """, (table, index_name))
+    return cursor.fetchone() is not None
+
+
+def column_exists(cursor, table, column_name):
+    """Check information_schema for a column on a table"""
+    cursor.execute("""
+        SELECT 1 FROM information_schema.columns
+        WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s
+        LIMIT 1
+    """, (table, column_name))
+    return cursor.fetchone() is not None
+
+
+def add_index(table, index_name, columns, kind="INDEX"):
+    """Migration step that creates an index unless it already exists"""
+    def step(cursor):
+        if not index_exists(cursor, table, index_name):
+            cursor.execute(f"ALTER TABLE {table} ADD {kind} {index_name} ({columns})")
+    return step
+
+
+def drop_index(table, index_name):
+    """Migration step that drops an index if it exists"""
+    def step(cursor):
+        if index_exists(cursor, table, index_name):
+            cursor.execute(f"ALTER TABLE {table} DROP INDEX {index_name}")
+    return step
+
+
+def add_column(table, column_name, definition):
+    """Migration step that adds a column unless it already exists"""
+    def step(cursor):
+        if not column_exists(cursor, table, column_name):
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column_name} {definition}")
+    return step
+
+
+def drop_column(table, column_name):
+    """Migration step that drops a column if it exists"""
+    def step(cursor):
+        if column_exists(cursor, table, column_name):
+            cursor.execute(f"ALTER TABLE {table} DROP COLUMN {column_name}")
+    return step
+
+
+def _parse_price(value):
+    try:
+        return float(str(value).replace('₱', '').replace(',', '') or 0)
+    except ValueError:
+        return 0.0
+
+
+def backfill_order_items_from_json(cursor, batch_size=500):
+    """Copy cart lines that only exist in the orders.items JSON into order_items.
+
+    Older checkouts skipped lines whose menu item could not be resolved, so
+    the JSON can hold lines order_items lacks. Lines already present (matched
+    by name and occurrence) are left alone, which makes the step re-runnable.
+    """
+    if not column_exists(cursor, 'orders', 'items'):
+        return
+
+    last_id = 0
+    while True:
+        cursor.execute(
+            "SELECT id, order_number, items, created_at FROM orders WHERE id > %s ORDER BY id LIMIT %s",
+            (last_id, batch_size)
+        )
+        orders = cursor.fetchall()
+        if not orders:
+            break
+        last_id = orders[-1][0]
+
+        order_ids = [order[0] for order in orders]
+        placeholders = ', '.join(['%s'] * len(order_ids))
+        cursor.execute(f"""
+            SELECT order_id, menu_item_name, COUNT(*)
+            FROM order_items
+            WHERE order_id IN ({placeholders})
+            GROUP BY order_id, menu_item_name
+        """, order_ids)
+        existing = {(order_id, name): count for order_id, name, count in cursor.fetchall()}
+
+        missing = []
+        for order_id, order_number, items_json, created_at in orders:
+            try:
+                lines = json.loads(items_json or '[]')
+            except (TypeError, ValueError):
+                continue
+
+            seen = Counter()
+            for line in lines:
+                title = line.get('title') if isinstance(line, dict) else None
+                if not title:
+                    continue
+                seen[title] += 1
+                if seen[title] <= existing.get((order_id, title), 0):
+                    continue
+                price = _parse_price(line.get('price', 0))
+                quantity = int(line.get('qty', 1))
+                missing.append((order_id, order_number, title, quantity, price, price * quantity, created_at))
+
+        if not missing:
+            continue
+
+        names = list(dict.fromkeys(line[2] for line in missing))
+        placeholders = ', '.join(['%s'] * len(names))
+        # Highest id first so the lowest id wins when names are duplicated
+        cursor.execute(f"SELECT id, name FROM menu_items WHERE name IN ({placeholders}) ORDER BY id DESC", names)
+        menu_ids = {name: menu_id for menu_id, name in cursor.fetchall()}
+
+        cursor.executemany("""
+            INSERT INTO order_items (
+                order_id, order_number, menu_item_id, menu_item_name,
+                quantity, price, total_price, created_at
+            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        """, [(order_id, order_number, menu_ids.get(title), title, quantity, price, total, created_at)
+              for order_id, order_number, title, quantity, price, total, created_at in missing])
+
+
+# Lift the 1024 byte GROUP_CONCAT default so long carts are not truncated
+ITEM_SUMMARY_BACKFILL_SQL = """
+    UPDATE orders o
+    JOIN (
+        SELECT order_id,
+               GROUP_CONCAT(CONCAT(quantity, 'x ', menu_item_name) ORDER BY id SEPARATOR ', ') AS summary
+        FROM order_items
+        GROUP BY order_id
+    ) i ON i.order_id = o.id
+    SET o.item_summary = i.summary
+"""
+
+
+def refresh_item_summaries(cursor):
+    """Recompute orders.item_summary from order_items, if the column exists yet"""
+    if column_exists(cursor, 'orders', 'item_summary'):
+        cursor.execute("SET SESSION group_concat_max_len = 1048576")
+        cursor.execute(ITEM_SUMMARY_BACKFILL_SQL)
+
+
+# (version, description, [steps]) - a step is an SQL string or a callable(cursor).
+# Never edit an applied migration; append a new one instead.
+MIGRATIONS = [
+    (1, "Index orders for status/date filters and keyset paging", [
+        add_index('orders', 'idx_orders_status_created', 'status, created_at'),
+        add_index('orders', 'idx_orders_created', 'created_at'),
+    ]),
+    (2, "Index order_items by order and menu item", [
+        add_index('order_items', 'idx_order_items_order_menu', 'order_id, menu_item_id'),
+    ]),
+    (3, "Index menu_items by name for checkout lookups", [
+        add_index('menu_items', 'idx_menu_items_name', 'name'),
+    ]),
+    (4, "Order number sequence table", [
+        """
+        CREATE TABLE IF NOT EXISTS order_number_sequence (
+            name VARCHAR(32) NOT NULL PRIMARY KEY,
+            next_value BIGINT NOT NULL
+        )
+        """,
+        """
+        INSERT IGNORE INTO order_number_sequence (name, next_value)
+        SELECT 'orders', COALESCE(MAX(id), 0) + 1 FROM orders
+        """,
+    ]),
+    (5, "Daily sales rollup table with backfill", [
+        DAILY_SALES_TABLE_SQL,
+        "DELETE FROM daily_sales",
+        DAILY_SALES_BACKFILL_SQL,
+    ]),
+    (6, "Keep order lines only in order_items and drop the orders.items JSON", [
+        backfill_order_items_from_json,
+        drop_column('orders', 'items'),
+        # items_sold is derived from order_items, which the backfill may have grown
+        "DELETE FROM daily_sales",
+        DAILY_SALES_BACKFILL_SQL,
+        # Destructive, so it may run after 7; summaries must include the backfilled lines
+        refresh_item_summaries,
+    ]),
+    (7, "Write-time orders.item_summary column with backfill", [
+        add_column('orders', 'item_summary', "TEXT NULL AFTER customer_address"),
+        refresh_item_summaries,
+    ]),
+    (8, "Search indexes: customer email/name prefix and name FULLTEXT", [
+        add_index('orders', 'idx_orders_customer_email', 'customer_email'),
+        add_index('orders', 'idx_orders_customer_name', 'customer_name'),
+        add_index('orders', 'ft_orders_customer_name', 'customer_name', kind="FULLTEXT INDEX"),
+    ]),
+    (9, "Catalog version counters for the shared menu cache", [
+        CATALOG_VERSIONS_TABLE_SQL,
+        CATALOG_VERSIONS_SEED_SQL,
+    ]),
+    (10, "Index orders by updated_at for the live order feed", [
+        add_index('orders', 'idx_orders_updated', 'updated_at'),
+    ]),
+]
+
+
+# Migrations that drop data; never applied automatically at app startup
+DESTRUCTIVE_MIGRATIONS = {6}
+
+
+class MigrationRunner:
+    """Applies pending migrations in version order"""
+
+    def __init__(self, migrations=None, pool=None):
+        self.migrations = sorted(migrations or MIGRATIONS, key=lambda migration: migration[0])
+        self.pool = pool or db_pool
+
+    def _ensure_table(self, cursor):
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version INT NOT NULL PRIMARY KEY,
+                description VARCHAR(255) NOT NULL,
+                applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+    def applied_versions(self, cursor):
+        cursor.execute("SELECT version FROM schema_migrations")
+        return {row[0] for row in cursor.fetchall()}
+
+    def status(self):
+        """Return [(version, description, applied)] for every known migration"""
+        connection = self.pool.get_connection()
+        cursor = connection.cursor()
+        try:
+            self._ensure_table(cursor)
+            applied = self.applied_versions(cursor)
+            return [(version, description, version in applied)
+                    for version, description, _ in self.migrations]
+        finally:
+            cursor.close()
+            connection.close()
+
+    def migrate(self, include_destructive=True, lock_timeout=MIGRATION_LOCK_TIMEOUT):
+        """Apply pending migrations; returns (success, applied_versions or message).
+
+        With include_destructive=False the DESTRUCTIVE_MIGRATIONS stay pending.
+        """
+        connection = self.pool.get_connection()
+        cursor = connection.cursor()
+        applied_now = []
+        try:
+            # Serialize runners of several app instances against the same database
+            cursor.execute("SELECT GET_LOCK(%s, %s)", (MIGRATION_LOCK, lock_timeout))
+            if cursor.fetchone()[0] != 1:
+                return False, "Timed out waiting for the migration lock"
+
+            try:
+                self._ensure_table(cursor)
+                applied = self.applied_versions(cursor)
+
+                for version, description, steps in self.migrations:
+                    if version in applied:
+                        continue
+                    if version in DESTRUCTIVE_MIGRATIONS and not include_destructive:
+                        continue
+
+                    print(f"Applying migration {version}: {description}")
+                    for step in steps:
+                        if callable(step):
+                            step(cursor)
+                        else:
+                            cursor.execute(step)
+
+                    cursor.execute(
+                        "INSERT INTO schema_migrations (version, description) VALUES (%s, %s)",
+                        (version, description)
+                    )
+                    connection.commit()
+                    applied_now.append(version)
+            finally:
+                cursor.execute("SELECT RELEASE_LOCK(%s)", (MIGRATION_LOCK,))
+                cursor.fetchall()
+
+            return True, applied_now
+
+        except Error as e:
+            print(f"Migration error: {e}")
+            return False, f"Migration failed after {applied_now}: {str(e)}"
+        finally:
+            cursor.close()
+            connection.close()
+
+
+def run_migrations(include_destructive=True, lock_timeout=MIGRATION_LOCK_TIMEOUT):
+    """Apply pending migrations with the default runner"""
+    try:
+        return MigrationRunner().migrate(include_destructive, lock_timeout)
+    except Error as e:
+        print(f"Cannot run migrations: {e}")
+        return False, str(e)
+
+
+if __name__ == "__main__":
+    if '--status' in sys.argv:
+        for version, description, applied in MigrationRunner().status():
+            note = "  (destructive, command line only)" if version in DESTRUCTIVE_MIGRATIONS and not applied else ""
+            print(f"{version:>4}  {'applied' if applied else 'pending':<8} {description}{note}")
+    else:
+        success, result = run_migrations()
+        print(f"Applied: {result}" if success else result)
+        sys.exit(0 if success else 1)
\ No newline at end of file
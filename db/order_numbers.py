@@ -0,0 +1,78 @@
+# order_numbers.py
+"""
+Collision-free order number allocator backed by a database sequence row
+"""
+import threading
+from datetime import datetime
+
+from mysql.connector import Error
+
+from .connection import db_pool
+
+
+ORDER_NUMBER_BLOCK_SIZE = 20
+
+
+class OrderNumberAllocator:
+    """Hands out ORD-YYMMDD-NNNNNN order numbers from a shared sequence.
+
+    Each app instance reserves a block of sequence values with one atomic
+    UPDATE on the `order_number_sequence` row and then serves numbers from
+    memory, so numbers are unique across every instance on the same database
+    and a checkout never has to retry. The sequence row is created and seeded
+    by migration 4. The date part is informational only;
+    uniqueness comes from the sequence value. The format stays within the
+    VARCHAR(20) order_number column for the first 999,999,999 orders.
+    """
+
+    def __init__(self, pool=None, sequence_name='orders', block_size=ORDER_NUMBER_BLOCK_SIZE):
+        self.pool = pool or db_pool
+        self.sequence_name = sequence_name
+        self.block_size = block_size
+
+        self._lock = threading.Lock()
+        self._next_value = 0
+        self._block_end = 0         # exclusive
+
+    def _reserve_block(self):
+        """Atomically claim the next block of sequence values"""
+        connection = self.pool.get_connection()
+        cursor = connection.cursor()
+        try:
+            # LAST_INSERT_ID(expr) is per connection, so this is safe under concurrency
+            cursor.execute("""
+                UPDATE order_number_sequence
+                SET next_value = LAST_INSERT_ID(next_value + %s)
+                WHERE name = %s
+            """, (self.block_size, self.sequence_name))
+            if cursor.rowcount != 1:
+                # Without the row LAST_INSERT_ID() is whatever this connection inserted last
+                connection.rollback()
+                raise Error(f"Order number sequence '{self.sequence_name}' is missing "
+                            f"(run python -m db.migrations)")
+            cursor.execute("SELECT LAST_INSERT_ID()")
+            block_end = int(cursor.fetchone()[0])
+            connection.commit()
+        finally:
+            cursor.close()
+            connection.close()
+
+        return block_end - self.block_size, block_end
+
+    def next_value(self):
+        """Return the next unique sequence value"""
+        with self._lock:
+            if self._next_value >= self._block_end:
+                self._next_value, self._block_end = self._reserve_block()
+            value = self._next_value
+            self._next_value += 1
+            return value
+
+    def next_order_number(self):
+        """Return the next unique human-readable order number"""
+        value = self.next_value()
+        return f"ORD-{datetime.now().strftime('%y%m%d')}-{value:06d}"
+
+
+# Global allocator shared by all order writers in this process
+order_number_allocator = OrderNumberAllocator()
\ No newline at end of file
@@ -1,118 +1,348 @@
 # orders_db.py
-import mysql.connector
 from mysql.connector import Error
-from datetime import datetime
+from contextlib import contextmanager
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
 import json
-import random
-import string
+import re
+import threading
+from time import monotonic
+
+from .connection import db_pool
+from .daily_sales import daily_sales
+from .migrations import column_exists
+from .order_numbers import order_number_allocator
+
+
+ORDER_PAGE_SIZE = 50
+STATS_CACHE_TTL = 15.0        # seconds a stats snapshot is reused
+ORDER_FEED_OVERLAP = timedelta(seconds=2)   # re-read window for late commits (TIMESTAMP has 1 s resolution)
+SEARCH_MAX_RESULTS = 500      # ranked search results are capped at this many rows
+FULLTEXT_MIN_WORD = 3         # InnoDB ignores shorter words (innodb_ft_min_token_size)
+
+# Order line storage follows the schema: while orders.items exists (it is NOT
+# NULL) each cart is written to it and to order_items; once migration 6 has
+# dropped it, order_items is the only copy. Migration 6 is destructive, so it
+# only runs through `python -m db.migrations`, never at app startup.
+ITEMS_COLUMN_RECHECK = 60.0     # seconds a present items column is trusted without a check
+ER_BAD_FIELD_ERROR = 1054       # MySQL "Unknown column"
+
+# ORD prefix plus at least one digit, so a name such as "Ord" is not taken for an order number
+ORDER_NUMBER_PATTERN = re.compile(r'^ORD-?\d[\d-]*$', re.IGNORECASE)
+
+# Every orders column except the legacy `items` JSON blob; order lines come from order_items
+ORDER_COLUMNS = """o.id, o.order_number, o.customer_id, o.customer_name, o.customer_email,
+               o.customer_phone, o.customer_address, o.item_summary, o.subtotal, o.delivery_fee,
+               o.total_amount, o.status, o.payment_method, o.notes, o.created_at, o.updated_at"""
+
+
+class _OrderLineLoader:
+    """Fetches the lines of a batch of orders in one query, on first use"""
+
+    def __init__(self, manager, order_ids):
+        self.manager = manager
+        self.order_ids = order_ids
+        self._lines = None
+        self._lock = threading.Lock()
+
+    def lines_for(self, order_id):
+        with self._lock:
+            if self._lines is None:
+                self._lines = self.manager.get_order_lines(self.order_ids)
+        return self._lines.get(order_id, [])
+
+
+class OrderLines:
+    """List-like order lines that are only read from order_items when accessed.
+
+    Orders returned together share one loader, so rendering every card of a
+    page costs a single query while listings that never touch the lines
+    cost nothing.
+    """
+    __slots__ = ('_loader', '_order_id')
+
+    def __init__(self, loader, order_id):
+        self._loader = loader
+        self._order_id = order_id
+
+    def _lines(self):
+        return self._loader.lines_for(self._order_id)
+
+    def __iter__(self):
+        return iter(self._lines())
+
+    def __len__(self):
+        return len(self._lines())
+
+    def __getitem__(self, index):
+        return self._lines()[index]
+
+    def __bool__(self):
+        return bool(self._lines())
+
+    def __repr__(self):
+        return repr(self._lines())
+
+
+def prefetch_order_lines(orders):
+    """Load the lazy lines of these orders now, e.g. on a worker thread before the
+    GUI renders them; returns the orders"""
+    for order in orders or []:
+        items = order.get('items') if isinstance(order, dict) else None
+        if isinstance(items, OrderLines):
+            len(items)
+    return orders
 
 
 class orders_db:
     _instance = None
+    _instance_lock = threading.Lock()
 
     def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(orders_db, cls).__new__(cls)
-            cls._instance._initialize()
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = super(orders_db, cls).__new__(cls)
+                cls._instance._initialize()
         return cls._instance
 
     def _initialize(self):
-        self.config = {
-            'host': 'localhost',
-            'user': 'root',
-            'password': '',
-            'database': 'food_dash_db'
-        }
-        self.connection = None
-        self.cursor = None
+        self.pool = db_pool
+        # connect()/disconnect() state is kept per thread so legacy callers
+        # on different threads never share a connection or cursor
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._stats_cache = None    # (fetched_at, snapshot)
+        self._items_column = None   # (checked_at, orders still has the legacy items JSON column?)
+
+    @property
+    def connection(self):
+        return getattr(self._local, 'connection', None)
+
+    @property
+    def cursor(self):
+        return getattr(self._local, 'cursor', None)
+
+    @contextmanager
+    def session(self):
+        """Check out a private (connection, cursor) pair for a single call.
+
+        The connection is rolled back if the block raises and is always
+        returned to the pool, so overlapping calls from different threads
+        never touch each other's cursor or transaction.
+        """
+        connection = self.pool.get_connection()
+        cursor = None
+        try:
+            cursor = connection.cursor(dictionary=True)
+            yield connection, cursor
+        except Exception:
+            try:
+                connection.rollback()
+            except Error:
+                pass
+            raise
+        finally:
+            if cursor is not None:
+                cursor.close()
+            connection.close()
 
     def connect(self):
-        """Establish database connection"""
+        """Check out a connection for the calling thread (legacy API, prefer session())"""
         try:
-            self.connection = mysql.connector.connect(**self.config)
-            self.cursor = self.connection.cursor(dictionary=True)
+            self.disconnect()
+            self._local.connection = self.pool.get_connection()
+            self._local.cursor = self._local.connection.cursor(dictionary=True)
             return True
         except Error as e:
             print(f"Database connection error: {e}")
             return False
 
     def disconnect(self):
-        """Close database connection"""
-        if self.cursor:
-            self.cursor.close()
-        if self.connection:
-            self.connection.close()
+        """Return the calling thread's connection to the pool"""
+        cursor = self.cursor
+        connection = self.connection
+        self._local.cursor = None
+        self._local.connection = None
+        if cursor:
+            cursor.close()
+        if connection:
+            connection.close()
 
     def test_connection(self):
         """Test database connection"""
         try:
-            if self.connect():
-                self.disconnect()
-                return True, "Connected successfully"
-            return False, "Failed to connect"
+            with self.session() as (connection, cursor):
+                cursor.execute("SELECT 1 AS ok")
+                cursor.fetchone()
+            return True, "Connected successfully"
+        except Error as e:
+            return False, f"Connection error: {str(e)}"
         except Exception as e:
             return False, f"Connection error: {str(e)}"
 
-    def generate_order_number(self):
-        """Generate unique order number"""
-        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-        random_str = ''.join(random.choices(string.digits, k=4))
-        return f"ORD-{timestamp}-{random_str}"
+    def _stores_items_json(self, cursor):
+        """Whether orders still has the legacy items JSON column (dropped by migration 6).
+
+        A missing column never comes back, so only a positive answer is
+        re-checked (another instance may run migration 6 meanwhile).
+        """
+        now = monotonic()
+        if self._items_column is None or (self._items_column[1] and
+                                          now - self._items_column[0] >= ITEMS_COLUMN_RECHECK):
+            self._items_column = (now, column_exists(cursor, 'orders', 'items'))
+        return self._items_column[1]
+
+    @staticmethod
+    def _line_from_row(row):
+        """Shape an order_items row like a cart line (title, qty, price, img)"""
+        price = float(row['price'])
+        return {
+            'item_id': row['menu_item_id'],
+            'title': row['menu_item_name'],
+            'qty': int(row['quantity']),
+            'price': f"₱{price:.2f}",
+            'img': row.get('image_url') or '',
+            'total_price': float(row['total_price'])
+        }
+
+    def get_order_lines(self, order_ids):
+        """Fetch the lines of several orders in one query as {order_id: [line, ...]}"""
+        order_ids = list(order_ids)
+        if not order_ids:
+            return {}
 
-    def create_order(self, customer_id, customer_info, cart_items, subtotal, delivery_fee=50.00, notes=""):
-        """Create a new order in database"""
         try:
-            if not self.connect():
-                return False, "Database connection failed"
+            placeholders = ', '.join(['%s'] * len(order_ids))
+            with self.session() as (connection, cursor):
+                cursor.execute(f"""
+                    SELECT oi.order_id, oi.menu_item_id, oi.menu_item_name, oi.quantity,
+                           oi.price, oi.total_price, m.image_url
+                    FROM order_items oi
+                    LEFT JOIN menu_items m ON m.id = oi.menu_item_id
+                    WHERE oi.order_id IN ({placeholders})
+                    ORDER BY oi.order_id, oi.id
+                """, order_ids)
+                rows = cursor.fetchall()
+
+            lines = {}
+            for row in rows:
+                lines.setdefault(row['order_id'], []).append(self._line_from_row(row))
+            return lines
 
-            order_number = self.generate_order_number()
+        except Error as e:
+            print(f"Error fetching order lines: {e}")
+            return {}
+
+    def _attach_lines(self, orders):
+        """Give each order a lazy `items` list backed by one shared loader"""
+        loader = _OrderLineLoader(self, [order['id'] for order in orders])
+        for order in orders:
+            order['items'] = OrderLines(loader, order['id'])
+        return orders
+
+    def generate_order_number(self):
+        """Allocate a unique order number from the shared database sequence"""
+        return order_number_allocator.next_order_number()
+
+    @staticmethod
+    def build_item_summary(cart_items):
+        """One-line cart summary stored in orders.item_summary, e.g. '2x Burger, 1x Fries'"""
+        return ', '.join(f"{item['qty']}x {item['title']}" for item in cart_items)
+
+    def _resolve_menu_item_ids(self, cursor, cart_items):
+        """Map cart item titles to menu item ids with a single IN (...) lookup"""
+        names = list(dict.fromkeys(item['title'] for item in cart_items))
+        if not names:
+            return {}
+
+        placeholders = ', '.join(['%s'] * len(names))
+        # Highest id first so the lowest id wins when names are duplicated
+        cursor.execute(
+            f"SELECT id, name FROM menu_items WHERE name IN ({placeholders}) ORDER BY id DESC",
+            names
+        )
+        return {row['name']: row['id'] for row in cursor.fetchall()}
+
+    def _write_order(self, order_number, customer_id, customer_info, cart_items, subtotal, delivery_fee, notes):
+        """Insert the order, its lines and its daily_sales share in one transaction"""
+        with self.session() as (connection, cursor):
             total_amount = subtotal + delivery_fee
 
-            # Serialize cart items as JSON
-            items_json = json.dumps(cart_items, default=str)
+            # Resolve every menu item id up front (plain consistent read, no row locks)
+            menu_ids = self._resolve_menu_item_ids(cursor, cart_items)
 
             # Insert order
-            query = """
-            INSERT INTO orders (
-                order_number, customer_id, customer_name, customer_email, 
-                customer_phone, customer_address, items, subtotal, 
-                delivery_fee, total_amount, notes, status
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """
-            values = (
+            columns = [
+                'order_number', 'customer_id', 'customer_name', 'customer_email',
+                'customer_phone', 'customer_address', 'item_summary', 'subtotal',
+                'delivery_fee', 'total_amount', 'notes', 'status'
+            ]
+            values = [
                 order_number, customer_id, customer_info['full_name'],
                 customer_info['email'], customer_info['phone'],
-                customer_info['address'], items_json, subtotal,
+                customer_info['address'], self.build_item_summary(cart_items), subtotal,
                 delivery_fee, total_amount, notes, 'pending'
-            )
-
-            self.cursor.execute(query, values)
-            order_id = self.cursor.lastrowid
+            ]
+            if self._stores_items_json(cursor):
+                # Legacy schema: keep the JSON copy until migration 6 drops it
+                columns.append('items')
+                values.append(json.dumps(cart_items, default=str))
+
+            query = f"""
+            INSERT INTO orders ({', '.join(columns)})
+            VALUES ({', '.join(['%s'] * len(columns))})
+            """
+            cursor.execute(query, values)
+            order_id = cursor.lastrowid
 
-            # Insert order items
+            # Insert all order items at once (executemany batches into one multi-row INSERT).
+            # order_items is the only copy of the cart, so lines whose menu item
+            # cannot be resolved are kept with a NULL menu_item_id.
+            item_rows = []
             for item in cart_items:
-                # Find menu item ID
-                menu_query = "SELECT id, price FROM menu_items WHERE name = %s"
-                self.cursor.execute(menu_query, (item['title'],))
-                menu_item = self.cursor.fetchone()
-
-                if menu_item:
-                    item_query = """
-                    INSERT INTO order_items (
-                        order_id, order_number, menu_item_id, menu_item_name,
-                        quantity, price, total_price
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s)
-                    """
-                    item_values = (
-                        order_id, order_number, menu_item['id'], item['title'],
-                        item['qty'], float(item['price'].replace('₱', '')),
-                        float(item['price'].replace('₱', '')) * item['qty']
-                    )
-                    self.cursor.execute(item_query, item_values)
-
-            self.connection.commit()
-            self.disconnect()
+                menu_item_id = menu_ids.get(item['title'])
+                price = float(item['price'].replace('₱', ''))
+                item_rows.append((
+                    order_id, order_number, menu_item_id, item['title'],
+                    item['qty'], price, price * item['qty']
+                ))
+
+            if item_rows:
+                item_query = """
+                INSERT INTO order_items (
+                    order_id, order_number, menu_item_id, menu_item_name,
+                    quantity, price, total_price
+                ) VALUES (%s, %s, %s, %s, %s, %s, %s)
+                """
+                cursor.executemany(item_query, item_rows)
+
+            daily_sales.apply_order(cursor, order_id)
+            connection.commit()
+        return order_id, total_amount
+
+    def create_order(self, customer_id, customer_info, cart_items, subtotal, delivery_fee=50.00, notes=""):
+        """Create a new order in database.
+
+        Runs a fixed number of statements regardless of cart size: one menu id
+        lookup, the order INSERT and one multi-row order_items INSERT, all
+        committed in a single short transaction.
+        """
+        try:
+            # Allocated outside the order transaction so the sequence row is never held
+            order_number = self.generate_order_number()
 
+            try:
+                order_id, total_amount = self._write_order(order_number, customer_id, customer_info,
+                                                           cart_items, subtotal, delivery_fee, notes)
+            except Error as e:
+                if e.errno != ER_BAD_FIELD_ERROR:
+                    raise
+                # Another app instance dropped orders.items (migration 6) since it was checked
+                self._items_column = None
+                order_id, total_amount = self._write_order(order_number, customer_id, customer_info,
+                                                           cart_items, subtotal, delivery_fee, notes)
+
+            self.invalidate_stats()
             return True, {
                 'order_id': order_id,
                 'order_number': order_number,
@@ -121,335 +351,559 @@ class orders_db:
 
         except Error as e:
             print(f"Error creating order: {e}")
-            if self.connection:
-                self.connection.rollback()
-            self.disconnect()
             return False, f"Failed to create order: {str(e)}"
         except Exception as e:
             print(f"Unexpected error creating order: {e}")
-            self.disconnect()
             return False, f"Unexpected error: {str(e)}"
 
-    def get_customer_orders(self, customer_id):
-        """Get all orders for a specific customer"""
+    @staticmethod
+    def day_range(day):
+        """Half-open [start, end) timestamp range covering one calendar day"""
+        start = datetime.combine(day, time.min)
+        return start, start + timedelta(days=1)
+
+    @staticmethod
+    def month_range(year, month=None):
+        """Half-open [start, end) timestamp range covering a month, or a whole year"""
+        if month:
+            start = datetime(year, month, 1)
+            end = datetime(year + 1, 1, 1) if month == 12 else datetime(year, month + 1, 1)
+        else:
+            start = datetime(year, 1, 1)
+            end = datetime(year + 1, 1, 1)
+        return start, end
+
+    def _order_filters(self, status=None, customer_id=None, date_from=None, date_to=None,
+                       day=None, year=None, month=None):
+        """Build sargable WHERE conditions from order filters.
+
+        Every time filter is turned into a half-open `created_at` range so the
+        column is compared directly and an index on it can be used. `date_to`
+        is exclusive; dates without a time mean midnight.
+        """
+        conditions = []
+        params = []
+
+        if status:
+            conditions.append("o.status = %s")
+            params.append(status)
+
+        if customer_id is not None:
+            conditions.append("o.customer_id = %s")
+            params.append(customer_id)
+
+        ranges = []
+        if date_from is not None or date_to is not None:
+            ranges.append((date_from, date_to))
+        if day is not None:
+            ranges.append(self.day_range(day))
+        if year:
+            ranges.append(self.month_range(year, month))
+
+        for range_start, range_end in ranges:
+            if range_start is not None:
+                if not isinstance(range_start, datetime):
+                    range_start = datetime.combine(range_start, time.min)
+                conditions.append("o.created_at >= %s")
+                params.append(range_start)
+            if range_end is not None:
+                if not isinstance(range_end, datetime):
+                    range_end = datetime.combine(range_end, time.min)
+                conditions.append("o.created_at < %s")
+                params.append(range_end)
+
+        return conditions, params
+
+    def _list_orders(self, conditions, params, limit=None, cursor=None):
+        """Run the order listing query, newest first.
+
+        `cursor` is the (created_at, id) keyset of the last row already shown;
+        only older rows are returned, so every page is an index range read.
+        """
+        conditions = list(conditions)
+        params = list(params)
+
+        if cursor is not None:
+            cursor_created_at, cursor_id = cursor
+            conditions.append("(o.created_at < %s OR (o.created_at = %s AND o.id < %s))")
+            params.extend([cursor_created_at, cursor_created_at, cursor_id])
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        limit_clause = ""
+        if limit is not None:
+            limit_clause = "LIMIT %s"
+            params.append(int(limit))
+
+        # Single-table read: item_summary is written once at checkout
+        query = f"""
+        SELECT {ORDER_COLUMNS}
+        FROM orders o
+        {where}
+        ORDER BY o.created_at DESC, o.id DESC
+        {limit_clause}
+        """
+
+        with self.session() as (connection, db_cursor):
+            db_cursor.execute(query, params)
+            orders = db_cursor.fetchall()
+
+        return self._attach_lines(orders)
+
+    def _page(self, orders, page_size):
+        """Trim a page_size + 1 result to one page and work out the next keyset cursor"""
+        has_more = len(orders) > page_size
+        orders = orders[:page_size]
+        next_cursor = None
+        if has_more and orders:
+            next_cursor = (orders[-1]['created_at'], orders[-1]['id'])
+        return {'orders': orders, 'next_cursor': next_cursor}
+
+    def find_orders(self, status=None, customer_id=None, date_from=None, date_to=None,
+                    day=None, year=None, month=None, limit=None, cursor=None):
+        """Get orders matching any combination of filters, newest first.
+
+        All predicates are evaluated by the database:
+            status       - exact status (e.g. 'pending')
+            customer_id  - orders of one customer
+            date_from    - created at or after this date/datetime
+            date_to      - created before this date/datetime (exclusive)
+            day          - created on this calendar day
+            year, month  - created in this year, or this month of the year
+            limit        - maximum number of rows
+            cursor       - (created_at, id) keyset to continue after
+        """
         try:
-            if not self.connect():
-                return False, "Database connection failed"
-
-            query = """
-            SELECT o.*, 
-                   GROUP_CONCAT(CONCAT(oi.quantity, 'x ', oi.menu_item_name) SEPARATOR ', ') as item_summary
-            FROM orders o
-            LEFT JOIN order_items oi ON o.id = oi.order_id
-            WHERE o.customer_id = %s
-            GROUP BY o.id
-            ORDER BY o.created_at DESC
-            """
-            self.cursor.execute(query, (customer_id,))
-            orders = self.cursor.fetchall()
-
-            # Parse items JSON
-            for order in orders:
-                if 'items' in order and order['items']:
-                    try:
-                        order['items'] = json.loads(order['items'])
-                    except:
-                        order['items'] = []
-
-            self.disconnect()
-            return True, orders
+            conditions, params = self._order_filters(status, customer_id, date_from, date_to,
+                                                     day, year, month)
+            return True, self._list_orders(conditions, params, limit, cursor)
 
         except Error as e:
-            print(f"Error fetching customer orders: {e}")
-            self.disconnect()
+            print(f"Error fetching orders: {e}")
             return False, f"Failed to fetch orders: {str(e)}"
 
-    def get_all_orders(self, status=None):
-        """Get all orders (for admin) with optional status filter"""
-        try:
-            if not self.connect():
-                return False, "Database connection failed"
+    def find_orders_page(self, page_size=ORDER_PAGE_SIZE, cursor=None, **filters):
+        """Get one page of find_orders() results.
+
+        Returns {'orders': [...], 'next_cursor': keyset or None}; pass
+        next_cursor back in to fetch the following page.
+        """
+        success, orders = self.find_orders(limit=page_size + 1, cursor=cursor, **filters)
+        if not success:
+            return False, orders
+        return True, self._page(orders, page_size)
+
+    def get_popular_items(self, limit=10, status='completed', date_from=None, date_to=None,
+                          rank_by='total_quantity', include_others=False):
+        """Top-N menu items aggregated from order_items.
+
+        Groups order lines by menu_item_id (joined to menu_items for the
+        current name and category) over orders matching `status` and the
+        half-open [date_from, date_to) range. Items are ranked by `rank_by`
+        ('total_quantity', 'order_count' or 'total_revenue'). With
+        include_others=True everything past the top `limit` is folded into a
+        single 'Others' entry (its order_count counts order lines).
+        """
+        if rank_by not in ('total_quantity', 'order_count', 'total_revenue'):
+            return False, f"Cannot rank popular items by {rank_by}"
 
-            if status:
-                query = """
-                SELECT o.*, 
-                       GROUP_CONCAT(CONCAT(oi.quantity, 'x ', oi.menu_item_name) SEPARATOR ', ') as item_summary
-                FROM orders o
-                LEFT JOIN order_items oi ON o.id = oi.order_id
-                WHERE o.status = %s
-                GROUP BY o.id
-                ORDER BY o.created_at DESC
-                """
-                self.cursor.execute(query, (status,))
-            else:
-                query = """
-                SELECT o.*, 
-                       GROUP_CONCAT(CONCAT(oi.quantity, 'x ', oi.menu_item_name) SEPARATOR ', ') as item_summary
-                FROM orders o
-                LEFT JOIN order_items oi ON o.id = oi.order_id
-                GROUP BY o.id
-                ORDER BY o.created_at DESC
-                """
-                self.cursor.execute(query)
-
-            orders = self.cursor.fetchall()
-
-            # Parse items JSON
-            for order in orders:
-                if 'items' in order and order['items']:
-                    try:
-                        order['items'] = json.loads(order['items'])
-                    except:
-                        order['items'] = []
-
-            self.disconnect()
-            return True, orders
+        try:
+            conditions, params = self._order_filters(status=status, date_from=date_from, date_to=date_to)
+            where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+            query = f"""
+                SELECT oi.menu_item_id,
+                       COALESCE(m.name, MAX(oi.menu_item_name)) AS name,
+                       COALESCE(m.category, 'Unknown') AS category,
+                       COUNT(DISTINCT oi.order_id) AS order_count,
+                       SUM(oi.quantity) AS total_quantity,
+                       SUM(oi.total_price) AS total_revenue
+                FROM order_items oi
+                JOIN orders o ON o.id = oi.order_id
+                LEFT JOIN menu_items m ON m.id = oi.menu_item_id
+                {where}
+                GROUP BY oi.menu_item_id, m.name, m.category
+                ORDER BY {rank_by} DESC, oi.menu_item_id
+            """
+            # One row per menu item, so the result is bounded by the menu size
+            if not include_others:
+                query += " LIMIT %s"
+                params.append(limit)
+
+            with self.session() as (connection, cursor):
+                cursor.execute(query, params)
+                rows = cursor.fetchall()
+
+            items = []
+            for row in rows:
+                items.append({
+                    'menu_item_id': row['menu_item_id'],
+                    'name': row['name'],
+                    'category': row['category'],
+                    'order_count': int(row['order_count']),
+                    'total_quantity': int(row['total_quantity'] or 0),
+                    'total_revenue': float(row['total_revenue'] or 0)
+                })
+
+            if include_others and len(items) > limit:
+                rest = items[limit:]
+                items = items[:limit]
+                items.append({
+                    'menu_item_id': None,
+                    'name': 'Others',
+                    'category': 'Various',
+                    'order_count': sum(item['order_count'] for item in rest),
+                    'total_quantity': sum(item['total_quantity'] for item in rest),
+                    'total_revenue': sum(item['total_revenue'] for item in rest)
+                })
+
+            return True, items
 
         except Error as e:
-            print(f"Error fetching all orders: {e}")
-            self.disconnect()
-            return False, f"Failed to fetch orders: {str(e)}"
+            print(f"Error fetching popular items: {e}")
+            return False, f"Failed to fetch popular items: {str(e)}"
 
     def get_order_details(self, order_id):
         """Get detailed information for a specific order"""
         try:
-            if not self.connect():
-                return False, "Database connection failed"
-
-            # Get order info
-            order_query = "SELECT * FROM orders WHERE id = %s"
-            self.cursor.execute(order_query, (order_id,))
-            order = self.cursor.fetchone()
-
-            if not order:
-                self.disconnect()
-                return False, "Order not found"
-
-            # Get order items
-            items_query = "SELECT * FROM order_items WHERE order_id = %s"
-            self.cursor.execute(items_query, (order_id,))
-            items = self.cursor.fetchall()
-
-            # Parse items JSON if exists
-            if 'items' in order and order['items']:
-                try:
-                    order['items'] = json.loads(order['items'])
-                except:
-                    order['items'] = []
+            with self.session() as (connection, cursor):
+                # Get order info
+                order_query = f"SELECT {ORDER_COLUMNS} FROM orders o WHERE o.id = %s"
+                cursor.execute(order_query, (order_id,))
+                order = cursor.fetchone()
+
+                if not order:
+                    return False, "Order not found"
+
+                # Get order items
+                items_query = """
+                SELECT oi.*, m.image_url
+                FROM order_items oi
+                LEFT JOIN menu_items m ON m.id = oi.menu_item_id
+                WHERE oi.order_id = %s
+                ORDER BY oi.id
+                """
+                cursor.execute(items_query, (order_id,))
+                items = cursor.fetchall()
 
+            # The detail view gets its lines eagerly
             order['order_items'] = items
+            order['items'] = [self._line_from_row(item) for item in items]
 
-            self.disconnect()
             return True, order
 
         except Error as e:
             print(f"Error fetching order details: {e}")
-            self.disconnect()
             return False, f"Failed to fetch order details: {str(e)}"
 
     def update_order_status(self, order_id, status):
         """Update order status"""
         try:
-            if not self.connect():
-                return False, "Database connection failed"
-
-            query = "UPDATE orders SET status = %s WHERE id = %s"
-            self.cursor.execute(query, (status, order_id))
-            self.connection.commit()
-
-            # Get updated order
-            updated_query = "SELECT * FROM orders WHERE id = %s"
-            self.cursor.execute(updated_query, (order_id,))
-            updated_order = self.cursor.fetchone()
-
-            if updated_order and 'items' in updated_order and updated_order['items']:
-                try:
-                    updated_order['items'] = json.loads(updated_order['items'])
-                except:
-                    updated_order['items'] = []
-
-            self.disconnect()
+            with self.session() as (connection, cursor):
+                # Lock the row first so the rollup moves exactly one old status
+                cursor.execute("SELECT id FROM orders WHERE id = %s FOR UPDATE", (order_id,))
+                cursor.fetchall()
+
+                daily_sales.apply_order(cursor, order_id, -1)
+                query = "UPDATE orders SET status = %s WHERE id = %s"
+                cursor.execute(query, (status, order_id))
+                daily_sales.apply_order(cursor, order_id, 1)
+                connection.commit()
+                self.invalidate_stats()
+
+                # Get updated order
+                updated_query = f"SELECT {ORDER_COLUMNS} FROM orders o WHERE o.id = %s"
+                cursor.execute(updated_query, (order_id,))
+                updated_order = cursor.fetchone()
+
+            if updated_order:
+                self._attach_lines([updated_order])
             return True, updated_order
 
         except Error as e:
             print(f"Error updating order status: {e}")
-            if self.connection:
-                self.connection.rollback()
-            self.disconnect()
             return False, f"Failed to update order status: {str(e)}"
 
     def get_order_stats(self):
-        """Get order statistics"""
-        try:
-            if not self.connect():
-                return False, "Database connection failed"
-
-            stats = {}
-
-            # Total orders
-            self.cursor.execute("SELECT COUNT(*) as count FROM orders")
-            stats['total_orders'] = self.cursor.fetchone()['count']
-
-            # Total revenue
-            self.cursor.execute("SELECT COALESCE(SUM(total_amount), 0) as revenue FROM orders")
-            stats['total_revenue'] = self.cursor.fetchone()['revenue']
-
-            # Today's orders
-            self.cursor.execute("""
-                SELECT COUNT(*) as count 
-                FROM orders 
-                WHERE DATE(created_at) = CURDATE()
-            """)
-            stats['today_orders'] = self.cursor.fetchone()['count']
-
-            # Pending orders
-            self.cursor.execute("SELECT COUNT(*) as count FROM orders WHERE status = 'pending'")
-            stats['pending_orders'] = self.cursor.fetchone()['count']
-
-            # Orders by status
-            self.cursor.execute("""
-                SELECT status, COUNT(*) as count 
-                FROM orders 
-                GROUP BY status
-            """)
-            stats['status_counts'] = self.cursor.fetchall()
-
-            # Recent orders (last 7 days)
-            self.cursor.execute("""
-                SELECT DATE(created_at) as date, COUNT(*) as count, SUM(total_amount) as revenue
-                FROM orders 
-                WHERE created_at >= DATE_SUB(CURDATE(), INTERVAL 7 DAY)
-                GROUP BY DATE(created_at)
-                ORDER BY date
-            """)
-            stats['recent_days'] = self.cursor.fetchall()
+        """Get order statistics (always a fresh read, see get_stats_snapshot)"""
+        return self.get_stats_snapshot(max_age=0)
+
+    def get_stats_snapshot(self, max_age=STATS_CACHE_TTL):
+        """Get every Overview figure in one round trip.
+
+        A single SELECT reads totals, today's orders, pending count, the status
+        breakdown, the 7-day series and user counts, so all figures come from
+        the same consistent read. Order figures come from the daily_sales
+        rollup rather than a scan of every order. Snapshots younger than
+        `max_age` seconds are served from memory; order writes invalidate the cache.
+        """
+        with self._stats_lock:
+            cached = self._stats_cache
+        if cached and max_age and monotonic() - cached[0] < max_age:
+            return True, cached[1]
 
-            self.disconnect()
+        try:
+            today = date.today()
+            with self.session() as (connection, cursor):
+                cursor.execute("""
+                    SELECT t.total_orders, t.total_revenue, t.today_orders, t.pending_orders,
+                        (SELECT GROUP_CONCAT(CONCAT_WS('|', s.status, s.count) SEPARATOR ',')
+                         FROM (SELECT status, SUM(order_count) AS count
+                               FROM daily_sales
+                               GROUP BY status
+                               HAVING count > 0) s
+                        ) AS status_counts,
+                        (SELECT GROUP_CONCAT(CONCAT_WS('|', d.date, d.count, d.revenue)
+                                             ORDER BY d.date SEPARATOR ',')
+                         FROM (SELECT sales_date AS date, SUM(order_count) AS count,
+                                      SUM(revenue) AS revenue
+                               FROM daily_sales
+                               WHERE sales_date >= %s
+                               GROUP BY sales_date
+                               HAVING count > 0) d
+                        ) AS recent_days,
+                        (SELECT COUNT(*) FROM customers
+                         WHERE email NOT LIKE '%%@admin.com') AS customer_count,
+                        (SELECT COUNT(*) FROM staff
+                         WHERE LOWER(COALESCE(role, '')) <> 'admin'
+                           AND staff_email NOT LIKE '%%@admin.com') AS staff_count
+                    FROM (
+                        SELECT COALESCE(SUM(order_count), 0) AS total_orders,
+                               COALESCE(SUM(revenue), 0) AS total_revenue,
+                               COALESCE(SUM(CASE WHEN sales_date = %s THEN order_count END), 0) AS today_orders,
+                               COALESCE(SUM(CASE WHEN status = 'pending' THEN order_count END), 0) AS pending_orders
+                        FROM daily_sales
+                    ) t
+                """, (today - timedelta(days=7), today))
+                row = cursor.fetchone()
+
+            stats = {
+                'total_orders': int(row['total_orders']),
+                'total_revenue': row['total_revenue'],
+                'today_orders': int(row['today_orders']),
+                'pending_orders': int(row['pending_orders']),
+                'status_counts': [],
+                'recent_days': [],
+                'customer_count': int(row['customer_count']),
+                'staff_count': int(row['staff_count'])
+            }
+            stats['user_count'] = stats['customer_count'] + stats['staff_count']
+
+            for entry in (row['status_counts'] or '').split(','):
+                if entry:
+                    status, count = entry.rsplit('|', 1)
+                    stats['status_counts'].append({'status': status, 'count': int(count)})
+
+            for entry in (row['recent_days'] or '').split(','):
+                if entry:
+                    day, count, revenue = entry.split('|')
+                    stats['recent_days'].append({
+                        'date': date.fromisoformat(day),
+                        'count': int(count),
+                        'revenue': Decimal(revenue)
+                    })
+
+            with self._stats_lock:
+                self._stats_cache = (monotonic(), stats)
             return True, stats
 
         except Error as e:
             print(f"Error fetching order stats: {e}")
-            self.disconnect()
             return False, f"Failed to fetch order stats: {str(e)}"
 
-    def search_orders(self, search_term, search_by="order_number"):
-        """Search orders by various criteria"""
+    def invalidate_stats(self):
+        """Drop the cached stats snapshot (called after every order write)"""
+        with self._stats_lock:
+            self._stats_cache = None
+
+    @staticmethod
+    def _like_prefix(term):
+        """Escape LIKE wildcards in term and turn it into a prefix pattern"""
+        return term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+
+    def _search_plan(self, search_term, search_by=None):
+        """Pick an indexed lookup for a search term.
+
+        Returns (strategy, conditions, params, rank_sql, rank_params):
+            order_number   - digits match the order id or an order number prefix,
+                             anything else is an order number prefix (unique index);
+                             a missing dash after ORD is added
+            customer_email - email prefix (idx_orders_customer_email)
+            customer_name  - FULLTEXT match on the name, or a name prefix when
+                             every word is shorter than FULLTEXT_MIN_WORD
+        """
+        term = search_term.strip()
+        strategy = search_by
+        if strategy is None:
+            if term.isdigit() or ORDER_NUMBER_PATTERN.match(term):
+                strategy = 'order_number'
+            elif '@' in term:
+                strategy = 'customer_email'
+            else:
+                strategy = 'customer_name'
+
+        if strategy == 'order_number':
+            if term.isdigit():
+                return (strategy, ["(o.id = %s OR o.order_number LIKE %s)"],
+                        [int(term), self._like_prefix(f"ORD-{term}")], "(o.id = %s)", [int(term)])
+            number = term.upper()
+            if number.startswith('ORD') and not number.startswith('ORD-'):
+                # Every stored number has the dash; "ORD123" means "ORD-123"
+                number = f"ORD-{number[3:]}"
+            return (strategy, ["o.order_number LIKE %s"], [self._like_prefix(number)],
+                    "(o.order_number = %s)", [number])
+
+        if strategy == 'customer_email':
+            return (strategy, ["o.customer_email LIKE %s"], [self._like_prefix(term)],
+                    "(o.customer_email = %s)", [term])
+
+        if strategy == 'customer_name':
+            words = [word for word in re.findall(r'\w+', term) if len(word) >= FULLTEXT_MIN_WORD]
+            if words:
+                boolean_query = ' '.join(f"+{word}*" for word in words)
+                match = "MATCH(o.customer_name) AGAINST (%s IN BOOLEAN MODE)"
+                return strategy, [match], [boolean_query], match, [boolean_query]
+            return (strategy, ["o.customer_name LIKE %s"], [self._like_prefix(term)],
+                    "(o.customer_name = %s)", [term])
+
+        raise ValueError(f"Unknown search strategy: {strategy}")
+
+    def search_orders(self, search_term, search_by=None, limit=ORDER_PAGE_SIZE, cursor=None, **filters):
+        """Ranked, index-backed order search.
+
+        The lookup strategy is picked from the input (see _search_plan) unless
+        search_by forces one. Results are ranked best match first, then
+        newest first. `cursor` is the offset of the next result; extra filters
+        are the same as find_orders().
+        """
         try:
-            if not self.connect():
-                return False, "Database connection failed"
+            offset = int(cursor or 0)
+            limit = min(limit, max(SEARCH_MAX_RESULTS - offset, 0))
+            if not search_term or not search_term.strip() or limit <= 0:
+                return True, []
 
-            if search_by == "order_number":
-                query = """
-                SELECT o.*, 
-                       GROUP_CONCAT(CONCAT(oi.quantity, 'x ', oi.menu_item_name) SEPARATOR ', ') as item_summary
-                FROM orders o
-                LEFT JOIN order_items oi ON o.id = oi.order_id
-                WHERE o.order_number LIKE %s
-                GROUP BY o.id
-                ORDER BY o.created_at DESC
-                """
-                self.cursor.execute(query, (f"%{search_term}%",))
-            elif search_by == "customer_name":
-                query = """
-                SELECT o.*, 
-                       GROUP_CONCAT(CONCAT(oi.quantity, 'x ', oi.menu_item_name) SEPARATOR ', ') as item_summary
-                FROM orders o
-                LEFT JOIN order_items oi ON o.id = oi.order_id
-                WHERE o.customer_name LIKE %s
-                GROUP BY o.id
-                ORDER BY o.created_at DESC
-                """
-                self.cursor.execute(query, (f"%{search_term}%",))
-            elif search_by == "customer_email":
-                query = """
-                SELECT o.*, 
-                       GROUP_CONCAT(CONCAT(oi.quantity, 'x ', oi.menu_item_name) SEPARATOR ', ') as item_summary
-                FROM orders o
-                LEFT JOIN order_items oi ON o.id = oi.order_id
-                WHERE o.customer_email LIKE %s
-                GROUP BY o.id
-                ORDER BY o.created_at DESC
-                """
-                self.cursor.execute(query, (f"%{search_term}%",))
-            else:
-                query = """
-                SELECT o.*, 
-                       GROUP_CONCAT(CONCAT(oi.quantity, 'x ', oi.menu_item_name) SEPARATOR ', ') as item_summary
-                FROM orders o
-                LEFT JOIN order_items oi ON o.id = oi.order_id
-                WHERE o.order_number LIKE %s OR o.customer_name LIKE %s OR o.customer_email LIKE %s
-                GROUP BY o.id
-                ORDER BY o.created_at DESC
-                """
-                self.cursor.execute(query, (f"%{search_term}%", f"%{search_term}%", f"%{search_term}%"))
+            strategy, conditions, params, rank_sql, rank_params = self._search_plan(search_term, search_by)
+            filter_conditions, filter_params = self._order_filters(**filters)
 
-            orders = self.cursor.fetchall()
+            query = f"""
+            SELECT {ORDER_COLUMNS}, {rank_sql} AS search_rank
+            FROM orders o
+            WHERE {' AND '.join(conditions + filter_conditions)}
+            ORDER BY search_rank DESC, o.created_at DESC, o.id DESC
+            LIMIT %s OFFSET %s
+            """
 
-            # Parse items JSON
-            for order in orders:
-                if 'items' in order and order['items']:
-                    try:
-                        order['items'] = json.loads(order['items'])
-                    except:
-                        order['items'] = []
+            with self.session() as (connection, db_cursor):
+                db_cursor.execute(query, rank_params + params + filter_params + [limit, offset])
+                orders = db_cursor.fetchall()
 
-            self.disconnect()
-            return True, orders
+            return True, self._attach_lines(orders)
 
-        except Error as e:
+        except (Error, ValueError) as e:
             print(f"Error searching orders: {e}")
-            self.disconnect()
             return False, f"Failed to search orders: {str(e)}"
 
-    def get_todays_revenue(self):
-        """Get today's total revenue"""
+    def search_orders_page(self, search_term, search_by=None, page_size=ORDER_PAGE_SIZE, cursor=None, **filters):
+        """Get one page of search_orders() results.
+
+        Returns {'orders': [...], 'next_cursor': offset or None}.
+        """
+        offset = int(cursor or 0)
+        success, orders = self.search_orders(search_term, search_by, limit=page_size + 1,
+                                             cursor=offset, **filters)
+        if not success:
+            return False, orders
+
+        has_more = len(orders) > page_size and offset + page_size < SEARCH_MAX_RESULTS
+        return True, {
+            'orders': orders[:page_size],
+            'next_cursor': offset + page_size if has_more else None
+        }
+
+    def get_feed_watermark(self):
+        """(server time, highest order id) to start an order change feed from"""
+        try:
+            with self.session() as (connection, cursor):
+                cursor.execute("SELECT NOW() AS updated_at, COALESCE(MAX(id), 0) AS id FROM orders")
+                row = cursor.fetchone()
+            return True, (row['updated_at'], row['id'])
+
+        except Error as e:
+            print(f"Error reading order feed watermark: {e}")
+            return False, f"Failed to read order feed watermark: {str(e)}"
+
+    def find_order_changes(self, since, **filters):
+        """Orders inserted or updated since a feed watermark, oldest change first.
+
+        `since` is the (updated_at, id) watermark from get_feed_watermark() or
+        a previous call; `filters` are the find_orders() filters. Rows changed
+        within ORDER_FEED_OVERLAP before the watermark are returned again, so
+        callers must merge idempotently. Returns {'orders': [...], 'watermark': next}.
+        """
+        since_updated_at, since_id = since
         try:
-            if not self.connect():
-                return False, "Database connection failed"
+            conditions, params = self._order_filters(**filters)
+            # Both sides are index range reads (idx_orders_updated, PRIMARY)
+            conditions.append("(o.updated_at >= %s OR o.id > %s)")
+            params.extend([since_updated_at - ORDER_FEED_OVERLAP, since_id])
 
-            query = """
-            SELECT COALESCE(SUM(total_amount), 0) as revenue 
-            FROM orders 
-            WHERE DATE(created_at) = CURDATE()
+            query = f"""
+            SELECT {ORDER_COLUMNS}
+            FROM orders o
+            WHERE {' AND '.join(conditions)}
+            ORDER BY o.updated_at, o.id
             """
-            self.cursor.execute(query)
-            result = self.cursor.fetchone()
+            with self.session() as (connection, cursor):
+                cursor.execute(query, params)
+                orders = cursor.fetchall()
+
+            watermark = (max([since_updated_at] + [order['updated_at'] for order in orders]),
+                         max([since_id] + [order['id'] for order in orders]))
+            return True, {'orders': self._attach_lines(orders), 'watermark': watermark}
+
+        except Error as e:
+            print(f"Error fetching order changes: {e}")
+            return False, f"Failed to fetch order changes: {str(e)}"
+
+    def get_todays_revenue(self):
+        """Get today's total revenue"""
+        try:
+            with self.session() as (connection, cursor):
+                query = """
+                SELECT COALESCE(SUM(revenue), 0) as revenue
+                FROM daily_sales
+                WHERE sales_date = %s
+                """
+                cursor.execute(query, (date.today(),))
+                result = cursor.fetchone()
 
-            self.disconnect()
             return True, result['revenue'] if result else 0
 
         except Error as e:
             print(f"Error fetching today's revenue: {e}")
-            self.disconnect()
             return False, f"Failed to fetch revenue: {str(e)}"
 
     def delete_order(self, order_id):
         """Delete an order (admin only)"""
         try:
-            if not self.connect():
-                return False, "Database connection failed"
+            with self.session() as (connection, cursor):
+                # Get order number before deletion for confirmation
+                cursor.execute("SELECT order_number FROM orders WHERE id = %s", (order_id,))
+                order = cursor.fetchone()
 
-            # Get order number before deletion for confirmation
-            self.cursor.execute("SELECT order_number FROM orders WHERE id = %s", (order_id,))
-            order = self.cursor.fetchone()
+                if not order:
+                    return False, "Order not found"
 
-            if not order:
-                self.disconnect()
-                return False, "Order not found"
+                # Delete order (cascade will delete order_items)
+                daily_sales.apply_order(cursor, order_id, -1)
+                delete_query = "DELETE FROM orders WHERE id = %s"
+                cursor.execute(delete_query, (order_id,))
+                connection.commit()
+                self.invalidate_stats()
 
-            # Delete order (cascade will delete order_items)
-            delete_query = "DELETE FROM orders WHERE id = %s"
-            self.cursor.execute(delete_query, (order_id,))
-            self.connection.commit()
-
-            self.disconnect()
             return True, f"Order {order['order_number']} deleted successfully"
 
         except Error as e:
             print(f"Error deleting order: {e}")
-            if self.connection:
-                self.connection.rollback()
-            self.disconnect()
             return False, f"Failed to delete order: {str(e)}"
 
 
@@ -7,7 +7,7 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from PyQt6.QtWidgets import QApplication, QMainWindow, QStackedWidget, QVBoxLayout, QWidget
+from PyQt6.QtWidgets import QApplication, QMainWindow, QMessageBox, QStackedWidget, QVBoxLayout, QWidget
 
 # Import from packages
 from views.home_view import HomeView
@@ -20,6 +20,9 @@ from controllers.staff_dashboard_controller import StaffDashboardController
 
 # Import the admin dashboard components directly
 from controllers.admin_dashboard_controller import AdminDashboardController
+from db.activity_writer import activity_writer
+from db.connection import db_pool
+from db.migrations import run_migrations
 
 
 class MainApplication(QMainWindow):
@@ -245,6 +248,18 @@ class MainApplication(QMainWindow):
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
+    # Flush queued activity logs before the pool closes
+    app.aboutToQuit.connect(activity_writer.shutdown)
+    app.aboutToQuit.connect(db_pool.close_all)
+    # Destructive migrations are left to `python -m db.migrations`; a failed
+    # upgrade aborts startup instead of running against a half-migrated schema
+    success, result = run_migrations(include_destructive=False, lock_timeout=10)
+    if not success:
+        QMessageBox.critical(
+            None, "Database Upgrade Failed",
+            f"{result}\n\nRun `python -m db.migrations` and start Food Dash again."
+        )
+        sys.exit(1)
     window = MainApplication()
     window.show()
     sys.exit(app.exec())
\ No newline at end of file
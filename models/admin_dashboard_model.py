@@ -5,8 +5,11 @@ from datetime import datetime, timedelta, date
 import calendar
 
 # Database imports
+from db.activity_archive import activity_archive, ACTIVITY_RETENTION_DAYS
 from db.activity_db import activity_db
-from db.orders_db import orders_db_instance as orders_db
+from db.async_db import async_db
+from db.daily_sales import daily_sales
+from db.orders_db import orders_db_instance as orders_db, STATS_CACHE_TTL
 from db.menu_db import menu_db
 from db.staff_db import staff_db
 from db.customer_db import customer_db
@@ -42,22 +45,23 @@ class AdminDashboardModel:
         self.load_users_from_db()
         self.load_analytics_data()
 
+    @staticmethod
+    def _menu_items_from_rows(menu_items_data):
+        """Convert database format to our app format"""
+        return [{
+            "id": item['id'],  # Store database ID
+            "title": item['name'],
+            "description": item['description'],
+            "category": item['category'],
+            "price": str(item['price']),  # Convert to string
+            "image": item['image_url']
+        } for item in menu_items_data]
+
     def load_menu_items_from_db(self):
         """Load menu items from database"""
         try:
-            menu_items_data = menu_db.get_all_menu_items()
-
-            # Convert database format to our app format
-            self.menu_items = []
-            for item in menu_items_data:
-                self.menu_items.append({
-                    "id": item['id'],  # Store database ID
-                    "title": item['name'],
-                    "description": item['description'],
-                    "category": item['category'],
-                    "price": str(item['price']),  # Convert to string
-                    "image": item['image_url']
-                })
+            # Converted once per menu catalog version, shared across loads
+            self.menu_items = menu_db.get_catalog_view('admin_menu', self._menu_items_from_rows)
 
             return self.menu_items
 
@@ -108,20 +112,46 @@ class AdminDashboardModel:
             ]
             return self.menu_items
 
-    def load_analytics_data(self):
-        """Load analytics data from database"""
+    def load_analytics_data(self, max_age=STATS_CACHE_TTL):
+        """Load analytics data from database (one round trip, cached for max_age seconds)"""
         try:
-            # Use the get_order_stats method from orders_db
-            success, stats = orders_db.get_order_stats()
-            if success:
-                self.order_stats = stats
-            else:
-                self.order_stats = {}
-                print(f"Error loading analytics: {stats}")
+            self.set_analytics(*orders_db.get_stats_snapshot(max_age=max_age))
         except Exception as e:
             print(f"Error loading analytics data: {e}")
             self.order_stats = {}
 
+    def set_analytics(self, success, stats):
+        """Store a get_stats_snapshot() result"""
+        if success:
+            self.order_stats = stats
+            self.active_user_count = stats.get('user_count', self.active_user_count)
+        else:
+            self.order_stats = {}
+            print(f"Error loading analytics: {stats}")
+
+    async def fetch_analytics_async(self):
+        """Fresh stats snapshot, stored on the model (Overview cards)"""
+        success, stats = await async_db.orders.stats(max_age=0)
+        self.set_analytics(success, stats)
+        if not success:
+            raise RuntimeError(stats)
+        return stats
+
+    async def fetch_yearly_revenue_async(self, years):
+        """{year: [12 monthly totals]} for the revenue graph, every year in one rollup query"""
+        success, by_month = await async_db.sales.monthly_revenue(date(min(years), 1, 1),
+                                                                 date(max(years) + 1, 1, 1))
+        if not success:
+            raise RuntimeError(by_month)
+        return {year: [by_month.get((year, month), 0.0) for month in range(1, 13)] for year in years}
+
+    async def fetch_popular_items_async(self):
+        """Top items with the rest folded into 'Others' (pie chart)"""
+        success, items = await async_db.orders.popular_items(limit=10, include_others=True)
+        if not success:
+            raise RuntimeError(items)
+        return items
+
     def get_total_revenue_from_db(self):
         """Calculate total revenue from all completed orders"""
         try:
@@ -130,14 +160,9 @@ class AdminDashboardModel:
                 revenue = float(self.order_stats.get('total_revenue', 0))
                 return revenue
 
-            # Fallback to manual calculation
-            total_revenue = 0
-            success, orders = orders_db.get_all_orders()
-            if success:
-                for order in orders:
-                    if order.get('status', '').lower() == 'completed':
-                        total_revenue += float(order.get('total_amount', 0))
-            return total_revenue
+            # Fallback to the daily sales rollup (a few hundred rows, not every order)
+            success, total_revenue = daily_sales.get_total_revenue()
+            return total_revenue if success else 0
         except Exception as e:
             print(f"Error getting total revenue: {e}")
             return 0
@@ -168,6 +193,12 @@ class AdminDashboardModel:
             print(f"Error counting pending orders: {e}")
             return 0
 
+    def get_active_user_count(self):
+        """Get count of non-admin users from the stats snapshot"""
+        if self.order_stats and 'user_count' in self.order_stats:
+            return int(self.order_stats['user_count'])
+        return self.active_user_count
+
     def load_users_from_db(self):
         """Load all users from database (customers and staff) - EXCLUDING ADMINS"""
         try:
@@ -176,72 +207,7 @@ class AdminDashboardModel:
             # Get all staff
             staff_list = staff_db.get_all_staff()
 
-            # Combine and format users (excluding admins)
-            self.all_users = []
-
-            # Add customers (excluding admins)
-            for customer in customers:
-                # Check if user is admin (adjust based on your database schema)
-                is_admin = False
-                # Check various ways admin might be identified
-                if customer.get('role', '').lower() == 'admin':
-                    is_admin = True
-                elif customer.get('user_type', '').lower() == 'admin':
-                    is_admin = True
-                elif customer.get('email', '').lower().endswith('@admin.com'):
-                    is_admin = True
-
-                if not is_admin:
-                    self.all_users.append({
-                        "id": customer['id'],
-                        "user_id": f"CUST{customer['id']:05d}",
-                        "name": customer['full_name'],
-                        "email": customer['email'],
-                        "phone": customer.get('phone', ''),
-                        "address": customer.get('address', ''),
-                        "role": "Customer",  # First letter capitalized
-                        "created_at": customer.get('created_at', ''),
-                        "type": "customer"
-                    })
-
-            # Add staff (excluding admins)
-            for staff in staff_list:
-                # Check if staff is admin
-                is_admin = False
-                if staff.get('role', '').lower() == 'admin':
-                    is_admin = True
-                elif staff.get('staff_role', '').lower() == 'admin':
-                    is_admin = True
-                elif staff.get('staff_email', '').lower().endswith('@admin.com'):
-                    is_admin = True
-
-                if not is_admin:
-                    # Get role from database, default to "Staff" with capital S
-                    role_from_db = staff.get('role', 'Staff')
-                    # Ensure first letter is capitalized
-                    if role_from_db:
-                        role = role_from_db[0].upper() + role_from_db[1:].lower() if role_from_db else "Staff"
-                    else:
-                        role = "Staff"
-
-                    self.all_users.append({
-                        "id": staff['id'],
-                        "user_id": staff.get('staff_id', f"EMP{staff['id']:05d}"),
-                        "name": staff['staff_name'],
-                        "email": staff['staff_email'],
-                        "phone": staff.get('staff_phone', ''),
-                        "address": staff.get('staff_address', ''),
-                        "role": role,  # First letter capitalized
-                        "created_at": staff.get('created_at', ''),
-                        "type": "staff"
-                    })
-
-            # Sort by ID
-            self.all_users.sort(key=lambda x: x['id'])
-
-            # Update active user count (excluding admins)
-            self.active_user_count = len(self.all_users)
-
+            self.set_users_from_rows(customers, staff_list)
             return True
 
         except Exception as e:
@@ -294,27 +260,94 @@ class AdminDashboardModel:
             self.active_user_count = len(self.all_users)
             return False
 
-    def get_all_orders(self):
-        """Get all orders from database"""
+    def set_users_from_rows(self, customers, staff_list):
+        """Combine and format customer and staff rows into all_users (excluding admins)"""
+        self.all_users = []
+
+        # Add customers (excluding admins)
+        for customer in customers:
+            # Check if user is admin (adjust based on your database schema)
+            is_admin = False
+            # Check various ways admin might be identified
+            if customer.get('role', '').lower() == 'admin':
+                is_admin = True
+            elif customer.get('user_type', '').lower() == 'admin':
+                is_admin = True
+            elif customer.get('email', '').lower().endswith('@admin.com'):
+                is_admin = True
+
+            if not is_admin:
+                self.all_users.append({
+                    "id": customer['id'],
+                    "user_id": f"CUST{customer['id']:05d}",
+                    "name": customer['full_name'],
+                    "email": customer['email'],
+                    "phone": customer.get('phone', ''),
+                    "address": customer.get('address', ''),
+                    "role": "Customer",  # First letter capitalized
+                    "created_at": customer.get('created_at', ''),
+                    "type": "customer"
+                })
+
+        # Add staff (excluding admins)
+        for staff in staff_list:
+            # Check if staff is admin
+            is_admin = False
+            if staff.get('role', '').lower() == 'admin':
+                is_admin = True
+            elif staff.get('staff_role', '').lower() == 'admin':
+                is_admin = True
+            elif staff.get('staff_email', '').lower().endswith('@admin.com'):
+                is_admin = True
+
+            if not is_admin:
+                # Get role from database, default to "Staff" with capital S
+                role_from_db = staff.get('role', 'Staff')
+                # Ensure first letter is capitalized
+                if role_from_db:
+                    role = role_from_db[0].upper() + role_from_db[1:].lower() if role_from_db else "Staff"
+                else:
+                    role = "Staff"
+
+                self.all_users.append({
+                    "id": staff['id'],
+                    "user_id": staff.get('staff_id', f"EMP{staff['id']:05d}"),
+                    "name": staff['staff_name'],
+                    "email": staff['staff_email'],
+                    "phone": staff.get('staff_phone', ''),
+                    "address": staff.get('staff_address', ''),
+                    "role": role,  # First letter capitalized
+                    "created_at": staff.get('created_at', ''),
+                    "type": "staff"
+                })
+
+        # Sort by ID
+        self.all_users.sort(key=lambda x: x['id'])
+
+        # Update active user count (excluding admins)
+        self.active_user_count = len(self.all_users)
+
+    def find_orders_page(self, cursor=None, **filters):
+        """Get one page of filtered orders as (orders, next_cursor)"""
         try:
-            success, orders = orders_db.get_all_orders()
+            success, page = orders_db.find_orders_page(cursor=cursor, **filters)
             if success:
-                return orders
-            return []
+                return page['orders'], page['next_cursor']
+            return [], None
         except Exception as e:
-            print(f"Error getting orders: {e}")
-            return []
+            print(f"Error loading orders page: {e}")
+            return [], None
 
-    def search_orders(self, search_term):
-        """Search orders in database"""
+    def search_orders_page(self, search_term, cursor=None):
+        """Get one page of search results as (orders, next_cursor)"""
         try:
-            success, orders = orders_db.search_orders(search_term)
+            success, page = orders_db.search_orders_page(search_term, cursor=cursor)
             if success:
-                return orders
-            return []
+                return page['orders'], page['next_cursor']
+            return [], None
         except Exception as e:
-            print(f"Error searching orders: {e}")
-            return []
+            print(f"Error searching orders page: {e}")
+            return [], None
 
     def update_order_status(self, order_id, new_status):
         """Update order status in database"""
@@ -340,6 +373,42 @@ class AdminDashboardModel:
             print(f"Error searching activities: {e}")
             return False, str(e)
 
+    def find_activities_page(self, cursor=None, **filters):
+        """Get one page of filtered activities as (activities, next_cursor)"""
+        try:
+            success, page = activity_db.find_activities_page(cursor=cursor, **filters)
+            if success:
+                return page['activities'], page['next_cursor']
+            return [], None
+        except Exception as e:
+            print(f"Error loading activities page: {e}")
+            return [], None
+
+    def count_activities(self, **filters):
+        """Count activities matching the filters (0 on error)"""
+        try:
+            success, count = activity_db.count_activities(**filters)
+            return count if success else 0
+        except Exception as e:
+            print(f"Error counting activities: {e}")
+            return 0
+
+    def find_archived_activities(self, search=None, limit=500):
+        """Search the compressed activity archive, newest first"""
+        try:
+            return activity_archive.find_activities(search=search, limit=limit)
+        except Exception as e:
+            print(f"Error reading archived activities: {e}")
+            return False, str(e)
+
+    def archive_old_activities(self, days=ACTIVITY_RETENTION_DAYS):
+        """Move activity logs older than `days` days into the archive"""
+        try:
+            return activity_archive.archive_older_than(days)
+        except Exception as e:
+            print(f"Error archiving activities: {e}")
+            return False, str(e)
+
     def clear_all_activities(self):
         """Clear all activity logs"""
         try:
@@ -22,16 +22,8 @@ class CustomerMenuModel:
 
     def load_menu_items_from_db(self):
         try:
-            menu_items_data = menu_db.get_all_menu_items()
-            self.menu_items = []
-            for item in menu_items_data:
-                self.menu_items.append({
-                    "img": item['image_url'],
-                    "title": item['name'],
-                    "subtitle": item['description'],
-                    "price": f"₱{item['price']}",
-                    "category": self.standardize_category(item['category'])
-                })
+            # Cards are rebuilt only when the shared menu catalog changes
+            self.menu_items = menu_db.get_catalog_view('customer_menu', self._menu_cards)
 
             if not self.menu_items:
                 self.menu_items = self.get_fallback_menu_items()
@@ -41,6 +33,25 @@ class CustomerMenuModel:
             self.menu_items = self.get_fallback_menu_items()
             return self.menu_items
 
+    def load_menu_items_from_snapshot(self):
+        """Menu cards from the last good catalog (memory or local snapshot), without the database"""
+        self.menu_items = menu_db.get_catalog_view('customer_menu', self._menu_cards, offline=True)
+        return self.menu_items
+
+    def fetch_menu_items(self):
+        """Menu cards from the database; safe to call off the UI thread (model state is untouched)"""
+        return menu_db.get_catalog_view('customer_menu', self._menu_cards)
+
+    def _menu_cards(self, menu_items_data):
+        """Convert menu_items rows to the card format used by the menu view"""
+        return [{
+            "img": item['image_url'],
+            "title": item['name'],
+            "subtitle": item['description'],
+            "price": f"₱{item['price']}",
+            "category": self.standardize_category(item['category'])
+        } for item in menu_items_data]
+
     def standardize_category(self, db_category):
         """Standardize category names - identical to original"""
         if not db_category:
@@ -277,14 +288,13 @@ class CustomerMenuModel:
 
         return receipt_content
 
-    def load_orders_from_db(self, customer_info):
-        """Load customer orders from database"""
+    def load_orders_page(self, customer_info, cursor=None):
+        """Load one page of customer orders as {'orders', 'next_cursor'}"""
         if not customer_info or 'id' not in customer_info:
             return False, "Customer info missing"
 
         try:
-            success, orders = orders_db.get_customer_orders(customer_info['id'])
-            return success, orders
+            return orders_db.find_orders_page(cursor=cursor, customer_id=customer_info['id'])
         except Exception as e:
             print(f"Error loading orders: {e}")
             return False, str(e)
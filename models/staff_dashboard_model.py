@@ -38,27 +38,26 @@ class StaffDashboardModel:
     def load_menu_items(self):
         """Load menu items from database"""
         try:
-            menu_items_data = menu_db.get_all_menu_items()
-
-            # Convert database format to app format
-            menu_items = []
-            for item in menu_items_data:
-                menu_items.append({
-                    "id": item['id'],
-                    "title": item['name'],
-                    "description": item['description'],
-                    "category": item['category'],
-                    "price": str(item['price']),
-                    "image": item['image_url']
-                })
-
-            return menu_items
+            # Converted once per menu catalog version, shared across loads
+            return menu_db.get_catalog_view('staff_menu', self._menu_items_from_rows)
 
         except Exception as e:
             print(f"Error loading menu items from database: {e}")
             # Return sample data if database fails
             return self._get_sample_menu_items()
 
+    @staticmethod
+    def _menu_items_from_rows(menu_items_data):
+        """Convert database format to app format"""
+        return [{
+            "id": item['id'],
+            "title": item['name'],
+            "description": item['description'],
+            "category": item['category'],
+            "price": str(item['price']),
+            "image": item['image_url']
+        } for item in menu_items_data]
+
     def _get_sample_menu_items(self):
         """Return sample menu items for fallback"""
         return [
@@ -142,60 +141,62 @@ class StaffDashboardModel:
         success, message = menu_db.delete_menu_item(item_id)
         return success, message
 
-    def load_todays_orders(self):
-        """Load today's orders from database"""
+    def load_todays_orders_page(self, status=None, cursor=None):
+        """Load one page of today's orders as (orders, next_cursor)"""
         try:
-            # Get today's date
-            today = datetime.date.today()
+            success, page = orders_db.find_orders_page(
+                cursor=cursor,
+                status=status.lower() if status else None,
+                day=datetime.date.today()
+            )
+
+            if not success:
+                return [], None
+
+            return page['orders'], page['next_cursor']
+
+        except Exception as e:
+            print(f"Error loading orders: {e}")
+            return [], None
 
-            # Get orders from database
-            success, orders = orders_db.get_all_orders()
+    def search_todays_orders_page(self, search_term, status=None, cursor=None):
+        """Search today's orders as (orders, next_cursor), best match first"""
+        try:
+            success, page = orders_db.search_orders_page(
+                search_term,
+                cursor=cursor,
+                status=status.lower() if status else None,
+                day=datetime.date.today()
+            )
 
-            if not success or not orders:
-                return []
+            if not success:
+                return [], None
 
-            # Filter orders to show only today's orders
-            today_orders = []
-            for order in orders:
-                order_date = order.get('created_at', '')
+            return page['orders'], page['next_cursor']
 
-                # Handle different date formats
-                if isinstance(order_date, str):
-                    if ' ' in order_date:
-                        date_part = order_date.split(' ')[0]
-                    else:
-                        date_part = order_date
+        except Exception as e:
+            print(f"Error searching orders: {e}")
+            return [], None
 
-                    try:
-                        order_date_obj = datetime.datetime.strptime(date_part, '%Y-%m-%d').date()
-                        if order_date_obj == today:
-                            today_orders.append(order)
-                    except ValueError:
-                        pass
+    def get_feed_watermark(self):
+        """Starting point of the live order feed (None if the database is unreachable)"""
+        success, watermark = orders_db.get_feed_watermark()
+        return watermark if success else None
 
-                elif hasattr(order_date, 'date'):
-                    if order_date.date() == today:
-                        today_orders.append(order)
+    def load_todays_order_changes(self, since):
+        """Today's orders inserted or updated since a watermark as (orders, next watermark)"""
+        try:
+            success, changes = orders_db.find_order_changes(since, day=datetime.date.today())
 
-                elif isinstance(order_date, datetime.date):
-                    if order_date == today:
-                        today_orders.append(order)
+            if not success:
+                return [], since
 
-            return today_orders
+            return changes['orders'], changes['watermark']
 
         except Exception as e:
-            print(f"Error loading orders: {e}")
-            return []
+            print(f"Error loading order changes: {e}")
+            return [], since
 
     def update_order_status(self, order_id, new_status):
         """Update order status in database"""
-        return orders_db.update_order_status(order_id, new_status)
-
-    def get_order_by_id(self, order_id):
-        """Get order by ID"""
-        success, orders = orders_db.get_all_orders()
-        if success:
-            for order in orders:
-                if order.get('id') == order_id:
-                    return order
-        return None
\ No newline at end of file
+        return orders_db.update_order_status(order_id, new_status)
\ No newline at end of file
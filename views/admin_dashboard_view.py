@@ -18,12 +18,15 @@ from controllers.widgets import (
     EditUserDialog,
     AnalyticsCard
 )
+from .widgets.order_list import OrderListView
 
 
 class AdminDashboardView(QWidget):
     """View for Admin Dashboard - Handles all UI components"""
 
     logout_requested = pyqtSignal()
+    orders_scrolled_to_end = pyqtSignal()
+    activities_scrolled_to_end = pyqtSignal()
 
     def __init__(self):
         super().__init__()
@@ -65,9 +68,15 @@ class AdminDashboardView(QWidget):
         self.pages = None
         self.orders_layout = None
         self.orders_content = None
-        self.scroll = None
+        self.order_list = None
         self.user_card_layout = None
 
+        # Orders on the Orders page (OrderListModel of order_list)
+        self.order_model = None
+        self.orders_header = None
+        self._order_cards_shown = False
+        self._update_status_callback = None
+
         # Button references (for controller access)
         self.order_search_btn = None
         self.order_today_btn = None
@@ -79,6 +88,7 @@ class AdminDashboardView(QWidget):
         self.activity_search_btn = None
         self.activity_today_btn = None
         self.activity_clear_btn = None
+        self.activity_archive_btn = None
         self.activity_refresh_btn = None
 
         self.setup_ui()
@@ -528,44 +538,19 @@ class AdminDashboardView(QWidget):
 
         outer.addLayout(search_layout)
 
-        # ==== Scroll Area ====
-        self.scroll = QScrollArea()
-        self.scroll.setWidgetResizable(True)
-        self.scroll.setStyleSheet("""
-            QScrollArea {
-                border: none;
-                background: transparent;
-            }
-            QScrollBar:vertical {
-                background: #f0f0f0;
-                width: 8px;
-                border-radius: 4px;
-                border: none;
-            }
-            QScrollBar::handle:vertical {
-                background: #c0c0c0;
-                border-radius: 4px;
-                min-height: 25px;
-            }
-            QScrollBar::handle:vertical:hover {
-                background: #a0a0a0;
-            }
-            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
-                border: none;
-                background: none;
-                height: 0px;
-            }
-            QScrollBar::add-page:vertical, QScrollBar::sub-page:vertical {
-                background: none;
-            }
-        """)
-
+        # ==== Header / messages above the list ====
         self.orders_content = QWidget()
         self.orders_layout = QVBoxLayout(self.orders_content)
+        self.orders_layout.setContentsMargins(0, 0, 0, 0)
         self.orders_layout.setSpacing(18)
+        outer.addWidget(self.orders_content)
 
-        self.scroll.setWidget(self.orders_content)
-        outer.addWidget(self.scroll)
+        # ==== Order list (cards painted by a delegate) ====
+        self.order_list = OrderListView("#5b7bff")
+        self.order_model = self.order_list.order_model
+        self.order_list.status_clicked.connect(self._on_order_status_clicked)
+        self.order_list.verticalScrollBar().valueChanged.connect(self._on_orders_scrolled)
+        outer.addWidget(self.order_list, 1)
 
         return container
 
@@ -972,7 +957,7 @@ class AdminDashboardView(QWidget):
 
         # PERIOD FILTER COMBOBOX - MATCHING ORDER TRACKING DESIGN
         self.period_filter_combo = QComboBox()
-        self.period_filter_combo.addItems(["All Time", "Last 3 Days", "Last 7 Days", "Last 30 Days"])
+        self.period_filter_combo.addItems(["All Time", "Last 3 Days", "Last 7 Days", "Last 30 Days", "Archived"])
         self.period_filter_combo.setFixedHeight(40)
         self.period_filter_combo.setStyleSheet("""
             QComboBox {
@@ -998,11 +983,29 @@ class AdminDashboardView(QWidget):
             QPushButton:hover { background: #b91c1c; }
         """)
 
+        # Store Archive old logs button as attribute
+        self.activity_archive_btn = QPushButton("Archive Old Logs")
+        self.activity_archive_btn.setFixedSize(150, 40)
+        self.activity_archive_btn.setStyleSheet("""
+            QPushButton {
+                background: #f3f4f6;
+                color: #374151;
+                border: 1px solid #d1d5db;
+                border-radius: 8px;
+                font-weight: bold;
+            }
+            QPushButton:hover { 
+                background: #e5e7eb;
+                border: 1px solid #9ca3af;
+            }
+        """)
+
         controls_layout.addWidget(self.activity_search_input)
         controls_layout.addWidget(self.activity_search_btn)
         controls_layout.addWidget(self.activity_today_btn)
         controls_layout.addWidget(self.period_filter_combo)
         controls_layout.addStretch()
+        controls_layout.addWidget(self.activity_archive_btn)
         controls_layout.addWidget(self.activity_clear_btn)
 
         outer.addLayout(controls_layout)
@@ -1101,6 +1104,7 @@ class AdminDashboardView(QWidget):
             }
         """)
 
+        self.activity_table.verticalScrollBar().valueChanged.connect(self._on_activities_scrolled)
         table_layout.addWidget(self.activity_table)
 
         # Set the table container as the scroll area's widget
@@ -1176,202 +1180,73 @@ class AdminDashboardView(QWidget):
                 }
             """)
 
-    def build_order_card(self, order_data, update_status_callback):
-        """Build order card from database data"""
-        card = QFrame()
-        card.order_id = str(order_data.get('id', ''))
-        card.setStyleSheet("""
-            QFrame {
-                background: white;
-                border-radius: 20px;
-            }
-        """)
-        card_layout = QVBoxLayout(card)
-        card_layout.setContentsMargins(25, 25, 25, 25)
-        card_layout.setSpacing(16)
-
-        # TOP ROW: ORDER ID + STATUS
-        top = QHBoxLayout()
-
-        order_id = QLabel(f"Order #{order_data.get('order_number', 'N/A')}")
-        order_id.setFont(QFont("Arial", 17, QFont.Weight.Bold))
-        order_id.setStyleSheet("color: black;")
-
-        # Customer info
-        customer_info = QLabel(f"{order_data.get('customer_name', 'N/A')} • {order_data.get('customer_email', 'N/A')}")
-        customer_info.setFont(QFont("Arial", 12))
-        customer_info.setStyleSheet("color: #666;")
-
-        top.addWidget(order_id)
-        top.addWidget(customer_info)
-        top.addStretch()
-
-        # Status selector
-        status_layout = QHBoxLayout()
-        status_layout.setSpacing(8)
-
-        statuses = ["Pending", "Preparing", "Delivering", "Completed"]
-        current_status = order_data.get('status', 'Pending').capitalize()
-
-        for status in statuses:
-            btn = QPushButton(status)
-            btn.setFixedHeight(38)
-            btn.setFixedWidth(100)
-
-            if status == current_status:
-                # Style based on status
-                if status == "Pending":
-                    btn.setStyleSheet("""
-                        QPushButton {
-                            background: #e5e7eb;
-                            color: #374151;
-                            border-radius: 14px;
-                            padding: 8px 15px;
-                            font-weight: bold;
-                            font-size: 12px;
-                        }
-                    """)
-                elif status == "Preparing":
-                    btn.setStyleSheet("""
-                        QPushButton {
-                            background: #fef3c7;
-                            color: #b45309;
-                            border-radius: 14px;
-                            padding: 8px 15px;
-                            font-weight: bold;
-                            font-size: 12px;
-                        }
-                    """)
-                elif status == "Delivering":
-                    btn.setStyleSheet("""
-                        QPushButton {
-                            background: #dbeafe;
-                            color: #1e40af;
-                            border-radius: 14px;
-                            padding: 8px 15px;
-                            font-weight: bold;
-                            font-size: 12px;
-                        }
-                    """)
-                elif status == "Completed":
-                    btn.setStyleSheet("""
-                        QPushButton {
-                            background: #d1fae5;
-                            color: #065f46;
-                            border-radius: 14px;
-                            padding: 8px 15px;
-                            font-weight: bold;
-                            font-size: 12px;
-                        }
-                    """)
-            else:
-                btn.setStyleSheet("""
-                    QPushButton {
-                        background: #f3f4f6;
-                        color: #4b5563;
-                        border-radius: 14px;
-                        padding: 8px 15px;
-                        font-weight: bold;
-                        font-size: 12px;
-                    }
-                    QPushButton:hover { background: #e4e4e7; }
-                """)
+    def _on_order_status_clicked(self, order_id, status):
+        """Status pill clicked on an order card"""
+        if self._update_status_callback is not None:
+            self._update_status_callback(order_id, status)
 
-            # Connect button to update status
-            btn.clicked.connect(lambda checked, oid=order_data['id'], s=status: update_status_callback(oid, s))
-            status_layout.addWidget(btn)
-
-        top.addLayout(status_layout)
-        card_layout.addLayout(top)
-
-        # ORDER DETAILS SECTION WITH ADDRESS AND PHONE - ADDED
-        details_layout = QVBoxLayout()
-        details_layout.setSpacing(5)
-
-        # Order Date
-        date_label = QLabel(f"Order Date: {order_data.get('created_at', 'N/A')}")
-        date_label.setFont(QFont("Arial", 11))
-        date_label.setStyleSheet("color: #888;")
-        details_layout.addWidget(date_label)
-
-        # Customer Address - From database field 'customer_address'
-        customer_address = order_data.get('customer_address', '')
-        if customer_address and customer_address != "No address saved. Please update your address.":
-            address_label = QLabel(f"📍 Delivery Address: {customer_address}")
-            address_label.setFont(QFont("Arial", 11))
-            address_label.setStyleSheet("color: #888;")
-            address_label.setWordWrap(True)
-            details_layout.addWidget(address_label)
-        elif customer_address:
-            # Show only if it's not the default message
-            address_label = QLabel(f"📍 Delivery Address: Not specified")
-            address_label.setFont(QFont("Arial", 11))
-            address_label.setStyleSheet("color: #999; font-style: italic;")
-            details_layout.addWidget(address_label)
-
-        # Customer Phone Number - From database field 'customer_phone'
-        customer_phone = order_data.get('customer_phone', '')
-        if customer_phone:
-            phone_label = QLabel(f"📞 Contact Number: {customer_phone}")
-            phone_label.setFont(QFont("Arial", 11))
-            phone_label.setStyleSheet("color: #888;")
-            details_layout.addWidget(phone_label)
-        else:
-            phone_label = QLabel(f"📞 Contact Number: Not provided")
-            phone_label.setFont(QFont("Arial", 11))
-            phone_label.setStyleSheet("color: #999; font-style: italic;")
-            details_layout.addWidget(phone_label)
-
-        card_layout.addLayout(details_layout)
-
-        # ITEMS LIST
-        items = order_data.get('items', [])
-        for item in items:
-            row = QHBoxLayout()
-            item_name = QLabel(f"{item.get('qty', 1)}x {item.get('title', 'Unknown')}")
-            item_name.setFont(QFont("Arial", 14))
-            item_name.setStyleSheet("color: #333;")
-
-            price_lbl = QLabel(item.get('price', '₱0'))
-            price_lbl.setFont(QFont("Arial", 14, QFont.Weight.Bold))
-            price_lbl.setStyleSheet("color: black;")
-
-            row.addWidget(item_name)
-            row.addStretch()
-            row.addWidget(price_lbl)
-            card_layout.addLayout(row)
-
-        # DIVIDER
-        divider = QFrame()
-        divider.setFrameShape(QFrame.Shape.HLine)
-        divider.setStyleSheet("color:#e5e7eb; margin: 10px 0;")
-        card_layout.addWidget(divider)
-
-        # TOTAL
-        total_row = QHBoxLayout()
-        total_label = QLabel("Total Amount:")
-        total_label.setFont(QFont("Arial", 16, QFont.Weight.Bold))
-        total_label.setStyleSheet("color: black;")
-
-        total_amount = QLabel(f"₱{order_data.get('total_amount', 0):,.2f}")
-        total_amount.setFont(QFont("Arial", 18, QFont.Weight.Bold))
-        total_amount.setStyleSheet("color: #5b7bff;")
-
-        total_row.addWidget(total_label)
-        total_row.addStretch()
-        total_row.addWidget(total_amount)
-        card_layout.addLayout(total_row)
-
-        return card
+    def _on_orders_scrolled(self, value):
+        """Ask for the next page of orders when scrolled near the bottom"""
+        scroll_bar = self.order_list.verticalScrollBar()
+        if scroll_bar.maximum() > 0 and value >= scroll_bar.maximum() - 200:
+            self.orders_scrolled_to_end.emit()
+
+    def _on_activities_scrolled(self, value):
+        """Ask for the next page of activities when scrolled near the bottom"""
+        scroll_bar = self.activity_table.verticalScrollBar()
+        if scroll_bar.maximum() > 0 and value >= scroll_bar.maximum() - 3:
+            self.activities_scrolled_to_end.emit()
 
     def clear_orders_layout(self):
-        """Clear all widgets from orders layout"""
+        """Empty the order list and remove the widgets (and stretches) above it"""
+        self.orders_header = None
+        self._order_cards_shown = False
+        if self.order_list:
+            self.order_model.clear()
+            self.order_list.hide()
         if self.orders_layout:
             for i in reversed(range(self.orders_layout.count())):
-                widget = self.orders_layout.itemAt(i).widget()
+                item = self.orders_layout.takeAt(i)
+                widget = item.widget()
                 if widget is not None:
                     widget.deleteLater()
 
+    def append_order_cards(self, orders, update_status_callback):
+        """Append another page of orders below the ones already shown"""
+        self._update_status_callback = update_status_callback
+        self.order_model.append_orders(orders)
+
+    def sync_order_cards(self, orders, update_status_callback, header_text=None):
+        """Show `orders` by diffing against the orders already in the list.
+
+        Rows are matched by order id, so only added, removed or changed
+        orders are repainted. A placeholder or a different header layout is
+        replaced by a fresh list first.
+        """
+        self._update_status_callback = update_status_callback
+        if not self._order_cards_shown or (header_text is None) != (self.orders_header is None):
+            self.clear_orders_layout()
+            if header_text is not None:
+                self.orders_header = QLabel(header_text)
+                self.orders_header.setFont(QFont("Arial", 14, QFont.Weight.Bold))
+                self.orders_header.setStyleSheet("color: #5b7bff; padding: 10px 0;")
+                self.orders_layout.addWidget(self.orders_header)
+            self.order_list.show()
+            self._order_cards_shown = True
+        elif header_text is not None:
+            self.orders_header.setText(header_text)
+
+        self.order_model.sync_orders(orders)
+
+    def update_order_card(self, order, update_status_callback):
+        """Repaint the card of one order in place; no-op if it is not shown"""
+        self._update_status_callback = update_status_callback
+        self.order_model.update_order(order)
+
+    def remove_order_card(self, order_id):
+        """Remove the card of one order if it is shown"""
+        self.order_model.remove_order(order_id)
+
     def show_no_orders_message(self, message):
         """Show message when no orders are found"""
         self.clear_orders_layout()
@@ -1407,26 +1282,16 @@ class AdminDashboardView(QWidget):
 
         return clear_filter_btn
 
-    def display_filtered_orders(self, orders, filter_name, update_status_callback):
-        """Display filtered orders in the layout"""
-        self.clear_orders_layout()
-
+    def display_filtered_orders(self, orders, filter_name, update_status_callback, has_more=False):
+        """Display filtered orders in the layout (first page when has_more)"""
         if not orders:
             btn = self.show_no_orders_message(f"No {filter_name} found")
             return btn
 
-        # Add filter header
-        header_label = QLabel(f"Showing {filter_name} ({len(orders)} orders)")
-        header_label.setFont(QFont("Arial", 14, QFont.Weight.Bold))
-        header_label.setStyleSheet("color: #5b7bff; padding: 10px 0;")
-        self.orders_layout.addWidget(header_label)
-
-        # Add order cards
-        for order in orders:
-            card = self.build_order_card(order, update_status_callback)
-            self.orders_layout.addWidget(card)
-
-        self.orders_layout.addStretch()
+        # Filter header above the order cards
+        count_text = f"{len(orders)}+" if has_more else f"{len(orders)}"
+        self.sync_order_cards(orders, update_status_callback,
+                              header_text=f"Showing {filter_name} ({count_text} orders)")
         return None
 
     def populate_table(self, menu_items):
@@ -1679,13 +1544,17 @@ class AdminDashboardView(QWidget):
     def populate_activity_table(self, activities):
         """Populate the activity table with data"""
         self.activity_table.setRowCount(0)
+        self.append_activity_rows(activities)
 
+    def append_activity_rows(self, activities):
+        """Append activities below the rows already in the table"""
         if not activities:
             return
 
-        self.activity_table.setRowCount(len(activities))
+        first_row = self.activity_table.rowCount()
+        self.activity_table.setRowCount(first_row + len(activities))
 
-        for row, activity in enumerate(activities):
+        for row, activity in enumerate(activities, first_row):
             # Timestamp - Convert datetime to string
             timestamp = activity.get('created_at', '')
             if isinstance(timestamp, datetime):
@@ -1728,6 +1597,13 @@ class AdminDashboardView(QWidget):
             # Set row height to accommodate wrapped text
             self.activity_table.setRowHeight(row, 60)
 
+    def set_loading(self, loading):
+        """Show a busy cursor while background data loads are running"""
+        if loading:
+            self.setCursor(Qt.CursorShape.BusyCursor)
+        else:
+            self.unsetCursor()
+
     def show_message(self, title, message, icon_type=QMessageBox.Icon.Information):
         """Helper method to show messages"""
         msg = QMessageBox()
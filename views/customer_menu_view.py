@@ -447,6 +447,8 @@ class CartWidget(QWidget):
 
 
 class OrdersWidget(QWidget):
+    load_more_requested = pyqtSignal()
+
     def __init__(self, customer_info):
         super().__init__()
         self.customer_info = customer_info
@@ -506,6 +508,7 @@ class OrdersWidget(QWidget):
                 border-bottom: 1px solid #eef2f6;
             }
         """)
+        self.orders_list.verticalScrollBar().valueChanged.connect(self._on_orders_scrolled)
         scroll_layout.addWidget(self.orders_list)
 
         scroll_area.setWidget(scroll_content)
@@ -513,6 +516,12 @@ class OrdersWidget(QWidget):
 
         self.setLayout(main)
 
+    def _on_orders_scrolled(self, value):
+        """Ask for the next page of orders when scrolled near the bottom"""
+        scroll_bar = self.orders_list.verticalScrollBar()
+        if scroll_bar.maximum() > 0 and value >= scroll_bar.maximum() - 200:
+            self.load_more_requested.emit()
+
     def add_order_card(self, order_data):
         card = QWidget()
         card.setStyleSheet("background:white; border-radius:18px;")
@@ -2005,6 +2014,13 @@ class CustomerMenuView(QWidget):
                         }
                     """)
 
+    def set_loading(self, loading):
+        """Show a busy cursor while background data loads are running"""
+        if loading:
+            self.setCursor(Qt.CursorShape.BusyCursor)
+        else:
+            self.unsetCursor()
+
     def get_view(self):
         """Get the QWidget instance"""
         return self
\ No newline at end of file
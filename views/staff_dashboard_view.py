@@ -10,6 +10,7 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtGui import QFont, QPixmap, QIcon
 from PyQt6.QtCore import Qt, QSize, pyqtSignal
+from .widgets.order_list import OrderListView
 
 
 class StaffDashboardView(QWidget):
@@ -25,6 +26,7 @@ class StaffDashboardView(QWidget):
     filter_orders_changed = pyqtSignal(str)
     refresh_orders_clicked = pyqtSignal()
     order_status_changed = pyqtSignal(int, str)
+    orders_scrolled_to_end = pyqtSignal()
 
     def __init__(self):
         super().__init__()
@@ -37,7 +39,8 @@ class StaffDashboardView(QWidget):
         self.search_input = None
         self.orders_layout = None
         self.orders_content = None
-        self.scroll = None
+        self.order_model = None  # orders currently on the Orders page
+        self.order_list = None
         self.pages = None
         self.menu_btn = None
         self.order_btn = None
@@ -492,240 +495,63 @@ class StaffDashboardView(QWidget):
 
         outer.addLayout(search_layout)
 
-        # Scroll Area
-        self.scroll = QScrollArea()
-        self.scroll.setWidgetResizable(True)
-        self.scroll.setStyleSheet("""
-            QScrollArea {
-                border: none;
-                background: transparent;
-            }
-            QScrollBar:vertical {
-                background: #f0f0f0;
-                width: 8px;
-                border-radius: 4px;
-                border: none;
-            }
-            QScrollBar::handle:vertical {
-                background: #c0c0c0;
-                border-radius: 4px;
-                min-height: 25px;
-            }
-            QScrollBar::handle:vertical:hover {
-                background: #a0a0a0;
-            }
-            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
-                border: none;
-                background: none;
-                height: 0px;
-            }
-            QScrollBar::add-page:vertical, QScrollBar::sub-page:vertical {
-                background: none;
-            }
-        """)
-
+        # Messages above the list (e.g. no matching orders)
         self.orders_content = QWidget()
         self.orders_layout = QVBoxLayout(self.orders_content)
+        self.orders_layout.setContentsMargins(0, 0, 0, 0)
         self.orders_layout.setSpacing(18)
+        outer.addWidget(self.orders_content)
 
-        self.scroll.setWidget(self.orders_content)
-        outer.addWidget(self.scroll)
+        # Order list (cards painted by a delegate)
+        self.order_list = OrderListView("#9b6bff")
+        self.order_model = self.order_list.order_model
+        self.order_list.status_clicked.connect(self.order_status_changed.emit)
+        self.order_list.verticalScrollBar().valueChanged.connect(self._on_orders_scrolled)
+        outer.addWidget(self.order_list, 1)
 
         return container
 
-    def build_order_card(self, order_data):
-        """Build order card from data"""
-        card = QFrame()
-        card.order_id = str(order_data.get('id', ''))
-        card.setStyleSheet("""
-            QFrame {
-                background: white;
-                border-radius: 20px;
-            }
-        """)
-        card_layout = QVBoxLayout(card)
-        card_layout.setContentsMargins(25, 25, 25, 25)
-        card_layout.setSpacing(16)
-
-        # TOP ROW: ORDER ID + STATUS
-        top = QHBoxLayout()
-
-        order_id = QLabel(f"Order #{order_data.get('order_number', 'N/A')}")
-        order_id.setFont(QFont("Arial", 17, QFont.Weight.Bold))
-        order_id.setStyleSheet("color: black;")
-
-        customer_info = QLabel(f"{order_data.get('customer_name', 'N/A')} • {order_data.get('customer_email', 'N/A')}")
-        customer_info.setFont(QFont("Arial", 12))
-        customer_info.setStyleSheet("color: #666;")
-
-        top.addWidget(order_id)
-        top.addWidget(customer_info)
-        top.addStretch()
-
-        # Status selector
-        status_layout = QHBoxLayout()
-        status_layout.setSpacing(8)
-
-        statuses = ["Pending", "Preparing", "Delivering", "Completed"]
-        current_status = order_data.get('status', 'Pending').capitalize()
-
-        for status in statuses:
-            btn = QPushButton(status)
-            btn.setFixedHeight(38)
-            btn.setFixedWidth(100)
-
-            if status == current_status:
-                if status == "Pending":
-                    btn.setStyleSheet("""
-                        QPushButton {
-                            background: #e5e7eb;
-                            color: #374151;
-                            border-radius: 14px;
-                            padding: 8px 15px;
-                            font-weight: bold;
-                            font-size: 12px;
-                        }
-                    """)
-                elif status == "Preparing":
-                    btn.setStyleSheet("""
-                        QPushButton {
-                            background: #fef3c7;
-                            color: #b45309;
-                            border-radius: 14px;
-                            padding: 8px 15px;
-                            font-weight: bold;
-                            font-size: 12px;
-                        }
-                    """)
-                elif status == "Delivering":
-                    btn.setStyleSheet("""
-                        QPushButton {
-                            background: #dbeafe;
-                            color: #1e40af;
-                            border-radius: 14px;
-                            padding: 8px 15px;
-                            font-weight: bold;
-                            font-size: 12px;
-                        }
-                    """)
-                elif status == "Completed":
-                    btn.setStyleSheet("""
-                        QPushButton {
-                            background: #d1fae5;
-                            color: #065f46;
-                            border-radius: 14px;
-                            padding: 8px 15px;
-                            font-weight: bold;
-                            font-size: 12px;
-                        }
-                    """)
-            else:
-                btn.setStyleSheet("""
-                    QPushButton {
-                        background: #f3f4f6;
-                        color: #4b5563;
-                        border-radius: 14px;
-                        padding: 8px 15px;
-                        font-weight: bold;
-                        font-size: 12px;
-                    }
-                    QPushButton:hover { background: #e4e4e7; }
-                """)
-
-            btn.clicked.connect(lambda checked, oid=order_data['id'], s=status: self.order_status_changed.emit(oid, s))
-            status_layout.addWidget(btn)
-
-        top.addLayout(status_layout)
-        card_layout.addLayout(top)
-
-        # CUSTOMER CONTACT INFORMATION
-        contact_layout = QVBoxLayout()
-        contact_layout.setSpacing(5)
-
-        # Order Date
-        date_label = QLabel(f"Order Date: {order_data.get('created_at', 'N/A')}")
-        date_label.setFont(QFont("Arial", 11))
-        date_label.setStyleSheet("color: #888;")
-        contact_layout.addWidget(date_label)
-
-        # Customer Address
-        customer_address = order_data.get('customer_address', '')
-        if customer_address and customer_address != "No address saved. Please update your address.":
-            address_label = QLabel(f"📍 Delivery Address: {customer_address}")
-            address_label.setFont(QFont("Arial", 11))
-            address_label.setStyleSheet("color: #888; padding-left: 5px;")
-            address_label.setWordWrap(True)
-            contact_layout.addWidget(address_label)
-        elif customer_address:
-            address_label = QLabel(f"📍 Delivery Address: Not specified")
-            address_label.setFont(QFont("Arial", 11))
-            address_label.setStyleSheet("color: #999; padding-left: 5px; font-style: italic;")
-            contact_layout.addWidget(address_label)
-
-        # Customer Phone Number
-        customer_phone = order_data.get('customer_phone', '')
-        if customer_phone:
-            phone_label = QLabel(f"📞 Contact Number: {customer_phone}")
-            phone_label.setFont(QFont("Arial", 11))
-            phone_label.setStyleSheet("color: #888; padding-left: 5px;")
-            contact_layout.addWidget(phone_label)
-        else:
-            phone_label = QLabel(f"📞 Contact Number: Not provided")
-            phone_label.setFont(QFont("Arial", 11))
-            phone_label.setStyleSheet("color: #999; padding-left: 5px; font-style: italic;")
-            contact_layout.addWidget(phone_label)
-
-        card_layout.addLayout(contact_layout)
-
-        # ITEMS LIST
-        items = order_data.get('items', [])
-        for item in items:
-            row = QHBoxLayout()
-            item_name = QLabel(f"{item.get('qty', 1)}x {item.get('title', 'Unknown')}")
-            item_name.setFont(QFont("Arial", 14))
-            item_name.setStyleSheet("color: #333;")
-
-            price_lbl = QLabel(item.get('price', '₱0'))
-            price_lbl.setFont(QFont("Arial", 14, QFont.Weight.Bold))
-            price_lbl.setStyleSheet("color: black;")
-
-            row.addWidget(item_name)
-            row.addStretch()
-            row.addWidget(price_lbl)
-            card_layout.addLayout(row)
-
-        # DIVIDER
-        divider = QFrame()
-        divider.setFrameShape(QFrame.Shape.HLine)
-        divider.setStyleSheet("color:#e5e7eb; margin: 10px 0;")
-        card_layout.addWidget(divider)
-
-        # TOTAL
-        total_row = QHBoxLayout()
-        total_label = QLabel("Total Amount:")
-        total_label.setFont(QFont("Arial", 16, QFont.Weight.Bold))
-        total_label.setStyleSheet("color: black;")
-
-        total_amount = QLabel(f"₱{order_data.get('total_amount', 0):,.2f}")
-        total_amount.setFont(QFont("Arial", 18, QFont.Weight.Bold))
-        total_amount.setStyleSheet("color: #9b6bff;")
-
-        total_row.addWidget(total_label)
-        total_row.addStretch()
-        total_row.addWidget(total_amount)
-        card_layout.addLayout(total_row)
-
-        return card
+    def _on_orders_scrolled(self, value):
+        """Ask for the next page of orders when scrolled near the bottom"""
+        scroll_bar = self.order_list.verticalScrollBar()
+        if scroll_bar.maximum() > 0 and value >= scroll_bar.maximum() - 200:
+            self.orders_scrolled_to_end.emit()
+
+    def append_orders(self, orders):
+        """Append another page of orders below the ones already shown"""
+        self.order_model.append_orders(orders)
+
+    def insert_order_card(self, index, order):
+        """Insert one new order at a list position (live feed)"""
+        if self.order_model.rowCount() == 0:
+            # Replaces the "no orders" placeholder
+            self.display_orders([order])
+            return
+
+        self.order_model.insert_order(index, order)
+
+    def update_order_card(self, order):
+        """Repaint the card of one order in place; no-op if it is not shown"""
+        self.order_model.update_order(order)
+
+    def remove_order_card(self, order_id):
+        """Remove the card of one order if it is shown"""
+        if self.order_model.remove_order(order_id) and self.order_model.rowCount() == 0:
+            self.display_orders([])
 
     def display_orders(self, orders_to_display):
-        """Display orders in the layout"""
-        # Clear current orders
+        """Display orders in the list"""
+        # Clear messages (and trailing stretches) above the list
         for i in reversed(range(self.orders_layout.count())):
-            widget = self.orders_layout.itemAt(i).widget()
+            item = self.orders_layout.takeAt(i)
+            widget = item.widget()
             if widget is not None:
                 widget.deleteLater()
 
         if not orders_to_display:
+            self.order_model.clear()
+            self.order_list.hide()
+
             no_orders = QLabel("No orders match the selected filter")
             no_orders.setFont(QFont("Arial", 16, QFont.Weight.Bold))
             no_orders.setStyleSheet("color: #55606a; padding: 20px;")
@@ -734,15 +560,9 @@ class StaffDashboardView(QWidget):
             self.orders_layout.addStretch()
             return
 
-        # Display orders
-        for order in orders_to_display:
-            order_id = str(order.get('id', ''))
-            card = self.build_order_card(order)
-            card.order_id = order_id
-            self.orders_layout.addWidget(card)
-
-        # Add stretch at the end
-        self.orders_layout.addStretch()
+        # Only added, removed or changed orders are repainted
+        self.order_list.show()
+        self.order_model.sync_orders(orders_to_display)
 
     def show_add_item_dialog(self):
         """Show dialog to add new menu item"""
@@ -1037,6 +857,13 @@ class StaffDashboardView(QWidget):
 
         return msg.exec() == QMessageBox.StandardButton.Yes
 
+    def set_loading(self, loading):
+        """Show a busy cursor while background data loads are running"""
+        if loading:
+            self.setCursor(Qt.CursorShape.BusyCursor)
+        else:
+            self.unsetCursor()
+
     def show_message(self, title, message, icon_type=QMessageBox.Icon.Information):
         """Show message box"""
         msg = QMessageBox()
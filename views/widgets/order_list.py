@@ -0,0 +1,452 @@
+"""
+Order List Widget
+Virtualized order card list for the admin and staff Orders pages.
+Orders live in a list model and every card is painted by a delegate, so only
+the rows on screen cost anything and no widgets are created per order.
+"""
+from PyQt6.QtWidgets import QListView, QStyledItemDelegate, QAbstractItemView
+from PyQt6.QtGui import QFont, QFontMetrics, QColor, QPainter, QPen
+from PyQt6.QtCore import (
+    Qt, QAbstractListModel, QModelIndex, QRect, QSize, QEvent, pyqtSignal
+)
+
+
+ORDER_ROLE = Qt.ItemDataRole.UserRole + 1
+
+STATUSES = ("Pending", "Preparing", "Delivering", "Completed")
+
+# Status pill colors (background, text)
+STATUS_COLORS = {
+    "Pending": ("#e5e7eb", "#374151"),
+    "Preparing": ("#fef3c7", "#b45309"),
+    "Delivering": ("#dbeafe", "#1e40af"),
+    "Completed": ("#d1fae5", "#065f46"),
+}
+INACTIVE_PILL = ("#f3f4f6", "#4b5563")
+HOVER_PILL = "#e4e4e7"
+
+NO_ADDRESS = "No address saved. Please update your address."
+
+# Card geometry (px)
+CARD_MARGIN = 25
+CARD_SPACING = 16
+CARD_GAP = 18               # space between two cards
+CARD_RADIUS = 20
+CARD_MIN_WIDTH = 760
+PILL_WIDTH = 100
+PILL_HEIGHT = 38
+PILL_SPACING = 8
+PILL_RADIUS = 14
+DETAIL_SPACING = 5
+DIVIDER_MARGIN = 10
+
+# Above this many added/removed rows a sync resets the model instead
+SYNC_RESET_LIMIT = 200
+
+
+def order_key(order):
+    """Identity of an order row (order id as str)"""
+    return str(order.get('id', ''))
+
+
+def order_signature(order):
+    """What a card shows that can change; updated_at moves with every write"""
+    return order.get('status'), order.get('updated_at')
+
+
+class OrderListModel(QAbstractListModel):
+    """Orders shown on an Orders page, newest first, indexed by order id"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._orders = []
+        self._rows = {}     # order id (str) -> row
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._orders)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._orders):
+            return None
+        order = self._orders[index.row()]
+        if role == ORDER_ROLE:
+            return order
+        if role == Qt.ItemDataRole.DisplayRole:
+            return f"Order #{order.get('order_number', 'N/A')}"
+        return None
+
+    def order_at(self, row):
+        return self._orders[row]
+
+    def row_of(self, order_id):
+        """Row of an order, or None if it is not in the list"""
+        return self._rows.get(str(order_id))
+
+    def set_orders(self, orders):
+        """Replace the whole list"""
+        self.beginResetModel()
+        self._orders = list(orders)
+        self._reindex()
+        self.endResetModel()
+
+    def clear(self):
+        self.set_orders([])
+
+    def sync_orders(self, orders):
+        """Show `orders`, touching only the rows that were added, removed or changed.
+
+        Falls back to a reset for a first fill, when the kept orders changed
+        their relative order or when most of the list is new (e.g. another filter).
+        """
+        keys = [order_key(order) for order in orders]
+        current = [order_key(order) for order in self._orders]
+        wanted, shown = set(keys), set(current)
+
+        if not current or [key for key in current if key in wanted] != [key for key in keys if key in shown] or \
+                len(shown - wanted) + len(wanted - shown) > SYNC_RESET_LIMIT:
+            self.set_orders(orders)
+            return
+
+        for row in reversed(range(len(current))):
+            if current[row] not in wanted:
+                self.beginRemoveRows(QModelIndex(), row, row)
+                del self._orders[row]
+                self.endRemoveRows()
+
+        for position, key in enumerate(keys):
+            if key not in shown:
+                self.beginInsertRows(QModelIndex(), position, position)
+                self._orders.insert(position, orders[position])
+                self.endInsertRows()
+
+        changed = [row for row, order in enumerate(orders)
+                   if order_signature(order) != order_signature(self._orders[row])]
+        self._orders = list(orders)
+        self._reindex()
+        for row in changed:
+            self.dataChanged.emit(self.index(row), self.index(row))
+
+    def append_orders(self, orders):
+        """Add another page of orders at the end"""
+        if not orders:
+            return
+        first = len(self._orders)
+        self.beginInsertRows(QModelIndex(), first, first + len(orders) - 1)
+        self._orders.extend(orders)
+        self._reindex(first)
+        self.endInsertRows()
+
+    def insert_order(self, row, order):
+        """Insert one order at a list position"""
+        row = max(0, min(row, len(self._orders)))
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._orders.insert(row, order)
+        self._reindex(row)
+        self.endInsertRows()
+
+    def update_order(self, order):
+        """Replace one order in place; False if it is not in the list"""
+        row = self.row_of(order_key(order))
+        if row is None:
+            return False
+        self._orders[row] = order
+        self.dataChanged.emit(self.index(row), self.index(row))
+        return True
+
+    def remove_order(self, order_id):
+        """Remove one order; False if it is not in the list"""
+        row = self.row_of(order_id)
+        if row is None:
+            return False
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._orders[row]
+        self._rows.pop(str(order_id), None)
+        self._reindex(row)
+        self.endRemoveRows()
+        return True
+
+    def _reindex(self, start=0):
+        if start == 0:
+            self._rows = {}
+        for row in range(start, len(self._orders)):
+            self._rows[order_key(self._orders[row])] = row
+
+
+class OrderCardDelegate(QStyledItemDelegate):
+    """Paints one order as a card; status pills are hit-tested, not widgets"""
+
+    status_clicked = pyqtSignal(int, str)
+
+    def __init__(self, accent_color, parent=None):
+        super().__init__(parent)
+        self.accent_color = QColor(accent_color)
+        self.hover_pos = None       # viewport position of the mouse, set by the view
+        self._pressed = None        # (row, status) of the pill under a mouse press
+
+        self.number_font = QFont("Arial", 17, QFont.Weight.Bold)
+        self.customer_font = QFont("Arial", 12)
+        self.pill_font = QFont("Arial")
+        self.pill_font.setPixelSize(12)
+        self.pill_font.setBold(True)
+        self.detail_font = QFont("Arial", 11)
+        self.missing_font = QFont("Arial", 11)
+        self.missing_font.setItalic(True)
+        self.item_font = QFont("Arial", 14)
+        self.price_font = QFont("Arial", 14, QFont.Weight.Bold)
+        self.total_label_font = QFont("Arial", 16, QFont.Weight.Bold)
+        self.total_font = QFont("Arial", 18, QFont.Weight.Bold)
+
+        self.top_height = max(PILL_HEIGHT, QFontMetrics(self.number_font).height())
+        self.detail_height = QFontMetrics(self.detail_font).height()
+        self.item_height = QFontMetrics(self.price_font).height()
+        self.total_height = QFontMetrics(self.total_font).height()
+
+    @staticmethod
+    def _has_address_line(order):
+        return bool(order.get('customer_address', ''))
+
+    def card_height(self, order):
+        """Card height from the number of lines it shows (no text measuring per row)"""
+        details = 3 if self._has_address_line(order) else 2
+        items = len(order.get('items', []))
+        sections = 4 + items    # top row, details, items, divider, total
+        return (2 * CARD_MARGIN + CARD_SPACING * (sections - 1) + CARD_GAP
+                + self.top_height
+                + details * self.detail_height + (details - 1) * DETAIL_SPACING
+                + items * self.item_height
+                + 2 * DIVIDER_MARGIN + 1
+                + self.total_height)
+
+    def sizeHint(self, option, index):
+        order = index.data(ORDER_ROLE)
+        if order is None:
+            return super().sizeHint(option, index)
+        return QSize(CARD_MIN_WIDTH, self.card_height(order))
+
+    @staticmethod
+    def _content_rect(rect):
+        return rect.adjusted(CARD_MARGIN, CARD_MARGIN, -CARD_MARGIN, -CARD_MARGIN - CARD_GAP)
+
+    def _pill_rects(self, rect):
+        """(status, QRect) of the status pills, right-aligned in the top row"""
+        content = self._content_rect(rect)
+        x = content.right() + 1 - (len(STATUSES) * PILL_WIDTH + (len(STATUSES) - 1) * PILL_SPACING)
+        y = content.top() + (self.top_height - PILL_HEIGHT) // 2
+        pills = []
+        for status in STATUSES:
+            pills.append((status, QRect(x, y, PILL_WIDTH, PILL_HEIGHT)))
+            x += PILL_WIDTH + PILL_SPACING
+        return pills
+
+    def status_at(self, rect, pos):
+        """Status pill under a viewport position, or None"""
+        if pos is None or not rect.contains(pos):
+            return None
+        for status, pill in self._pill_rects(rect):
+            if pill.contains(pos):
+                return status
+        return None
+
+    def paint(self, painter, option, index):
+        order = index.data(ORDER_ROLE)
+        if order is None:
+            return super().paint(painter, option, index)
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        rect = option.rect
+        card = rect.adjusted(0, 0, -1, -CARD_GAP)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor("white"))
+        painter.drawRoundedRect(card, CARD_RADIUS, CARD_RADIUS)
+
+        content = self._content_rect(rect)
+        left, width = content.left(), content.width()
+        y = content.top()
+
+        # TOP ROW: ORDER NUMBER + CUSTOMER + STATUS PILLS
+        pills = self._pill_rects(rect)
+        number = f"Order #{order.get('order_number', 'N/A')}"
+        number_width = QFontMetrics(self.number_font).horizontalAdvance(number)
+        self._draw_text(painter, QRect(left, y, number_width, self.top_height),
+                        number, self.number_font, "black")
+
+        customer_left = left + number_width + 6
+        customer_width = pills[0][1].left() - PILL_SPACING - customer_left
+        if customer_width > 0:
+            customer = f"{order.get('customer_name', 'N/A')} • {order.get('customer_email', 'N/A')}"
+            self._draw_text(painter, QRect(customer_left, y, customer_width, self.top_height),
+                            customer, self.customer_font, "#666")
+
+        hovered = self.status_at(rect, self.hover_pos)
+        current_status = (order.get('status') or 'Pending').capitalize()
+        for status, pill in pills:
+            background, color = STATUS_COLORS[status] if status == current_status else INACTIVE_PILL
+            if status != current_status and status == hovered:
+                background = HOVER_PILL
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QColor(background))
+            painter.drawRoundedRect(pill, PILL_RADIUS, PILL_RADIUS)
+            painter.setFont(self.pill_font)
+            painter.setPen(QColor(color))
+            painter.drawText(pill, Qt.AlignmentFlag.AlignCenter, status)
+        y += self.top_height + CARD_SPACING
+
+        # ORDER DETAILS: DATE, ADDRESS, PHONE
+        details = [(f"Order Date: {order.get('created_at', 'N/A')}", False)]
+        customer_address = order.get('customer_address', '')
+        if customer_address and customer_address != NO_ADDRESS:
+            details.append((f"📍 Delivery Address: {customer_address}", False))
+        elif customer_address:
+            details.append(("📍 Delivery Address: Not specified", True))
+        customer_phone = order.get('customer_phone', '')
+        if customer_phone:
+            details.append((f"📞 Contact Number: {customer_phone}", False))
+        else:
+            details.append(("📞 Contact Number: Not provided", True))
+
+        for text, missing in details:
+            self._draw_text(painter, QRect(left, y, width, self.detail_height), text,
+                            self.missing_font if missing else self.detail_font,
+                            "#999" if missing else "#888")
+            y += self.detail_height + DETAIL_SPACING
+        y += CARD_SPACING - DETAIL_SPACING
+
+        # ITEMS LIST
+        for item in order.get('items', []):
+            price = item.get('price', '₱0')
+            price_width = QFontMetrics(self.price_font).horizontalAdvance(price)
+            self._draw_text(painter, QRect(left + width - price_width, y, price_width, self.item_height),
+                            price, self.price_font, "black")
+            self._draw_text(painter, QRect(left, y, width - price_width - 12, self.item_height),
+                            f"{item.get('qty', 1)}x {item.get('title', 'Unknown')}", self.item_font, "#333")
+            y += self.item_height + CARD_SPACING
+
+        # DIVIDER
+        y += DIVIDER_MARGIN
+        painter.setPen(QPen(QColor("#e5e7eb"), 1))
+        painter.drawLine(left, y, left + width, y)
+        y += 1 + DIVIDER_MARGIN + CARD_SPACING
+
+        # TOTAL
+        total_rect = QRect(left, y, width, self.total_height)
+        self._draw_text(painter, total_rect, "Total Amount:", self.total_label_font, "black")
+        painter.setFont(self.total_font)
+        painter.setPen(self.accent_color)
+        painter.drawText(total_rect, Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter,
+                         f"₱{order.get('total_amount', 0):,.2f}")
+
+        painter.restore()
+
+    @staticmethod
+    def _draw_text(painter, rect, text, font, color):
+        """Left-aligned single line, elided to the rect"""
+        painter.setFont(font)
+        painter.setPen(QColor(color))
+        text = QFontMetrics(font).elidedText(text, Qt.TextElideMode.ElideRight, rect.width())
+        painter.drawText(rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, text)
+
+    def editorEvent(self, event, model, option, index):
+        """A status pill acts as a button: pressed and released over the same pill"""
+        if event.type() in (QEvent.Type.MouseButtonPress, QEvent.Type.MouseButtonRelease) \
+                and event.button() == Qt.MouseButton.LeftButton:
+            status = self.status_at(option.rect, event.position().toPoint())
+
+            if event.type() == QEvent.Type.MouseButtonPress:
+                self._pressed = (index.row(), status) if status is not None else None
+                return status is not None
+
+            pressed, self._pressed = self._pressed, None
+            if status is not None and pressed == (index.row(), status):
+                order = index.data(ORDER_ROLE)
+                self.status_clicked.emit(order['id'], status)
+                return True
+
+        return super().editorEvent(event, model, option, index)
+
+
+class OrderListView(QListView):
+    """Scrollable list of painted order cards.
+
+    Rows are laid out in batches and scrolled per pixel, so a long order
+    history opens and scrolls without building a widget per order.
+    status_clicked(order_id, status) is emitted when a status pill is clicked.
+    """
+
+    status_clicked = pyqtSignal(int, str)
+
+    def __init__(self, accent_color, parent=None):
+        super().__init__(parent)
+        self.order_model = OrderListModel(self)
+        self.card_delegate = OrderCardDelegate(accent_color, self)
+        self.card_delegate.status_clicked.connect(self.status_clicked)
+        self.setModel(self.order_model)
+        self.setItemDelegate(self.card_delegate)
+
+        self.setUniformItemSizes(False)
+        self.setLayoutMode(QListView.LayoutMode.Batched)
+        self.setBatchSize(100)
+        self.setResizeMode(QListView.ResizeMode.Adjust)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.verticalScrollBar().setSingleStep(24)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self.setMouseTracking(True)
+        self.setStyleSheet("""
+            QListView {
+                border: none;
+                background: transparent;
+            }
+            QScrollBar:vertical {
+                background: #f0f0f0;
+                width: 8px;
+                border-radius: 4px;
+                border: none;
+            }
+            QScrollBar::handle:vertical {
+                background: #c0c0c0;
+                border-radius: 4px;
+                min-height: 25px;
+            }
+            QScrollBar::handle:vertical:hover {
+                background: #a0a0a0;
+            }
+            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
+                border: none;
+                background: none;
+                height: 0px;
+            }
+            QScrollBar::add-page:vertical, QScrollBar::sub-page:vertical {
+                background: none;
+            }
+        """)
+
+        self._hover_row = None
+
+    def mouseMoveEvent(self, event):
+        pos = event.position().toPoint()
+        self.card_delegate.hover_pos = pos
+        index = self.indexAt(pos)
+        row = index.row() if index.isValid() else None
+
+        # Only the card under the mouse (and the one it left) is repainted
+        if self._hover_row is not None and self._hover_row != row:
+            self.viewport().update(self.visualRect(self.order_model.index(self._hover_row)))
+        if row is not None:
+            self.viewport().update(self.visualRect(index))
+        self._hover_row = row
+
+        on_pill = row is not None and self.card_delegate.status_at(self.visualRect(index), pos) is not None
+        self.viewport().setCursor(Qt.CursorShape.PointingHandCursor if on_pill else Qt.CursorShape.ArrowCursor)
+        super().mouseMoveEvent(event)
+
+    def leaveEvent(self, event):
+        self.card_delegate.hover_pos = None
+        if self._hover_row is not None and self._hover_row < self.order_model.rowCount():
+            self.viewport().update(self.visualRect(self.order_model.index(self._hover_row)))
+        self._hover_row = None
+        self.viewport().unsetCursor()
+        super().leaveEvent(event)
\ No newline at end of file